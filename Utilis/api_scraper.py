@@ -1,6 +1,11 @@
+import asyncio
 import requests
-import json
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+
+from cfb_prop_predictor.types import PropRecord
+from Utilis.dk_schema import OfferMarket, iter_markets, iter_markets_from_bytes, subcategory_ids
+from Utilis.fast_json import ACCEPT_ENCODING, loads
+from Utilis.rate_limit import CircuitOpenError, throttled_get, throttled_get_json_async
 
 # ---
 # --- THIS IS THE BREAKTHROUGH ---
@@ -29,44 +34,90 @@ def get_event_group_id(league: str) -> Optional[str]:
 def get_category_id(prop_type: str) -> Optional[int]:
     return CATEGORY_IDS.get(prop_type)
 
-def fetch_props_from_api(league: str, prop_type: str) -> List[Dict[str, Any]]:
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Referer': 'https://sportsbook.draftkings.com/',
+}
+
+# How many subcategory requests the async scraper keeps in flight at once
+ASYNC_CONCURRENCY = 4
+ASYNC_TIMEOUT = 15
+REQUEST_TIMEOUT = 15
+
+
+def _category_url(event_group_id: str, category_id: int) -> str:
+    return f"{BASE_URL}/eventgroups/{event_group_id}/categories/{category_id}?format=json"
+
+
+def _subcategory_url(event_group_id: str, category_id: int, sub_id: Any) -> str:
+    return f"{BASE_URL}/eventgroups/{event_group_id}/categories/{category_id}/subcategories/{sub_id}?format=json"
+
+
+def _subcategory_ids(data: Dict[str, Any]) -> List[Any]:
+    """Subcategory IDs listed in a category response."""
+    return subcategory_ids(data)
+
+
+def _prop_from_market(market: OfferMarket, league: str) -> PropRecord:
+    return PropRecord(
+        name=market.participant,
+        position="N/A", # API doesn't provide this here
+        team_name="N/A", # API doesn't provide this here
+        opponent_name="N/A", # API doesn't provide this here
+        start_time=market.start_date,
+        league=league,
+        market_name=market.market_name,
+        prop_line=market.line, # the Over line; Over/Under share the main line
+        over_odds=market.over_odds,
+        under_odds=market.under_odds,
+    )
+
+
+def _props_from_subcategory(data: Dict[str, Any], league: str) -> List[PropRecord]:
+    """Player props in one decoded subcategory response; malformed markets are skipped."""
+    return [_prop_from_market(m, league) for m in iter_markets(data)]
+
+
+def _props_from_body(body: bytes, league: str) -> List[PropRecord]:
+    """Player props in one raw subcategory response (decoded lazily with msgspec)."""
+    return [_prop_from_market(m, league) for m in iter_markets_from_bytes(body)]
+
+
+def _resolve_ids(league: str, prop_type: str):
+    event_group_id = get_event_group_id(league)
+    if not event_group_id:
+        print(f"[api_scraper] ERROR: No Event Group ID found for league '{league}'")
+        return None, None
+
+    category_id = get_category_id(prop_type)
+    if not category_id:
+        print(f"[api_scraper] ERROR: No Category ID found for prop_type '{prop_type}'")
+        return None, None
+    return event_group_id, category_id
+
+
+def fetch_props_from_api(league: str, prop_type: str) -> List[PropRecord]:
     """
     Scrapes DraftKings for live props by hitting the internal API directly,
     bypassing Playwright.
     """
     print(f"[api_scraper] Starting direct API scrape for {league} / {prop_type}")
     
-    event_group_id = get_event_group_id(league)
+    event_group_id, category_id = _resolve_ids(league, prop_type)
     if not event_group_id:
-        print(f"[api_scraper] ERROR: No Event Group ID found for league '{league}'")
-        return []
-        
-    category_id = get_category_id(prop_type)
-    if not category_id:
-        print(f"[api_scraper] ERROR: No Category ID found for prop_type '{prop_type}'")
         return []
 
     # This logic is adapted from your NFLScraper class
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://sportsbook.draftkings.com/',
-        }
-        
         # 1. Get all subcategory IDs for this prop type
-        url1 = f"{BASE_URL}/eventgroups/{event_group_id}/categories/{category_id}?format=json"
+        url1 = _category_url(event_group_id, category_id)
         print(f"[api_scraper] Fetching subcategories from {url1}")
-        resp1 = requests.get(url1, headers=headers)
+        resp1 = throttled_get(url1, headers=HEADERS, timeout=REQUEST_TIMEOUT)
         resp1.raise_for_status() # Raise an exception for bad status codes
-        dk_markets = resp1.json().get('eventGroup', {}).get('offerCategories', [])
-        
-        subcategory_ids = []
-        for cat in dk_markets:
-            if 'offerSubcategoryDescriptors' in cat:
-                for subcat in cat['offerSubcategoryDescriptors']:
-                    subcategory_ids.append(subcat['subcategoryId'])
+        subcategory_ids = _subcategory_ids(loads(resp1.content))
         
         if not subcategory_ids:
             print("[api_scraper] No subcategory IDs found. Prop market might be empty.")
@@ -77,55 +128,77 @@ def fetch_props_from_api(league: str, prop_type: str) -> List[Dict[str, Any]]:
         # 2. Loop over each subcategory and get its props
         all_props = []
         for sub_id in subcategory_ids:
-            url2 = f"{BASE_URL}/eventgroups/{event_group_id}/categories/{category_id}/subcategories/{sub_id}?format=json"
-            resp2 = requests.get(url2, headers=headers)
+            resp2 = throttled_get(_subcategory_url(event_group_id, category_id, sub_id),
+                                  headers=HEADERS, timeout=REQUEST_TIMEOUT)
             resp2.raise_for_status()
-            
-            offer_categories = resp2.json().get('eventGroup', {}).get('offerCategories', [])
-            
-            for cat in offer_categories:
-                if 'offerSubcategoryDescriptors' in cat:
-                    for subcat in cat['offerSubcategoryDescriptors']:
-                        if 'offerSubcategory' in subcat:
-                            market_name = subcat.get('name', 'Unknown Market')
-                            for offer in subcat['offerSubcategory']['offers']:
-                                for market in offer:
-                                    if 'participant' not in market['outcomes'][0]:
-                                        continue # Not a player prop
-                                        
-                                    player_name = market['outcomes'][0]['participant']
-                                    
-                                    # This is the "Over"
-                                    o_line = market['outcomes'][0].get('line')
-                                    o_odds = market['outcomes'][0].get('oddsAmerican')
-                                    
-                                    # This is the "Under"
-                                    u_line = market['outcomes'][1].get('line')
-                                    u_odds = market['outcomes'][1].get('oddsAmerican')
-
-                                    # We only care about the main line (Over/Under are same)
-                                    prop_line = o_line 
-                                    
-                                    prop_dict = {
-                                        "name": player_name,
-                                        "position": "N/A", # API doesn't provide this here
-                                        "team_name": "N/A", # API doesn't provide this here
-                                        "opponent_name": "N/A", # API doesn't provide this here
-                                        "start_time": market.get('startDate'),
-                                        "league": league,
-                                        "market_name": market_name,
-                                        "prop_line": prop_line,
-                                        "over_odds": o_odds,
-                                        "under_odds": u_odds
-                                    }
-                                    all_props.append(prop_dict)
+            all_props.extend(_props_from_body(resp2.content, league))
 
         print(f"[api_scraper] Found {len(all_props)} total props.")
         return all_props
         
+    except CircuitOpenError as e:
+        print(f"[api_scraper] ERROR: DraftKings requests paused after repeated failures ({e}).")
+        return []
     except requests.exceptions.RequestException as e:
         print(f"[api_scraper] ERROR: Direct API call failed. {e}")
         return []
     except Exception as e:
         print(f"[api_scraper] ERROR: Failed to parse API response. {e}")
-        return []
\ No newline at end of file
+        return []
+
+
+async def iter_props_from_api_async(league: str, prop_type: str,
+                                    session: Optional["aiohttp.ClientSession"] = None) -> AsyncIterator[List[PropRecord]]:
+    """
+    Async version of `fetch_props_from_api` that yields each subcategory's props as soon
+    as its response arrives, instead of returning everything at the end.
+
+    Subcategories are fetched concurrently (up to ASYNC_CONCURRENCY at a time), so batches
+    arrive in completion order. A failed subcategory is logged and skipped; a failed
+    category lookup ends the iteration without yielding anything.
+    """
+    import aiohttp
+
+    print(f"[api_scraper] Starting async API scrape for {league} / {prop_type}")
+    event_group_id, category_id = _resolve_ids(league, prop_type)
+    if not event_group_id:
+        return
+
+    own_session = session is None
+    if own_session:
+        session = aiohttp.ClientSession(headers=HEADERS, timeout=aiohttp.ClientTimeout(total=ASYNC_TIMEOUT))
+    try:
+        try:
+            subcategory_ids = _subcategory_ids(
+                await throttled_get_json_async(session, _category_url(event_group_id, category_id), loads=loads))
+        except Exception as e:
+            print(f"[api_scraper] ERROR: Async category request failed. {e}")
+            return
+
+        if not subcategory_ids:
+            print("[api_scraper] No subcategory IDs found. Prop market might be empty.")
+            return
+
+        semaphore = asyncio.Semaphore(ASYNC_CONCURRENCY)
+
+        async def fetch_one(sub_id):
+            async with semaphore:
+                url = _subcategory_url(event_group_id, category_id, sub_id)
+                return await throttled_get_json_async(session, url, loads=lambda body: _props_from_body(body, league))
+
+        tasks = [asyncio.ensure_future(fetch_one(sub_id)) for sub_id in subcategory_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    props = await next_done
+                except Exception as e:
+                    print(f"[api_scraper] ERROR: Async subcategory request failed. {e}")
+                    continue
+                if props:
+                    yield props
+        finally:
+            for task in tasks:
+                task.cancel()
+    finally:
+        if own_session:
+            await session.close()
@@ -0,0 +1,256 @@
+"""Backtest the predictor against archived prop snapshots and real outcomes.
+
+Inputs are local files (BACKTEST_TZ, default America/New_York, sets which calendar day a
+kickoff belongs to):
+
+- snapshots: rows like `Utilis.replay` writes (name, league, market_name, prop_line,
+  over_odds, under_odds, start_time), plus an optional `snapshot_time`. Without one,
+  each row is taken as the closing line at `start_time`.
+- outcomes: game logs in the `Utilis.feature_store` format (player, game_date, one
+  column per stat).
+
+Everything runs on whole arrays. Per-player histories are sorted once, with cumulative
+sums, so the last-N mean/std as of every snapshot (only games before the snapshot's
+day, so there is no lookahead) and the actual result of every prop's game come out of
+two `searchsorted` passes. Minute-level archives repeat the same (features, line,
+odds) row many times. Only distinct rows are simulated, with the predictor's Monte
+Carlo engine and side selection, and the picks are broadcast back and settled at the
+archived prices.
+
+The simulation is split into fixed-size chunks seeded from their position, so the result
+is identical for any `workers`; workers > 1 spreads the chunks over a process pool.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Utilis.feature_store import DEFAULT_WINDOW, read_game_logs
+from Utilis.hit_rate import stat_for_market
+from Utilis.names import canonical_key
+from Utilis.odds_math import american_array, profit_per_unit
+from Utilis.projection import SIM_SEED, choose_sides, simulate_props
+
+BACKTEST_DRAWS = int(os.environ.get('BACKTEST_DRAWS', '2000'))
+BACKTEST_TZ = os.environ.get('BACKTEST_TZ', 'America/New_York')
+SIM_CHUNK_ROWS = 4096
+CALIBRATION_BINS = 10
+
+_KEY_STRIDE = 1 << 20  # > any day number, so (player, day) packs into one sortable int64
+_NO_ODDS = -1e18       # NaN stand-in, so unpriced rows still group together
+
+
+def _days(values: pd.Series, timestamps: bool = False) -> np.ndarray:
+    """Dates -> int64 days since the epoch (-1 when unparseable).
+
+    With `timestamps=True` the values are instants (naive ones taken as UTC) and are
+    bucketed by their BACKTEST_TZ calendar day, so a 00:20Z kickoff counts toward the
+    previous evening's game in the logs.
+    """
+    # Archives repeat the same few timestamps; parse each distinct value once
+    codes, uniques = pd.factorize(pd.Series(values).astype(str))
+    uniques = pd.Series(uniques)
+    if timestamps:
+        stamps = pd.to_datetime(uniques, errors='coerce', utc=True, format='mixed').dt.tz_convert(BACKTEST_TZ)
+        stamps = stamps.dt.tz_localize(None)
+    else:
+        stamps = pd.to_datetime(uniques, errors='coerce', format='mixed')
+    days = stamps.dt.floor('D').to_numpy(dtype='datetime64[D]').astype(np.int64)
+    days = np.append(np.where(stamps.isna().to_numpy(), -1, days), -1)
+    return days[codes]
+
+
+def load_snapshots(path: str) -> pd.DataFrame:
+    """Read an archived-snapshot file written by `replay_to_file` (.parquet, .csv or JSON lines)."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        return pd.read_parquet(path)
+    if ext == '.csv':
+        return pd.read_csv(path)
+    return pd.read_json(path, lines=True)
+
+
+class _History:
+    """One stat's game logs packed as sorted (player, day) keys with cumulative sums."""
+
+    def __init__(self, logs: pd.DataFrame, stat: str, players: pd.Index):
+        values = pd.to_numeric(logs[stat], errors='coerce').to_numpy(dtype=float)
+        codes = players.get_indexer(logs['_key'])
+        days = logs['_day'].to_numpy()
+        keep = ~np.isnan(values) & (codes >= 0) & (days >= 0)
+        packed = codes[keep].astype(np.int64) * _KEY_STRIDE + days[keep]
+        order = np.argsort(packed, kind='stable')
+        self.packed = packed[order]
+        self.values = values[keep][order]
+        self.cs = np.concatenate(([0.0], np.cumsum(self.values)))
+        self.cs2 = np.concatenate(([0.0], np.cumsum(self.values ** 2)))
+
+    def rolling(self, codes: np.ndarray, cutoff_days: np.ndarray, window: int):
+        """(n, mean, std) over each player's last `window` games before `cutoff_days`."""
+        base = codes.astype(np.int64) * _KEY_STRIDE
+        start = np.searchsorted(self.packed, base, side='left')
+        end = np.searchsorted(self.packed, base + cutoff_days, side='left')
+        n = np.where(codes >= 0, np.minimum(end - start, window), 0)
+        lo = end - n
+        total = self.cs[end] - self.cs[lo]
+        total2 = self.cs2[end] - self.cs2[lo]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, total / n, np.nan)
+            var = np.where(n > 1, (total2 - n * mean * mean) / (n - 1), np.nan)
+        return n, mean, np.sqrt(np.maximum(var, 0.0))
+
+    def actual(self, codes: np.ndarray, days: np.ndarray) -> np.ndarray:
+        """The stat in each player's game on `days` (NaN when there's no such game)."""
+        if not len(self.packed):
+            return np.full(len(codes), np.nan)
+        target = codes.astype(np.int64) * _KEY_STRIDE + days
+        idx = np.minimum(np.searchsorted(self.packed, target, side='left'), len(self.packed) - 1)
+        hit = (codes >= 0) & (days >= 0) & (self.packed[idx] == target)
+        return np.where(hit, self.values[idx], np.nan)
+
+
+def _simulate_chunk(task: Tuple[np.ndarray, int, int]) -> Dict[str, np.ndarray]:
+    rows, draws, seed = task
+    odds = [np.where(rows[:, k] == _NO_ODDS, np.nan, rows[:, k]) for k in (3, 4)]
+    return simulate_props(rows[:, 0], rows[:, 1], rows[:, 2], odds[0], odds[1], draws=draws, seed=seed)
+
+
+def _simulate_unique(rows: np.ndarray, draws: int, seed: int, workers: int) -> Dict[str, np.ndarray]:
+    tasks = [(rows[i:i + SIM_CHUNK_ROWS], draws, seed + i // SIM_CHUNK_ROWS)
+             for i in range(0, len(rows), SIM_CHUNK_ROWS)]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_chunk, tasks))
+    else:
+        parts = [_simulate_chunk(t) for t in tasks]
+    if not parts:
+        return {k: np.empty(0) for k in ('p_over', 'p_under', 'ev_over', 'ev_under')}
+    return {k: np.concatenate([p[k] for p in parts]) for k in ('p_over', 'p_under', 'ev_over', 'ev_under')}
+
+
+def run_backtest(snapshots: pd.DataFrame, outcomes: pd.DataFrame,
+                 window: int = DEFAULT_WINDOW, draws: Optional[int] = None,
+                 seed: Optional[int] = None, workers: int = 1) -> Dict[str, pd.DataFrame]:
+    """Replay the predictor over every snapshot row and settle its picks.
+
+    Returns {'bets', 'summary', 'calibration'}:
+      bets         one row per settled pick: league, market_name, name, snapshot/game day,
+                   side ('over'/'under'), p_side, ev, actual, result (1 win / 0 push / -1 loss), profit
+      summary      per league and market: bets, wins, losses, pushes, hit_rate, profit, roi, brier
+      calibration  per league, market and predicted-probability bin: predicted, observed, bets
+    """
+    draws = BACKTEST_DRAWS if draws is None else draws
+    seed = SIM_SEED if seed is None else seed
+
+    snaps = snapshots.reset_index(drop=True)
+    game_day = _days(snaps['start_time'], timestamps=True)
+    snap_day = _days(snaps['snapshot_time'], timestamps=True) if 'snapshot_time' in snaps.columns else game_day
+    snap_day = np.where(snap_day < 0, game_day, snap_day)
+    cutoff = np.minimum(snap_day, np.where(game_day < 0, snap_day, game_day))
+    name_codes, names = pd.factorize(snaps['name'].fillna('').astype(str))
+    keys = pd.Index([canonical_key(n) for n in names]).take(name_codes)
+    lines = pd.to_numeric(snaps['prop_line'], errors='coerce').to_numpy(dtype=float)
+    over_odds = american_array(snaps['over_odds'].tolist()) if 'over_odds' in snaps else np.full(len(snaps), np.nan)
+    under_odds = american_array(snaps['under_odds'].tolist()) if 'under_odds' in snaps else np.full(len(snaps), np.nan)
+
+    logs = outcomes.copy()
+    logs['_key'] = logs['player'].fillna('').astype(str).map(canonical_key)
+    logs['_day'] = _days(logs['game_date'])
+    players = pd.Index(pd.unique(logs['_key']))
+    codes = players.get_indexer(keys)
+
+    stat_cols = [c for c in logs.columns if c not in ('player', 'season', 'game_date', 'team', 'opponent', 'week')
+                 and not c.startswith('_')]
+    markets = snaps['market_name'].fillna('').astype(str)
+    stat_of_market = {m: stat_for_market(m, stat_cols) for m in pd.unique(markets)}
+    stats = markets.map(stat_of_market).to_numpy(dtype=object)
+
+    n = len(snaps)
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    actual = np.full(n, np.nan)
+    for stat in {s for s in stat_of_market.values() if s}:
+        rows = np.flatnonzero(stats == stat)
+        history = _History(logs, stat, players)
+        games, mean[rows], std[rows] = history.rolling(codes[rows], cutoff[rows], window)
+        mean[rows] = np.where(games > 0, mean[rows], np.nan)
+        actual[rows] = history.actual(codes[rows], game_day[rows])
+
+    settle = np.flatnonzero(~np.isnan(mean) & ~np.isnan(lines) & ~np.isnan(actual))
+    # Simulate each distinct (mean, std, line, odds) once
+    features = np.column_stack([mean[settle], np.nan_to_num(std[settle], nan=-1.0), lines[settle],
+                                np.nan_to_num(over_odds[settle], nan=_NO_ODDS),
+                                np.nan_to_num(under_odds[settle], nan=_NO_ODDS)])
+    inverse = pd.DataFrame(features).groupby(list(range(features.shape[1])), sort=False).ngroup().to_numpy()
+    _, first = np.unique(inverse, return_index=True)
+    unique_rows = features[first]
+    unique_rows[:, 1] = np.where(unique_rows[:, 1] < 0, np.nan, unique_rows[:, 1])
+    print(f"[backtest] Simulating {len(unique_rows)} distinct props for {len(settle)} snapshot rows...")
+    sim = _simulate_unique(unique_rows, draws, seed, workers)
+    is_over, p_side, ev = choose_sides(*(sim[k][inverse] for k in ('p_over', 'p_under', 'ev_over', 'ev_under')))
+
+    # Same pass/avoid rule as predictor.predict
+    bet = (np.round(100 * p_side) >= 50) & ~(ev <= 0)
+    idx = settle[bet]
+    is_over, p_side, ev = is_over[bet], p_side[bet], ev[bet]
+    margin = actual[idx] - lines[idx]
+    result = np.sign(np.where(is_over, margin, -margin)).astype(int)
+    price = np.where(is_over, over_odds[idx], under_odds[idx])
+    # Unpriced picks settle at -110
+    payout = profit_per_unit(np.where(np.isnan(price), -110.0, price))
+    profit = np.select([result > 0, result < 0], [payout, -1.0], 0.0)
+
+    bets = pd.DataFrame({
+        'league': snaps['league'].to_numpy()[idx] if 'league' in snaps else None,
+        'market_name': markets.to_numpy()[idx],
+        'name': snaps['name'].to_numpy()[idx],
+        'snapshot_day': snap_day[idx].astype('datetime64[D]'),
+        'game_day': game_day[idx].astype('datetime64[D]'),
+        'side': np.where(is_over, 'over', 'under'),
+        'prop_line': lines[idx],
+        'p_side': p_side,
+        'ev': ev,
+        'actual': actual[idx],
+        'result': result,
+        'profit': profit,
+    })
+    return {'bets': bets, 'summary': summarize(bets), 'calibration': calibration(bets)}
+
+
+def summarize(bets: pd.DataFrame) -> pd.DataFrame:
+    """ROI, hit rate and Brier score per league and market."""
+    frame = bets.assign(
+        win=(bets['result'] > 0).astype(int),
+        loss=(bets['result'] < 0).astype(int),
+        push=(bets['result'] == 0).astype(int),
+        sq_err=np.where(bets['result'] != 0, (bets['p_side'] - (bets['result'] > 0)) ** 2, np.nan),
+    )
+    summary = frame.groupby(['league', 'market_name'], dropna=False).agg(
+        bets=('result', 'size'), wins=('win', 'sum'), losses=('loss', 'sum'), pushes=('push', 'sum'),
+        profit=('profit', 'sum'), brier=('sq_err', 'mean'),
+    ).reset_index()
+    decided = summary['wins'] + summary['losses']
+    summary['hit_rate'] = np.where(decided > 0, summary['wins'] / decided.where(decided > 0, 1), np.nan)
+    summary['roi'] = summary['profit'] / summary['bets']
+    return summary[['league', 'market_name', 'bets', 'wins', 'losses', 'pushes',
+                    'hit_rate', 'profit', 'roi', 'brier']]
+
+
+def calibration(bets: pd.DataFrame, bins: int = CALIBRATION_BINS) -> pd.DataFrame:
+    """Predicted vs observed win rate per league, market and probability bin (pushes excluded)."""
+    decided = bets[bets['result'] != 0]
+    frame = decided.assign(
+        bin=np.minimum((decided['p_side'] * bins).astype(int), bins - 1) / bins,
+        won=(decided['result'] > 0).astype(float),
+    )
+    return frame.groupby(['league', 'market_name', 'bin'], dropna=False).agg(
+        predicted=('p_side', 'mean'), observed=('won', 'mean'), bets=('won', 'size'),
+    ).reset_index()
+
+
+def run_backtest_files(snapshot_path: str, outcome_path: str, **kwargs: Any) -> Dict[str, pd.DataFrame]:
+    """`run_backtest` over a snapshot file and a game-log file or directory."""
+    return run_backtest(load_snapshots(snapshot_path), read_game_logs(outcome_path), **kwargs)
@@ -0,0 +1,279 @@
+"""Schema decoder for the DraftKings offers tree.
+
+    eventGroup → offerCategories[] → offerSubcategoryDescriptors[] → offerSubcategory
+               → offers[] → markets[] → outcomes[]
+
+The fields read at each level are declared once below (`*_FIELDS`). Every list element is
+decoded on its own: a malformed category, descriptor, offer or market is skipped and the
+rest of the response still comes through, instead of one bad market failing the whole
+subcategory. The over and under outcomes are picked by their label, not their position.
+
+With the msgspec backend, `iter_markets_from_bytes` decodes straight into structs, so
+only the keys listed here are ever materialized. A well-formed body is decoded in one
+pass; if validation fails anywhere, the body is re-read lazily, one level at a time, as
+structs holding `msgspec.Raw` spans of their children, and only the broken node is
+dropped. Other backends decode the body first and walk it with the same schema.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from Utilis.fast_json import BACKEND, Buffer, loads
+
+OVER_LABELS = frozenset({'over', 'o'})
+UNDER_LABELS = frozenset({'under', 'u'})
+
+
+class SchemaError(ValueError):
+    """A node in the offers tree doesn't match the schema."""
+
+
+class OfferMarket(NamedTuple):
+    market_name: str
+    start_date: Optional[str]
+    participant: str
+    line: Optional[float]
+    over_odds: Optional[Union[str, int]]
+    under_odds: Optional[Union[str, int]]
+
+
+# output name -> (source key, accepted types); a missing key decodes to None
+EVENT_GROUP_FIELDS = {'categories': ('offerCategories', (list,))}
+CATEGORY_FIELDS = {'descriptors': ('offerSubcategoryDescriptors', (list,))}
+DESCRIPTOR_FIELDS = {
+    'name': ('name', (str,)),
+    'subcategory_id': ('subcategoryId', (int, str)),
+    'offer_subcategory': ('offerSubcategory', (dict,)),
+}
+OFFER_SUBCATEGORY_FIELDS = {'offers': ('offers', (list,))}
+MARKET_FIELDS = {'start_date': ('startDate', (str,)), 'outcomes': ('outcomes', (list,))}
+OUTCOME_FIELDS = {
+    'participant': ('participant', (str,)),
+    'label': ('label', (str,)),
+    'line': ('line', (int, float)),
+    'odds': ('oddsAmerican', (str, int)),
+}
+
+# (participant, label, line, odds)
+_Outcome = Tuple[Optional[str], Optional[str], Optional[float], Optional[Union[str, int]]]
+
+
+def _debug_print(*args, **kwargs):
+    if os.environ.get('SCRAPER_DEBUG', '0') in ('1', 'true', 'True'):
+        print(*args, **kwargs)
+
+
+def decode_node(raw: Any, fields: Mapping[str, Tuple[str, tuple]]) -> Dict[str, Any]:
+    """Pull the declared `fields` out of one JSON object, checking their types."""
+    if not isinstance(raw, dict):
+        raise SchemaError(f"expected an object, got {type(raw).__name__}")
+    node = {}
+    for name, (key, types) in fields.items():
+        value = raw.get(key)
+        if value is not None and (not isinstance(value, types) or isinstance(value, bool)):
+            raise SchemaError(f"{key}: unexpected {type(value).__name__}")
+        node[name] = value
+    return node
+
+
+def _each(items: Optional[list], fields, where: str) -> Iterator[Dict[str, Any]]:
+    for raw in items or ():
+        try:
+            yield decode_node(raw, fields)
+        except SchemaError as e:
+            _debug_print(f"[dk_schema] Skipping malformed {where}: {e}")
+
+
+def pick_over_under(outcomes: List[_Outcome]) -> Tuple[_Outcome, Optional[_Outcome]]:
+    """(over, under) by label. Unlabelled two-way markets fall back to (first, second)."""
+    over = under = None
+    for outcome in outcomes:
+        label = (outcome[1] or '').strip().lower()
+        if label in OVER_LABELS and over is None:
+            over = outcome
+        elif label in UNDER_LABELS and under is None:
+            under = outcome
+    if over is None and len(outcomes) == 2 and not any(o[1] for o in outcomes):
+        over, under = outcomes
+    if over is None:
+        raise SchemaError("no Over outcome")
+    return over, under
+
+
+def _offer_market(market_name: str, start_date: Optional[str], outcomes: List[_Outcome]) -> Optional[OfferMarket]:
+    """Player over/under market, or None for markets without a participant (team lines etc.)."""
+    over, under = pick_over_under(outcomes)
+    if over[0] is None:
+        return None
+    return OfferMarket(market_name, start_date, over[0], over[2], over[3], under[3] if under else None)
+
+
+def subcategory_ids(data: Any) -> List[Any]:
+    """Subcategory IDs listed in a category response."""
+    try:
+        event_group = decode_node((data or {}).get('eventGroup') or {}, EVENT_GROUP_FIELDS)
+    except (SchemaError, AttributeError):
+        return []
+    ids = []
+    for cat in _each(event_group['categories'], CATEGORY_FIELDS, 'category'):
+        for desc in _each(cat['descriptors'], DESCRIPTOR_FIELDS, 'descriptor'):
+            if desc['subcategory_id'] is not None:
+                ids.append(desc['subcategory_id'])
+    return ids
+
+
+def iter_markets(data: Any) -> Iterator[OfferMarket]:
+    """Player markets in an already-decoded subcategory response, skipping malformed ones."""
+    try:
+        event_group = decode_node((data or {}).get('eventGroup') or {}, EVENT_GROUP_FIELDS)
+    except (SchemaError, AttributeError):
+        return
+    for cat in _each(event_group['categories'], CATEGORY_FIELDS, 'category'):
+        for desc in _each(cat['descriptors'], DESCRIPTOR_FIELDS, 'descriptor'):
+            if desc['offer_subcategory'] is None:
+                continue
+            market_name = desc['name'] or 'Unknown Market'
+            try:
+                offers = decode_node(desc['offer_subcategory'], OFFER_SUBCATEGORY_FIELDS)['offers']
+            except SchemaError as e:
+                _debug_print(f"[dk_schema] Skipping malformed offerSubcategory: {e}")
+                continue
+            for offer in offers or ():
+                if not isinstance(offer, list):
+                    _debug_print(f"[dk_schema] Skipping malformed offer: {type(offer).__name__}")
+                    continue
+                for market in _each(offer, MARKET_FIELDS, 'market'):
+                    try:
+                        outcomes = [
+                            (o['participant'], o['label'], o['line'], o['odds'])
+                            for o in (decode_node(raw, OUTCOME_FIELDS) for raw in market['outcomes'] or ())
+                        ]
+                        result = _offer_market(market_name, market['start_date'], outcomes)
+                    except SchemaError as e:
+                        _debug_print(f"[dk_schema] Skipping malformed market: {e}")
+                        continue
+                    if result is not None:
+                        yield result
+
+
+# --- Lazy msgspec path ---
+
+if BACKEND == 'msgspec':
+    import msgspec
+
+    # Optional children are Raw spans defaulting to empty; `_absent` treats empty and null alike
+    _NULL = msgspec.Raw(b'null')
+
+    def _absent(raw: msgspec.Raw) -> bool:
+        return len(raw) == 0 or raw == _NULL
+
+    class _Root(msgspec.Struct):
+        eventGroup: msgspec.Raw = msgspec.Raw()
+
+    class _EventGroup(msgspec.Struct):
+        offerCategories: List[msgspec.Raw] = []
+
+    class _Category(msgspec.Struct):
+        offerSubcategoryDescriptors: List[msgspec.Raw] = []
+
+    class _Descriptor(msgspec.Struct):
+        name: Optional[str] = None
+        offerSubcategory: msgspec.Raw = msgspec.Raw()
+
+    class _OfferSubcategory(msgspec.Struct):
+        offers: List[msgspec.Raw] = []
+
+    class _OutcomeNode(msgspec.Struct):
+        participant: Optional[str] = None
+        label: Optional[str] = None
+        line: Optional[float] = None
+        oddsAmerican: Optional[Union[str, int]] = None
+
+    class _Market(msgspec.Struct):
+        startDate: Optional[str] = None
+        outcomes: List[_OutcomeNode] = []
+
+    # Whole-response typed decode: the fast path when nothing in the body is malformed
+    class _FullSubcategory(msgspec.Struct):
+        offers: List[List[_Market]] = []
+
+    class _FullDescriptor(msgspec.Struct):
+        name: Optional[str] = None
+        offerSubcategory: Optional[_FullSubcategory] = None
+
+    class _FullCategory(msgspec.Struct):
+        offerSubcategoryDescriptors: List[_FullDescriptor] = []
+
+    class _FullEventGroup(msgspec.Struct):
+        offerCategories: List[_FullCategory] = []
+
+    class _FullRoot(msgspec.Struct):
+        eventGroup: Optional[_FullEventGroup] = None
+
+    _full_decoder = msgspec.json.Decoder(_FullRoot)
+
+    _decoders = {t: msgspec.json.Decoder(t) for t in
+                 (_Root, _EventGroup, _Category, _Descriptor, _OfferSubcategory, _Market, List[msgspec.Raw])}
+
+    def _lazy(raw: Any, type_, where: str):
+        try:
+            return _decoders[type_].decode(raw)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            _debug_print(f"[dk_schema] Skipping malformed {where}: {e}")
+            return None
+
+    def _markets_from_structs(market_name: str, markets: List[_Market]) -> Iterator[OfferMarket]:
+        for market in markets:
+            outcomes = [(o.participant, o.label, o.line, o.oddsAmerican) for o in market.outcomes]
+            try:
+                result = _offer_market(market_name, market.startDate, outcomes)
+            except SchemaError as e:
+                _debug_print(f"[dk_schema] Skipping malformed market: {e}")
+                continue
+            if result is not None:
+                yield result
+
+    def _iter_markets_typed(body: Buffer) -> Iterator[OfferMarket]:
+        try:
+            root = _full_decoder.decode(body)
+        except msgspec.ValidationError:
+            # Something in the tree is off: redo it node by node so only that node is lost
+            yield from _iter_markets_lazy(body)
+            return
+        except msgspec.DecodeError as e:
+            _debug_print(f"[dk_schema] Skipping malformed response: {e}")
+            return
+        if root.eventGroup is None:
+            return
+        for cat in root.eventGroup.offerCategories:
+            for desc in cat.offerSubcategoryDescriptors:
+                if desc.offerSubcategory is None:
+                    continue
+                market_name = desc.name or 'Unknown Market'
+                for offer in desc.offerSubcategory.offers:
+                    yield from _markets_from_structs(market_name, offer)
+
+    def _iter_markets_lazy(body: Buffer) -> Iterator[OfferMarket]:
+        root = _lazy(body, _Root, 'response')
+        if root is None or _absent(root.eventGroup):
+            return
+        event_group = _lazy(root.eventGroup, _EventGroup, 'eventGroup')
+        for raw_cat in event_group.offerCategories if event_group else ():
+            cat = _lazy(raw_cat, _Category, 'category')
+            for raw_desc in cat.offerSubcategoryDescriptors if cat else ():
+                desc = _lazy(raw_desc, _Descriptor, 'descriptor')
+                if desc is None or _absent(desc.offerSubcategory):
+                    continue
+                market_name = desc.name or 'Unknown Market'
+                sub = _lazy(desc.offerSubcategory, _OfferSubcategory, 'offerSubcategory')
+                for raw_offer in sub.offers if sub else ():
+                    offer = _lazy(raw_offer, List[msgspec.Raw], 'offer')
+                    markets = (_lazy(raw_market, _Market, 'market') for raw_market in offer or ())
+                    yield from _markets_from_structs(market_name, [m for m in markets if m is not None])
+
+
+def iter_markets_from_bytes(body: Buffer) -> Iterator[OfferMarket]:
+    """Player markets in a raw subcategory response body (typed and lazy with msgspec)."""
+    if BACKEND == 'msgspec':
+        return _iter_markets_typed(body)
+    return iter_markets(loads(body))
@@ -1,39 +1,48 @@
+import os
 import re
 import json
 from typing import Optional, Any, Dict, List
 from playwright.async_api import Page, Response
-from cfb_prop_predictor.types import OddsData
+from cfb_prop_predictor.types import OddsData, PropRecord
 from Utilis.provider_parser import extract_prop_from_candidate
+from Utilis.names import name_matcher
+from Utilis.fast_json import loads
+from Utilis.loop_lag import BoundedOffload, LoopLagMonitor
+from Utilis.rate_limit import throttled_goto
+
+
+# Controlled debug printing for noisy parser output
+def _debug_print(*args, **kwargs):
+    if os.environ.get('SCRAPER_DEBUG', '0') in ('1', 'true', 'True'):
+        print(*args, **kwargs)
+
 
 # ---
 # --- NEW PARSER FUNCTION ---
 # ---
-def parse_dk_json_payload(payload: Dict[str, Any], league: str, prop_type: str) -> List[Dict[str, Any]]:
-    """
-    Parses a pre-loaded DK JSON blob for all player props.
-    This avoids live scraping and uses local sample data.
-    """
-    all_props_list = []
+def _walk(o):
+    if isinstance(o, dict):
+        yield o
+        for v in o.values():
+            yield from _walk(v)
+    elif isinstance(o, list):
+        for it in o:
+            yield from _walk(it)
+
+
+def _props_from_object(obj: Any, league: str, prop_type: str) -> List[PropRecord]:
+    """Every player-like object in a decoded DK JSON blob that carries a line for `prop_type`."""
+    props = []
     # e.g., "passing" from "player_passing_yards"
     prop_identifier = prop_type.split('_')[1] if '_' in prop_type else prop_type
 
-    # Use the *same* walk function from your original scraper
-    def walk(o):
-        if isinstance(o, dict):
-            yield o
-            for v in o.values():
-                yield from walk(v)
-        elif isinstance(o, list):
-            for it in o:
-                yield from walk(it)
-
-    for candidate in walk(payload):
+    for candidate in _walk(obj):
         name = (candidate.get('name') or candidate.get('playerName') or '')
         if not name:
             continue
 
         prop_val = extract_prop_from_candidate(candidate, prop_identifier)
-        
+
         if prop_val is not None:
             team_name = candidate.get("teamName", candidate.get("team"))
             opp_name = candidate.get("opponentName", candidate.get("opponent"))
@@ -44,31 +53,65 @@ def parse_dk_json_payload(payload: Dict[str, Any], league: str, prop_type: str)
                     team_name = team_name or participants[0]
                     opp_name = opp_name or participants[1]
 
-            prop_dict = {
-                "name": name,
-                "position": candidate.get("position", "N/A"),
-                "team_name": team_name,
-                "team_abbrev": candidate.get("teamAbbreviation"),
-                "opponent_name": opp_name,
-                "opponent_abbrev": candidate.get("opponentAbbreviation"),
-                "start_time": candidate.get("startDate") or candidate.get("startTimeISO"),
-                "league": league,
-                "market_name": prop_type.replace('_', ' ').title(),
-                "prop_line": prop_val
-            }
-            all_props_list.append(prop_dict)
+            props.append(PropRecord(
+                name=name,
+                position=candidate.get("position", "N/A"),
+                team_name=team_name,
+                team_abbrev=candidate.get("teamAbbreviation"),
+                opponent_name=opp_name,
+                opponent_abbrev=candidate.get("opponentAbbreviation"),
+                start_time=candidate.get("startDate") or candidate.get("startTimeISO"),
+                league=league,
+                market_name=prop_type.replace('_', ' ').title(),
+                prop_line=prop_val
+            ))
+    return props
+
+
+def _props_from_body(body: bytes, league: str, prop_type: str) -> List[PropRecord]:
+    """Decode and walk one intercepted response body. Runs on the parse executor."""
+    try:
+        obj = loads(body)
+    except Exception:
+        return []  # Not a valid JSON response
+    return _props_from_object(obj, league, prop_type)
+
+
+def _props_from_html(content: str, league: str, prop_type: str) -> List[PropRecord]:
+    """Fallback: props from JSON-looking objects embedded in the page HTML. Runs on the parse executor."""
+    props = []
+    js_objects = re.findall(r"(\{[\s\S]{100,200000}?\})", content)
+    print(f"DEBUG(dk) [Fallback]: found {len(js_objects)} js_objects candidates")
+    for txt in js_objects:
+        try:
+            obj = json.loads(txt)
+        except Exception:
+            continue
+        props.extend(_props_from_object(obj, league, prop_type))
+    return props
+
+
+# ---
+# --- NEW PARSER FUNCTION ---
+# ---
+def parse_dk_json_payload(payload: Dict[str, Any], league: str, prop_type: str) -> List[PropRecord]:
+    """
+    Parses a pre-loaded DK JSON blob for all player props.
+    This avoids live scraping and uses local sample data.
+    """
+    all_props_list = _props_from_object(payload, league, prop_type)
 
     if not all_props_list:
-        print(f"WARNING(dk-parser): Could not find any props in the sample JSON.")
+        _debug_print(f"WARNING(dk-parser): Could not find any props in the sample JSON.")
         return []
 
-    print(f"DEBUG(dk-parser): Extracted {len(all_props_list)} raw props from sample JSON.")
+    _debug_print(f"DEBUG(dk-parser): Extracted {len(all_props_list)} raw props from sample JSON.")
     
     # De-duplicate
     unique_props = { (p['name'], p['prop_line']) : p for p in all_props_list }.values()
     final_list = list(unique_props)
     
-    print(f"DEBUG(dk-parser): Returning {len(final_list)} unique props.")
+    _debug_print(f"DEBUG(dk-parser): Returning {len(final_list)} unique props.")
     return final_list
 
 # ---
@@ -80,7 +123,7 @@ def parse_dk_json_payload(payload: Dict[str, Any], league: str, prop_type: str)
 # --- NEW SCANNER FUNCTION (with Network Interception) ---
 # ---
 
-async def scan_all_draftkings_props(page: Page, league: str, prop_type: str) -> List[Dict[str, Any]]:
+async def scan_all_draftkings_props(page: Page, league: str, prop_type: str) -> List[PropRecord]:
     """
     Scans a DraftKings page for ALL available player props for a given market
     by intercepting the site's internal API (XHR/Fetch) calls.
@@ -95,9 +138,10 @@ async def scan_all_draftkings_props(page: Page, league: str, prop_type: str) ->
 
     # This list will be populated by our network response handler
     all_props_list = []
-    
-    # e.g., "passing" from "player_passing_yards"
-    prop_identifier = prop_type.split('_')[1] if '_' in prop_type else prop_type
+
+    # Decoding and walking a body is CPU-bound; it runs on a bounded executor so the loop
+    # stays free to service other responses while a large body is being parsed
+    offload = BoundedOffload()
 
     # 2. Define the response handler
     async def handle_response(response: Response):
@@ -109,121 +153,42 @@ async def scan_all_draftkings_props(page: Page, league: str, prop_type: str) ->
         if response.request.resource_type not in ["xhr", "fetch"]:
             return
 
-        try:
-            obj = await response.json()
-        except Exception:
-            return # Not a valid JSON response
-
-        # Use the *same* walk function from your original scraper
-        def walk(o):
-            if isinstance(o, dict):
-                yield o
-                for v in o.values():
-                    yield from walk(v)
-            elif isinstance(o, list):
-                for it in o:
-                    yield from walk(it)
-
-        for candidate in walk(obj):
-            name = (candidate.get('name') or candidate.get('playerName') or '')
-            if not name:
-                continue
+        # Tracked from before the body is read, so `drain` also waits for bodies still downloading
+        async with offload.track():
+            try:
+                body = await response.body()
+            except Exception:
+                return
 
-            # Use your existing prop extractor to find the line
-            prop_val = extract_prop_from_candidate(candidate, prop_identifier)
-            
-            if prop_val is not None:
-                team_name = candidate.get("teamName", candidate.get("team"))
-                opp_name = candidate.get("opponentName", candidate.get("opponent"))
-
-                if not team_name or not opp_name:
-                    participants = [p.get('name') for p in candidate.get('participants', []) if p.get('name')]
-                    if len(participants) == 2:
-                        team_name = team_name or participants[0]
-                        opp_name = opp_name or participants[1]
-
-                prop_dict = {
-                    "name": name,
-                    "position": candidate.get("position", "N/A"),
-                    "team_name": team_name,
-                    "team_abbrev": candidate.get("teamAbbreviation"),
-                    "opponent_name": opp_name,
-                    "opponent_abbrev": candidate.get("opponentAbbreviation"),
-                    "start_time": candidate.get("startDate") or candidate.get("startTimeISO"),
-                    "league": league,
-                    "market_name": prop_type.replace('_', ' ').title(),
-                    "prop_line": prop_val
-                }
-                all_props_list.append(prop_dict)
+            all_props_list.extend(await offload.run(_props_from_body, body, league, prop_type))
 
     # 3. Register the listener *before* navigating
     page.on('response', handle_response)
     
-    # 4. Navigate and wait for the page to load and make API calls
-    try:
-        await page.goto(url, wait_until='networkidle', timeout=10000)
-    except Exception:
-        print("DEBUG(dk): Networkidle failed, trying domcontentloaded...")
-        await page.goto(url, wait_until='domcontentloaded', timeout=10000)
-    
-    # Give listeners a moment to fire
-    await page.wait_for_timeout(3000) 
-    
-    # 5. Unregister the listener (Note: Playwright Python doesn't have 'off', so we skip this)
-    # page.off('response', handle_response)
+    async with LoopLagMonitor() as lag:
+        # 4. Navigate and wait for the page to load and make API calls
+        try:
+            await throttled_goto(page, url, wait_until='networkidle', timeout=10000)
+        except Exception:
+            print("DEBUG(dk): Networkidle failed, trying domcontentloaded...")
+            await throttled_goto(page, url, wait_until='domcontentloaded', timeout=10000)
 
-    if not all_props_list:
-        print(f"WARNING(dk): Network interception found no matching API calls. Trying HTML content fallback...")
-        # --- FALLBACK: Try the old HTML content method ---
-        # (This is the logic from the previous step)
-        content = await page.content()
-        js_objects = re.findall(r"(\{[\s\S]{100,200000}?\})", content)
-        print(f"DEBUG(dk) [Fallback]: found {len(js_objects)} js_objects candidates")
-        for idx, txt in enumerate(js_objects):
-            try:
-                obj = json.loads(txt)
-            except Exception:
-                continue
+        # Give listeners a moment to fire, then wait for the bodies still being parsed
+        await page.wait_for_timeout(3000)
+        await offload.drain()
 
-            def walk(o):
-                if isinstance(o, dict):
-                    yield o
-                    for v in o.values():
-                        yield from walk(v)
-                elif isinstance(o, list):
-                    for it in o:
-                        yield from walk(it)
+        # 5. Unregister the listener (Note: Playwright Python doesn't have 'off', so we skip this)
+        # page.off('response', handle_response)
 
-            for candidate in walk(obj):
-                name = (candidate.get('name') or candidate.get('playerName') or '')
-                if not name:
-                    continue
+        if not all_props_list:
+            print(f"WARNING(dk): Network interception found no matching API calls. Trying HTML content fallback...")
+            # --- FALLBACK: Try the old HTML content method ---
+            content = await page.content()
+            all_props_list.extend(await offload.run(_props_from_html, content, league, prop_type))
 
-                prop_val = extract_prop_from_candidate(candidate, prop_identifier)
-                
-                if prop_val is not None:
-                    team_name = candidate.get("teamName", candidate.get("team"))
-                    opp_name = candidate.get("opponentName", candidate.get("opponent"))
-
-                    if not team_name or not opp_name:
-                        participants = [p.get('name') for p in candidate.get('participants', []) if p.get('name')]
-                        if len(participants) == 2:
-                            team_name = team_name or participants[0]
-                            opp_name = opp_name or participants[1]
-
-                    prop_dict = {
-                        "name": name,
-                        "position": candidate.get("position", "N/A"),
-                        "team_name": team_name,
-                        "team_abbrev": candidate.get("teamAbbreviation"),
-                        "opponent_name": opp_name,
-                        "opponent_abbrev": candidate.get("opponentAbbreviation"),
-                        "start_time": candidate.get("startDate") or candidate.get("startTimeISO"),
-                        "league": league,
-                        "market_name": prop_type.replace('_', ' ').title(),
-                        "prop_line": prop_val
-                    }
-                    all_props_list.append(prop_dict)
+    stats = lag.stats()
+    print(f"DEBUG(dk): Event-loop lag during scan: max {stats['max_ms']}ms, p95 {stats['p95_ms']}ms "
+          f"over {stats['samples']} samples.")
 
     if not all_props_list:
         print(f"WARNING(dk): All scraping methods failed. No props found.")
@@ -306,13 +271,14 @@ async def scrape_draftkings_player_props(page: Page, player_name: str, prop_type
     ]
     target = player_name.strip().lower()
     target_last = target.split()[-1] if target else ''
+    is_target = name_matcher(player_name)
     prop_identifier = prop_type.split('_')[1] if '_' in prop_type else prop_type
     for url in urls:
         try:
-            await page.goto(url, wait_until='networkidle')
+            await throttled_goto(page, url, wait_until='networkidle')
         except Exception:
             try:
-                await page.goto(url, wait_until='domcontentloaded')
+                await throttled_goto(page, url, wait_until='domcontentloaded')
             except Exception:
                 continue
         content = await page.content()
@@ -335,8 +301,7 @@ async def scrape_draftkings_player_props(page: Page, player_name: str, prop_type
                 name = (candidate.get('name') or candidate.get('playerName') or '')
                 if not name:
                     continue
-                name_norm = re.sub(r"[^a-z0-9 ]+", "", name.lower())
-                if name_norm == target or target_last in name_norm.split():
+                if is_target(name):
                     print(f"DEBUG(dk): matched candidate name={name}")
                     prop_val = extract_prop_from_candidate(candidate, prop_identifier)
                     if prop_val is not None:
@@ -0,0 +1,71 @@
+"""Response decoding for the DraftKings API.
+
+Subcategory responses run to megabytes of JSON, almost all of it fields the scraper
+never reads. This module picks the fastest installed decoder; with msgspec, `Utilis.dk_schema`
+also decodes subcategory bodies lazily into typed structs.
+
+Backends, in order of preference: msgspec, orjson, the standard library. Set
+JSON_BACKEND=json|orjson|msgspec to force one. Neither fast backend is a hard
+dependency.
+
+`ACCEPT_ENCODING` advertises brotli only when a brotli decoder is installed, since
+requests/urllib3 and aiohttp can only inflate `br` bodies with one.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import msgspec
+except ImportError:  # optional
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:  # optional
+    orjson = None
+
+try:
+    import brotli  # noqa: F401  (used by urllib3 / aiohttp to inflate 'br')
+    _HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if _HAS_BROTLI else 'gzip, deflate'
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+
+def _pick_backend() -> str:
+    forced = os.environ.get('JSON_BACKEND', '').lower()
+    available = {'json': True, 'orjson': orjson is not None, 'msgspec': msgspec is not None}
+    if forced:
+        if not available.get(forced):
+            print(f"[fast_json] WARNING: JSON_BACKEND={forced} is not installed; using auto.")
+        else:
+            return forced
+    if msgspec is not None:
+        return 'msgspec'
+    if orjson is not None:
+        return 'orjson'
+    return 'json'
+
+
+BACKEND = _pick_backend()
+
+if BACKEND == 'msgspec':
+    _generic_decoder = msgspec.json.Decoder()
+    loads = _generic_decoder.decode
+elif BACKEND == 'orjson':
+    loads = orjson.loads
+else:
+    def loads(data: Buffer) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
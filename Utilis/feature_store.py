@@ -0,0 +1,273 @@
+"""Local player game-log store with incrementally maintained rolling features.
+
+Each (player, stat) pair keeps a ring buffer of its last `window` games plus running
+sums, so adding a game is O(1): the new value goes in, the value falling out of the
+window comes out of the sums, and the season totals are bumped (and reset when a new
+season starts). Nothing is recomputed from the full log.
+
+State lives in NumPy arrays with one row per player, so features for a whole slate
+come back as arrays from a single fancy-indexing pass (`bulk_features`,
+`last_n_values`) instead of one lookup per player.
+
+Game logs load from CSV or Parquet (or a directory of them) with columns
+`player`, `season`, `game_date` and one column per stat, e.g. `receiving_yards`.
+Set PLAYER_GAME_LOGS to a file or directory to have `get_default_store` load it.
+"""
+
+import glob
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from Utilis.names import canonical_key
+
+DEFAULT_STATS = ('passing_yards', 'rushing_yards', 'receiving_yards', 'receptions')
+DEFAULT_WINDOW = 5
+
+
+def stat_for_prop_type(prop_type: str) -> str:
+    """'player_receiving_yards' -> 'receiving_yards'."""
+    return prop_type[len('player_'):] if prop_type.startswith('player_') else prop_type
+
+
+class PlayerStatStore:
+    """Rolling last-N mean/variance and season averages per player and stat."""
+
+    def __init__(self, stats: Sequence[str] = DEFAULT_STATS, window: int = DEFAULT_WINDOW, capacity: int = 256):
+        self.stats = tuple(stats)
+        self.window = window
+        self._stat_index = {s: i for i, s in enumerate(self.stats)}
+        self._rows: Dict[str, int] = {}
+        self._names: List[str] = []
+        self.version = 0  # bumped on every applied game, for caches built on top of the store
+        self._lock = threading.Lock()
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int) -> None:
+        n_stats = len(self.stats)
+        self._ring = np.full((capacity, n_stats, self.window), np.nan)
+        self._pos = np.zeros((capacity, n_stats), dtype=np.int64)     # next ring slot
+        self._count = np.zeros((capacity, n_stats), dtype=np.int64)   # values in the window
+        self._win_sum = np.zeros((capacity, n_stats))
+        self._win_sumsq = np.zeros((capacity, n_stats))
+        self._season_sum = np.zeros((capacity, n_stats))
+        self._season_games = np.zeros((capacity, n_stats), dtype=np.int64)
+        self._season: List[Any] = [None] * capacity
+        self._last_game: List[Any] = [None] * capacity
+
+    def _grow(self) -> None:
+        old = (self._ring, self._pos, self._count, self._win_sum, self._win_sumsq,
+               self._season_sum, self._season_games, self._season, self._last_game)
+        size = len(old[-1])
+        self._alloc(size * 2)
+        for new, prev in zip((self._ring, self._pos, self._count, self._win_sum, self._win_sumsq,
+                              self._season_sum, self._season_games), old[:7]):
+            new[:size] = prev
+        self._season[:size] = old[7]
+        self._last_game[:size] = old[8]
+
+    def _row(self, player: str, create: bool) -> Optional[int]:
+        key = canonical_key(player or '')
+        row = self._rows.get(key)
+        if row is None and create and key:
+            row = len(self._names)
+            if row == len(self._season):
+                self._grow()
+            self._rows[key] = row
+            self._names.append(player)
+        return row
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, player: str) -> bool:
+        return canonical_key(player or '') in self._rows
+
+    # --- Updates ---
+
+    def add_game(self, player: str, stats: Mapping[str, Any], season: Any = None, game_date: Any = None) -> bool:
+        """Fold one game into the player's features in O(1).
+
+        Games must arrive in date order per player; a game dated on or before the player's
+        last one is ignored (returns False), so reloading a log doesn't double count. A new
+        `season` value resets the season averages but not the rolling window.
+        """
+        with self._lock:
+            row = self._row(player, create=True)
+            if row is None:
+                return False
+            last = self._last_game[row]
+            if game_date is not None and last is not None and game_date <= last:
+                return False
+            self._last_game[row] = game_date
+            self.version += 1
+            if season is not None and season != self._season[row]:
+                self._season[row] = season
+                self._season_sum[row] = 0.0
+                self._season_games[row] = 0
+
+            for stat, value in stats.items():
+                col = self._stat_index.get(stat)
+                if col is None or value is None:
+                    continue
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                if value != value:  # NaN: stat not recorded for this game
+                    continue
+                pos = self._pos[row, col]
+                if self._count[row, col] == self.window:
+                    old = self._ring[row, col, pos]
+                    self._win_sum[row, col] -= old
+                    self._win_sumsq[row, col] -= old * old
+                else:
+                    self._count[row, col] += 1
+                self._ring[row, col, pos] = value
+                self._pos[row, col] = (pos + 1) % self.window
+                self._win_sum[row, col] += value
+                self._win_sumsq[row, col] += value * value
+                self._season_sum[row, col] += value
+                self._season_games[row, col] += 1
+            return True
+
+    def add_games(self, frame: pd.DataFrame) -> int:
+        """Fold a game-log frame in date order; returns how many games were applied."""
+        if frame.empty:
+            return 0
+        order = [c for c in ('season', 'game_date') if c in frame.columns]
+        if order:
+            frame = frame.sort_values(order, kind='stable')
+        stat_cols = [s for s in self.stats if s in frame.columns]
+        players = frame['player'].tolist()
+        seasons = frame['season'].tolist() if 'season' in frame.columns else [None] * len(frame)
+        dates = frame['game_date'].astype(str).tolist() if 'game_date' in frame.columns else [None] * len(frame)
+        values = frame[stat_cols].to_numpy(dtype=float, na_value=np.nan)
+        applied = 0
+        for player, season, date, row in zip(players, seasons, dates, values):
+            applied += self.add_game(player, dict(zip(stat_cols, row)), season=season, game_date=date)
+        return applied
+
+    # --- Reads ---
+
+    def _rows_for(self, players: Iterable[str]) -> np.ndarray:
+        return np.array([-1 if (r := self._rows.get(canonical_key(p or ''))) is None else r for p in players],
+                        dtype=np.int64)
+
+    def bulk_features(self, players: Sequence[str], stat: str) -> Dict[str, np.ndarray]:
+        """Features for every player as aligned arrays (NaN / 0 for unknown players or stats).
+
+        Keys: last_n_mean, last_n_var (sample variance), last_n_games, season_avg, season_games.
+        """
+        n = len(players)
+        col = self._stat_index.get(stat)
+        rows = self._rows_for(players)
+        known = rows >= 0
+        if col is None:
+            known[:] = False
+        idx = rows[known]
+        count = np.zeros(n, dtype=np.int64)
+        win_sum = np.zeros(n)
+        win_sumsq = np.zeros(n)
+        season_sum = np.zeros(n)
+        season_games = np.zeros(n, dtype=np.int64)
+        if idx.size:
+            with self._lock:
+                count[known] = self._count[idx, col]
+                win_sum[known] = self._win_sum[idx, col]
+                win_sumsq[known] = self._win_sumsq[idx, col]
+                season_sum[known] = self._season_sum[idx, col]
+                season_games[known] = self._season_games[idx, col]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, win_sum / count, np.nan)
+            var = np.where(count > 1, (win_sumsq - count * mean * mean) / (count - 1), np.nan)
+            season_avg = np.where(season_games > 0, season_sum / season_games, np.nan)
+        return {
+            'last_n_mean': mean,
+            'last_n_var': np.maximum(var, 0.0),
+            'last_n_games': count,
+            'season_avg': season_avg,
+            'season_games': season_games,
+        }
+
+    def last_n_values(self, players: Sequence[str], stat: str) -> np.ndarray:
+        """(len(players), window) array of each player's last games, oldest first, NaN-padded on the left."""
+        out = np.full((len(players), self.window), np.nan)
+        col = self._stat_index.get(stat)
+        if col is None:
+            return out
+        rows = self._rows_for(players)
+        known = np.flatnonzero(rows >= 0)
+        if not known.size:
+            return out
+        idx = rows[known]
+        with self._lock:
+            ring = self._ring[idx, col]            # (k, window)
+            pos = self._pos[idx, col]
+            count = self._count[idx, col]
+        # Rotate each ring so the oldest slot comes first: slot (pos + j) % window
+        order = (pos[:, None] + np.arange(self.window)[None, :]) % self.window
+        ordered = np.take_along_axis(ring, order, axis=1)
+        # A window that isn't full yet has its values in slots [0, count), i.e. already at the
+        # end of the rotated order with NaNs in front, which is the padding we want
+        out[known] = ordered
+        out[known[count == 0]] = np.nan
+        return out
+
+    def features(self, player: str, stat: str) -> Optional[Dict[str, Any]]:
+        """Single-player view of `bulk_features`, or None if the player has no games for `stat`."""
+        feats = self.bulk_features([player], stat)
+        if not feats['last_n_games'][0]:
+            return None
+        return {k: (v[0].item() if hasattr(v[0], 'item') else v[0]) for k, v in feats.items()}
+
+    # --- Loading ---
+
+    @classmethod
+    def from_files(cls, path: str, stats: Optional[Sequence[str]] = None,
+                   window: int = DEFAULT_WINDOW) -> 'PlayerStatStore':
+        frame = read_game_logs(path)
+        if stats is None:
+            reserved = {'player', 'season', 'game_date', 'team', 'opponent', 'week'}
+            stats = [c for c in frame.columns if c not in reserved] or list(DEFAULT_STATS)
+        store = cls(stats=stats, window=window)
+        applied = store.add_games(frame)
+        print(f"[feature_store] Loaded {applied} games for {len(store)} players from {path}.")
+        return store
+
+
+def read_game_logs(path: str) -> pd.DataFrame:
+    """Read one CSV/Parquet game log, or every such file in a directory."""
+    if os.path.isdir(path):
+        paths = sorted(glob.glob(os.path.join(path, '*.csv')) + glob.glob(os.path.join(path, '*.parquet')))
+    else:
+        paths = [path]
+    frames = [pd.read_parquet(p) if p.endswith('.parquet') else pd.read_csv(p) for p in paths]
+    if not frames:
+        return pd.DataFrame(columns=['player', 'season', 'game_date'])
+    return pd.concat(frames, ignore_index=True)
+
+
+_default_store: Optional[PlayerStatStore] = None
+_default_path: Optional[str] = None
+_default_lock = threading.Lock()
+
+
+def get_default_store() -> Optional[PlayerStatStore]:
+    """The store loaded from PLAYER_GAME_LOGS (once per path), or None when unset/unreadable."""
+    global _default_store, _default_path
+    path = os.environ.get('PLAYER_GAME_LOGS')
+    if not path:
+        return None
+    with _default_lock:
+        if _default_path != path:
+            try:
+                _default_store = PlayerStatStore.from_files(path)
+            except Exception as e:
+                print(f"[feature_store] Could not load game logs from {path}: {e}")
+                _default_store = None
+            _default_path = path
+        return _default_store
@@ -0,0 +1,100 @@
+"""Memoized loader for recorded DraftKings payloads (sample data and test fixtures).
+
+Offline and demo deployments fall back to `tests/samples/dk_sample.json` on every
+dashboard rerun. Decoding the JSON and running `parse_dk_json_payload` each time is
+wasted work: the file almost never changes. This module parses each file once and
+keeps the props per (file, league, prop_type); a later call only stats the file and
+reparses when its mtime or size changed.
+"""
+
+import glob
+import json
+import os
+import threading
+from typing import Any, Dict, List, Tuple
+
+from cfb_prop_predictor.types import PropRecord
+from Utilis.dk_scraper import parse_dk_json_payload
+
+# (mtime_ns, size) identifies one version of a file
+_Stamp = Tuple[int, int]
+
+_lock = threading.Lock()
+_payloads: Dict[str, Tuple[_Stamp, Any]] = {}
+_props: Dict[Tuple[str, str, str], Tuple[_Stamp, List[PropRecord]]] = {}
+_dir_listings: Dict[str, Tuple[int, List[str]]] = {}
+
+
+def _stamp(path: str) -> _Stamp:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _load_payload(path: str, stamp: _Stamp) -> Any:
+    with _lock:
+        cached = _payloads.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with open(path, 'rb') as f:
+        payload = json.loads(f.read())
+    with _lock:
+        _payloads[path] = (stamp, payload)
+    return payload
+
+
+def load_fixture_props(path: str, league: str, prop_type: str) -> List[PropRecord]:
+    """Parsed props for one payload file, reparsed only when the file changes on disk.
+
+    Raises OSError / ValueError like a plain open + json.load would. The returned list is
+    a fresh copy; the PropRecords inside are shared (they are read-only).
+    """
+    path = os.path.abspath(path)
+    stamp = _stamp(path)
+    key = (path, league, prop_type)
+    with _lock:
+        cached = _props.get(key)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+
+    payload = _load_payload(path, stamp)
+    props = parse_dk_json_payload(payload, league, prop_type)
+    print(f"[fixtures] Parsed {len(props)} props from {os.path.basename(path)} ({league} / {prop_type}).")
+    with _lock:
+        _props[key] = (stamp, props)
+    return list(props)
+
+
+def _list_payload_files(directory: str) -> List[str]:
+    """Sorted *.json files under `directory`, re-listed only when the directory changes."""
+    dir_mtime = os.stat(directory).st_mtime_ns
+    with _lock:
+        cached = _dir_listings.get(directory)
+    if cached is not None and cached[0] == dir_mtime:
+        return cached[1]
+    paths = sorted(glob.glob(os.path.join(directory, '*.json')))
+    with _lock:
+        _dir_listings[directory] = (dir_mtime, paths)
+    return paths
+
+
+def load_fixture_dir(directory: str, league: str, prop_type: str) -> List[PropRecord]:
+    """Props from every *.json payload in `directory`, in filename order.
+
+    Each file is cached on its own, so editing one fixture reparses only that file.
+    Unreadable files are skipped with a warning.
+    """
+    directory = os.path.abspath(directory)
+    props: List[PropRecord] = []
+    for path in _list_payload_files(directory):
+        try:
+            props.extend(load_fixture_props(path, league, prop_type))
+        except (OSError, ValueError) as e:
+            print(f"[fixtures] WARNING: skipped {path}: {e}")
+    return props
+
+
+def clear_fixture_cache() -> None:
+    with _lock:
+        _payloads.clear()
+        _props.clear()
+        _dir_listings.clear()
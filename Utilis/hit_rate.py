@@ -0,0 +1,135 @@
+"""How often each player cleared their prop line over their last N games.
+
+Props are grouped by market (one stat per market), and each group is scored in a
+single NumPy pass: the players' last-N values come out of the `PlayerStatStore` as one
+(players, N) array and are compared against the line column at once. Results are
+cached per (player, stat, line, N) and dropped whenever the store takes a new game,
+so re-rendering a slate only scores the props that weren't seen before.
+
+HIT_RATE_GAMES sets N (default 5, capped at the store's window).
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Utilis.feature_store import PlayerStatStore
+from Utilis.names import canonical_key, normalize_name
+
+HIT_RATE_GAMES = int(os.environ.get('HIT_RATE_GAMES', '5'))
+
+
+_MARKET_PREFIXES = ('player',)
+_MARKET_SUFFIXES = ('ou', 'over under', 'overunder')
+
+
+def stat_for_market(market: Optional[str], stats: Iterable[str]) -> Optional[str]:
+    """Store stat behind a market label: "Player Receiving Yards" / "Receiving Yards O/U" /
+    "player_receiving_yards" -> 'receiving_yards'. None unless the label, less a known
+    prefix or suffix, names a stat in `stats` exactly: combo ("Rushing + Receiving Yards"),
+    partial-game ("1st Half Passing Yards") and alt/milestone markets settle on other
+    numbers than the full-game stat, so they get no hit rate rather than a wrong one."""
+    label = normalize_name((market or '').replace('_', ' '))
+    for prefix in _MARKET_PREFIXES:
+        if label.startswith(prefix + ' '):
+            label = label[len(prefix) + 1:]
+    for suffix in _MARKET_SUFFIXES:
+        if label.endswith(' ' + suffix):
+            label = label[:-len(suffix) - 1]
+    key = '_'.join(label.split())
+    return key if key and key in tuple(stats) else None
+
+
+def format_hit_rate(hits: int, games: int) -> str:
+    return f"{round(100 * hits / games)}% ({hits}/{games})" if games else 'N/A'
+
+
+class HitRateCache:
+    """Vectorized hit rates over a `PlayerStatStore`, memoized per (player, stat, line, N)."""
+
+    def __init__(self, store: PlayerStatStore, games: int = HIT_RATE_GAMES):
+        self.store = store
+        self.games = max(1, min(games, store.window))
+        self._cache: Dict[Tuple[str, str, float, int], Tuple[int, int]] = {}
+        self._version = store.version
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def rates(self, players: Sequence[str], lines: Sequence[float], stat: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(hits, games) arrays aligned with `players`: games is how many of the last N had
+        the stat recorded, hits how many of those went over the line. NaN lines score 0/0."""
+        lines = np.asarray(lines, dtype=float)
+        hits = np.zeros(len(players), dtype=np.int64)
+        games = np.zeros(len(players), dtype=np.int64)
+        with self._lock:
+            if self._version != self.store.version:
+                self._cache.clear()
+                self._version = self.store.version
+            keys = [(canonical_key(p or ''), stat, float(line), self.games) for p, line in zip(players, lines)]
+            missing = []
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    hits[i], games[i] = cached
+        if not missing:
+            return hits, games
+
+        idx = np.asarray(missing)
+        values = self.store.last_n_values([players[i] for i in missing], stat)[:, -self.games:]
+        recorded = ~np.isnan(values)
+        with np.errstate(invalid='ignore'):
+            over = values > lines[idx, None]   # NaN compares False on both sides
+        miss_games = np.where(np.isnan(lines[idx]), 0, recorded.sum(axis=1))
+        miss_hits = np.where(miss_games > 0, over.sum(axis=1), 0)
+        hits[idx] = miss_hits
+        games[idx] = miss_games
+        with self._lock:
+            for i, h, g in zip(missing, miss_hits.tolist(), miss_games.tolist()):
+                self._cache[keys[i]] = (h, g)
+        return hits, games
+
+    def counts(self, players: Sequence[str], markets: Sequence[Optional[str]],
+               lines: Sequence[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """(hits, games) for a whole slate, one vectorized pass per market."""
+        frame = pd.DataFrame({
+            'player': pd.Series(players, dtype=object),
+            'market': pd.Series(markets, dtype=object).fillna(''),
+            'line': pd.to_numeric(pd.Series(lines, dtype=object), errors='coerce').astype(float),
+        })
+        hits = np.zeros(len(frame), dtype=np.int64)
+        games = np.zeros(len(frame), dtype=np.int64)
+        for market, group in frame.groupby('market', sort=False).indices.items():
+            stat = stat_for_market(market, self.store.stats)
+            if stat is None:
+                continue
+            hits[group], games[group] = self.rates(frame['player'].take(group).tolist(),
+                                                   frame['line'].to_numpy()[group], stat)
+        return hits, games
+
+    def column(self, players: Sequence[str], markets: Sequence[Optional[str]], lines: Sequence[float]) -> pd.Series:
+        """Formatted hit-rate labels for a whole slate."""
+        hits, games = self.counts(players, markets, lines)
+        return pd.Series([format_hit_rate(h, g) for h, g in zip(hits.tolist(), games.tolist())], dtype=object)
+
+
+_default_cache: Optional[HitRateCache] = None
+
+
+def get_default_cache() -> Optional[HitRateCache]:
+    """A `HitRateCache` over `feature_store.get_default_store()`, or None without game logs."""
+    global _default_cache
+    from Utilis.feature_store import get_default_store
+
+    store = get_default_store()
+    if store is None:
+        return None
+    if _default_cache is None or _default_cache.store is not store:
+        _default_cache = HitRateCache(store)
+    return _default_cache
@@ -1,48 +1,124 @@
 import os
 import json
-from typing import Any, Dict, List, Optional
+import hashlib
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 import re
 
 from cfb_prop_predictor.types import OddsData
+from Utilis.names import normalize_name
+
+
+try:
+    import numpy as np
+except ImportError:  # optional: only used to bulk-parse large string sets
+    np = None
+
+_NUMBER_RE = re.compile(r"-?\d+\.?\d*")
+# First number in each \x00-separated segment, i.e. `_NUMBER_RE.search` applied to every
+# string at once in a single C-level scan of the joined buffer.
+_BULK_NUMBER_RE = re.compile(r"(?:^|\x00)[^\x00]*?(-?\d+\.?\d*)")
+_BULK_MIN_STRINGS = 256
 
 
 def _collect_numbers_from_obj(obj: Any, prop_identifier: str) -> List[float]:
     """Recursively walk obj (dict/list/str) and collect numbers associated with prop_identifier."""
     found: List[float] = []
+    short = prop_identifier[:3]
 
     def walk(o: Any):
         if isinstance(o, dict):
             for k, v in o.items():
-                lk = str(k).lower()
-                if prop_identifier in lk or any(tok in lk for tok in [prop_identifier[:3]]):
-                    # if v is numeric or contains numeric string -> collect
-                    if isinstance(v, (int, float)):
+                # Key relevance only matters for int/float values: strings are searched for a
+                # number whether or not their key is relevant, and numbers elsewhere are ignored.
+                # (`prop_identifier in lk` implies `short in lk`, so only `short` is checked.)
+                if isinstance(v, (int, float)):
+                    if short in str(k).lower():
                         found.append(float(v))
-                        continue
-                    if isinstance(v, str):
-                        m = re.search(r"-?\d+\.?\d*", v)
-                        if m:
-                            try:
-                                found.append(float(m.group(0)))
-                                continue
-                            except Exception:
-                                pass
+                    continue
                 walk(v)
         elif isinstance(o, list):
             for it in o:
                 walk(it)
         elif isinstance(o, str):
-            m = re.search(r"-?\d+\.?\d*", o)
+            m = _NUMBER_RE.search(o)
             if m:
-                try:
-                    found.append(float(m.group(0)))
-                except Exception:
-                    pass
+                found.append(float(m.group(0)))
 
     walk(obj)
     return found
 
 
+def _gather_leaves(obj: Any, short: str) -> Tuple[List[float], List[str]]:
+    """Iterative walk: numbers under relevant keys, plus every string leaf (unparsed)."""
+    numbers: List[float] = []
+    strings: List[str] = []
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if isinstance(o, dict):
+            for k, v in o.items():
+                if isinstance(v, str):
+                    strings.append(v)
+                elif isinstance(v, (int, float)):
+                    if short in str(k).lower():
+                        numbers.append(float(v))
+                elif isinstance(v, (dict, list)):
+                    stack.append(v)
+        elif isinstance(o, list):
+            for it in o:
+                if isinstance(it, str):
+                    strings.append(it)
+                elif isinstance(it, (dict, list)):
+                    stack.append(it)
+        elif isinstance(o, str):
+            strings.append(o)
+    return numbers, strings
+
+
+def _parse_string_numbers(strings: List[str]) -> List[float]:
+    """First number in each string, in bulk when the set is large."""
+    if len(strings) >= _BULK_MIN_STRINGS:
+        joined = "\x00".join(strings)
+        # a string containing \x00 itself would shift segment boundaries
+        if joined.count("\x00") == len(strings) - 1:
+            tokens = _BULK_NUMBER_RE.findall(joined)
+            if np is not None:
+                return np.array(tokens, dtype=np.float64).tolist()
+            return [float(t) for t in tokens]
+    out: List[float] = []
+    for text in strings:
+        m = _NUMBER_RE.search(text)
+        if m:
+            out.append(float(m.group(0)))
+    return out
+
+
+def _select_line(numbers: Iterable[float]) -> Optional[float]:
+    """Smallest non-negative number, else smallest overall; single streaming pass."""
+    best_pos = None
+    best_any = None
+    for n in numbers:
+        if best_any is None or n < best_any:
+            best_any = n
+        if n >= 0 and (best_pos is None or n < best_pos):
+            best_pos = n
+    return best_pos if best_pos is not None else best_any
+
+
+def _harvest_line(obj: Any, prop_identifier: str) -> Optional[float]:
+    """What the stub picks from `_collect_numbers_from_obj(obj, prop_identifier)`, without building
+    or sorting that list: relevant numbers and string leaves are gathered in one walk, strings are
+    parsed (in bulk when there are many), and the minimum is selected as they stream by.
+    """
+    numbers, strings = _gather_leaves(obj, prop_identifier[:3])
+    parsed = _parse_string_numbers(strings)
+    return _select_line(itertools.chain(numbers, parsed))
+
+
 def extract_with_llm_stub(candidates: Any, player_name: str, prop_type: str) -> Optional[OddsData]:
     """A lightweight 'LLM' extractor fallback that scans candidate JSON/html structures for numbers.
 
@@ -68,41 +144,354 @@ def extract_with_llm_stub(candidates: Any, player_name: str, prop_type: str) ->
     else:
         obj = candidates
 
-    # Heuristic scanning
-    nums = _collect_numbers_from_obj(obj, prop_identifier)
-    if nums:
-        # prefer smallest positive reasonable number (like 3.5 for receptions)
-        nums_pos = [n for n in nums if n >= 0]
-        if nums_pos:
-            val = sorted(nums_pos)[0]
-        else:
-            val = sorted(nums)[0]
+    # Heuristic scanning: prefer smallest positive reasonable number (like 3.5 for receptions)
+    val = _harvest_line(obj, prop_identifier)
+    if val is not None:
         return OddsData(prop_line=val, over_odds=None, under_odds=None)
 
     return None
 
 
-def extract_props(candidates: Any, player_name: str, prop_type: str) -> Optional[OddsData]:
-    """Top-level extractor: prefer calling a real LLM if OPENAI_API_KEY is present, else use stub.
+# Controlled debug printing (same switch as the scrapers)
+def _debug_print(*args, **kwargs):
+    if os.environ.get('SCRAPER_DEBUG', '0') in ('1', 'true', 'True'):
+        print(*args, **kwargs)
+
+
+# --- Payload pruning ---
+# Full event-group payloads are mostly other players and unrelated markets. Before handing a
+# payload to the LLM or the stub, cut it down to the subtrees around the target player(s) and
+# the keys that can carry the prop line or its odds.
+
+_NAME_KEYS = ('name', 'playername', 'participant', 'participantname')
+_IDENTITY_KEYS = frozenset(_NAME_KEYS + ('position', 'team', 'teamname', 'teamabbreviation',
+                                         'opponent', 'opponentname', 'opponentabbreviation',
+                                         'startdate', 'starttimeiso', 'label'))
+_LINE_TOKENS = ('line', 'odds', 'over', 'under', 'price', 'points')
+_TEXT_WINDOW = 400
+
+
+def _norm_name(name: str) -> str:
+    return normalize_name(name)
+
+
+def _prop_tokens(prop_types: Iterable[str]) -> Tuple[str, ...]:
+    from Utilis.provider_parser import DEFAULT_SPORTSBOOK_PRIORITY
+
+    tokens = set(_LINE_TOKENS) | set(DEFAULT_SPORTSBOOK_PRIORITY)
+    for prop_type in prop_types:
+        ident = (prop_type.split('_')[1] if '_' in prop_type else prop_type).lower()
+        tokens.update((ident, ident[:3]))
+    return tuple(tokens)
+
+
+def _is_relevant_key(key: Any, tokens: Tuple[str, ...]) -> bool:
+    lk = str(key).lower()
+    return lk in _IDENTITY_KEYS or any(tok in lk for tok in tokens)
+
+
+def _prune_node(o: Any, tokens: Tuple[str, ...]) -> Any:
+    """Keep relevant keys (whole subtree) and any container that still holds one; drop the rest."""
+    if isinstance(o, dict):
+        out = {}
+        for k, v in o.items():
+            if _is_relevant_key(k, tokens):
+                out[k] = v
+            elif isinstance(v, (dict, list)):
+                sub = _prune_node(v, tokens)
+                if sub:
+                    out[k] = sub
+        return out
+    if isinstance(o, list):
+        return [sub for sub in (_prune_node(it, tokens) for it in o) if sub]
+    return None
+
+
+def _count_nodes(o: Any) -> int:
+    if isinstance(o, dict):
+        return 1 + sum(_count_nodes(v) for v in o.values())
+    if isinstance(o, list):
+        return 1 + sum(_count_nodes(v) for v in o)
+    return 1
+
+
+def _prune_text(text: str, names: List[str]) -> Optional[str]:
+    """Windows of raw text around each name occurrence, merged; None if no name occurs."""
+    spans = []
+    lowered = text.lower()
+    for name in names:
+        for m in re.finditer(re.escape(name), lowered):
+            spans.append((max(0, m.start() - _TEXT_WINDOW), min(len(text), m.end() + _TEXT_WINDOW)))
+    if not spans:
+        return None
+    spans.sort()
+    merged = [list(spans[0])]
+    for start, end in spans[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return "\n...\n".join(text[a:b] for a, b in merged)
+
+
+def prune_payload(candidates: Any, players: Iterable[str], prop_types: Iterable[str]) -> Tuple[Any, Dict[str, int]]:
+    """Narrow `candidates` to the parts relevant to `players` and `prop_types`.
+
+    Every dict holding one of the player names (under a name-like key) anchors a subtree;
+    if that dict has no line/odds/prop keys of its own, its parent is used instead, since
+    many feeds put `{"player": {"name": ...}}` next to the markets. Each anchor is pruned
+    down to identity keys plus keys matching the prop identifiers, line/odds words or a
+    sportsbook name. Raw (non-JSON) text is cut to windows around the name.
+
+    Returns (pruned, stats). When no player is found the payload is returned unchanged.
+    stats has `nodes_before`/`nodes_after` for objects, `chars_before`/`chars_after` for text,
+    and `anchors` (how many subtrees were kept).
     """
-    # If an OpenAI key is present and openai is installed, we could call it. For safety and to avoid
-    # depending on network/keys in CI, default to the stub unless env var FORCE_OPENAI=1 is set.
-    use_openai = os.environ.get('FORCE_OPENAI', '0') in ('1', 'true', 'True') and os.environ.get('OPENAI_API_KEY')
-    if use_openai:
+    names = [_norm_name(p) for p in players if p and _norm_name(p)]
+    if isinstance(candidates, str):
         try:
-            import openai
-            # Build a simple prompt - but keep this optional for now
-            payload = json.dumps(candidates) if not isinstance(candidates, str) else candidates
-            prompt = f"Extract a JSON object with keys prop_line, over_odds, under_odds for player {player_name} and prop {prop_type}.\nData:\n{payload}\n"
-            resp = openai.ChatCompletion.create(model="gpt-4o-mini", messages=[{"role":"user","content":prompt}], max_tokens=200)
-            text = resp['choices'][0]['message']['content']
-            # try to parse JSON from response
-            m = re.search(r"\{[\s\S]*\}", text)
-            if m:
-                out = json.loads(m.group(0))
-                return OddsData(prop_line=out.get('prop_line'), over_odds=out.get('over_odds'), under_odds=out.get('under_odds'))
+            candidates = json.loads(candidates)
+        except Exception:
+            pruned = _prune_text(candidates, names)
+            if pruned is None:
+                return candidates, {'chars_before': len(candidates), 'chars_after': len(candidates), 'anchors': 0}
+            return pruned, {'chars_before': len(candidates), 'chars_after': len(pruned), 'anchors': 1}
+
+    tokens = _prop_tokens(list(prop_types))
+    wanted = set(names)
+    anchors: Dict[int, Any] = {}
+    nodes = 0
+
+    def walk(o: Any, parent: Any):
+        nonlocal nodes
+        nodes += 1
+        if isinstance(o, dict):
+            for k, v in o.items():
+                if isinstance(v, str) and str(k).lower() in _NAME_KEYS and _norm_name(v) in wanted:
+                    own = any(_is_relevant_key(kk, tokens) and str(kk).lower() not in _IDENTITY_KEYS for kk in o)
+                    target = o if own or not isinstance(parent, dict) else parent
+                    anchors.setdefault(id(target), target)
+                    break
+            for v in o.values():
+                walk(v, o)
+        elif isinstance(o, list):
+            for it in o:
+                walk(it, o)
+        else:
+            return
+
+    walk(candidates, None)
+    if not anchors:
+        return candidates, {'nodes_before': nodes, 'nodes_after': nodes, 'anchors': 0}
+
+    kept = [_prune_node(a, tokens) for a in anchors.values()]
+    pruned = kept[0] if len(kept) == 1 else kept
+    return pruned, {'nodes_before': nodes, 'nodes_after': _count_nodes(pruned), 'anchors': len(kept)}
+
+
+LLM_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
+LLM_BASE_URL = os.environ.get('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+LLM_TIMEOUT = 60
+
+
+def _use_openai() -> bool:
+    return bool(os.environ.get('FORCE_OPENAI', '0') in ('1', 'true', 'True') and os.environ.get('OPENAI_API_KEY'))
+
+
+def _chat_completion(prompt: str, max_tokens: int = 200) -> str:
+    """POST one prompt to an OpenAI-compatible /chat/completions endpoint and return the reply text.
+
+    `OPENAI_BASE_URL` can point this at a proxy or a local fake server.
+    """
+    import requests
+
+    resp = requests.post(
+        f"{os.environ.get('OPENAI_BASE_URL', LLM_BASE_URL).rstrip('/')}/chat/completions",
+        headers={'Authorization': f"Bearer {os.environ.get('OPENAI_API_KEY', '')}"},
+        json={
+            'model': os.environ.get('OPENAI_MODEL', LLM_MODEL),
+            'messages': [{'role': 'user', 'content': prompt}],
+            'max_tokens': max_tokens,
+        },
+        timeout=LLM_TIMEOUT,
+    )
+    resp.raise_for_status()
+    return resp.json()['choices'][0]['message']['content']
+
+
+def payload_digest(candidates: Any) -> str:
+    """Content address for a candidate payload: sha256 of its canonical JSON (or raw string)."""
+    if isinstance(candidates, str):
+        blob = candidates
+    else:
+        blob = json.dumps(candidates, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(blob.encode('utf-8')).hexdigest()
+
+
+def build_batch_prompt(payload: str, items: Sequence[Tuple[str, str]]) -> str:
+    """One prompt asking for every (player, prop_type) in `items` against a single payload."""
+    requests_json = json.dumps([
+        {'id': i, 'player': player, 'prop_type': prop_type} for i, (player, prop_type) in enumerate(items)
+    ])
+    return (
+        "For each request below, extract the prop line and odds for that player and prop from the data.\n"
+        "Answer with a JSON array of objects with keys id, prop_line, over_odds, under_odds "
+        "(use null when a value is missing).\n"
+        f"Requests:\n{requests_json}\n"
+        f"Data:\n{payload}\n"
+    )
+
+
+def _parse_batch_reply(text: str) -> Dict[int, OddsData]:
+    m = re.search(r"\[[\s\S]*\]", text)
+    if not m:
+        return {}
+    out: Dict[int, OddsData] = {}
+    for entry in json.loads(m.group(0)):
+        if not isinstance(entry, dict) or entry.get('prop_line') is None:
+            continue
+        try:
+            out[int(entry['id'])] = OddsData(
+                prop_line=entry['prop_line'],
+                over_odds=entry.get('over_odds'),
+                under_odds=entry.get('under_odds'),
+            )
         except Exception:
-            pass
+            continue
+    return out
+
+
+class BatchExtractor:
+    """Batches (player, prop) lookups into as few LLM calls as possible.
+
+    - Lookups are grouped by a content hash of their candidate payload, and each group is
+      sent as one prompt (split every `max_batch` items) with the payload included once.
+    - Answers are cached under (payload hash, player, prop_type), so repeat lookups never
+      reach the LLM; misses the LLM could not answer fall back to `extract_with_llm_stub`
+      and are cached too.
+    - At most `max_concurrency` prompts are outstanding at a time, across every caller
+      sharing the instance.
+
+    `complete` is any callable taking a prompt and returning the reply text.
+    """
+
+    def __init__(self, complete: Optional[Callable[[str], str]] = None, max_batch: int = 20,
+                 max_concurrency: int = 4, cache_size: int = 4096):
+        self.complete = complete or (lambda prompt: _chat_completion(prompt, max_tokens=200 + 60 * max_batch))
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+        self.cache_size = cache_size
+        self.llm_calls = 0
+        self._cache: "OrderedDict[Tuple[str, str, str], Optional[OddsData]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _cache_get(self, key):
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return True, self._cache[key]
+        return False, None
+
+    def _cache_put(self, key, value):
+        with self._lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _run_batch(self, payload: str, items: List[Tuple[str, str]]) -> Dict[int, OddsData]:
+        with self._lock:
+            self.llm_calls += 1
+        try:
+            with self._slots:
+                reply = self.complete(build_batch_prompt(payload, items))
+            return _parse_batch_reply(reply)
+        except Exception as e:
+            print(f"[llm_extractor] Batch of {len(items)} failed, using stub: {e}")
+            return {}
+
+    def extract_many(self, lookups: Sequence[Tuple[Any, str, str]]) -> List[Optional[OddsData]]:
+        """Resolve (candidates, player_name, prop_type) lookups; results keep the input order."""
+        results: List[Optional[OddsData]] = [None] * len(lookups)
+        # digest -> (candidates, {(player, prop_type): [result indexes]})
+        pending: Dict[str, Tuple[Any, Dict[Tuple[str, str], List[int]]]] = {}
+        # lookups on one slate usually share a candidates object; hash it once. `lookups`
+        # keeps every object alive for the call, so ids can't be reused in between
+        digests: Dict[int, str] = {}
+
+        for idx, (candidates, player, prop_type) in enumerate(lookups):
+            digest = digests.get(id(candidates))
+            if digest is None:
+                digest = digests[id(candidates)] = payload_digest(candidates)
+            hit, value = self._cache_get((digest, player, prop_type))
+            if hit:
+                results[idx] = value
+                continue
+            group = pending.setdefault(digest, (candidates, {}))
+            group[1].setdefault((player, prop_type), []).append(idx)
+
+        jobs = []
+        for digest, (candidates, wanted) in pending.items():
+            items = list(wanted)
+            pruned, stats = prune_payload(candidates, {p for p, _ in items}, {t for _, t in items})
+            payload = pruned if isinstance(pruned, str) else json.dumps(pruned)
+            _debug_print(f"[llm_extractor] Pruned payload {digest[:12]} for {len(items)} lookups: {stats}")
+            for start in range(0, len(items), self.max_batch):
+                jobs.append((digest, candidates, payload, items[start:start + self.max_batch]))
+
+        if jobs:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                answers = list(pool.map(lambda job: self._run_batch(job[2], job[3]), jobs))
+            for (digest, candidates, _, items), answer in zip(jobs, answers):
+                wanted = pending[digest][1]
+                for i, (player, prop_type) in enumerate(items):
+                    value = answer.get(i) or _extract_pruned_with_stub(candidates, player, prop_type)
+                    self._cache_put((digest, player, prop_type), value)
+                    for idx in wanted[(player, prop_type)]:
+                        results[idx] = value
+        return results
+
+    def extract(self, candidates: Any, player_name: str, prop_type: str) -> Optional[OddsData]:
+        return self.extract_many([(candidates, player_name, prop_type)])[0]
+
+
+def _extract_pruned_with_stub(candidates: Any, player_name: str, prop_type: str) -> Optional[OddsData]:
+    pruned, stats = prune_payload(candidates, [player_name], [prop_type])
+    _debug_print(f"[llm_extractor] Pruned payload for {player_name} / {prop_type}: {stats}")
+    return extract_with_llm_stub(pruned, player_name, prop_type)
 
-    # Fallback deterministic stub
-    return extract_with_llm_stub(candidates, player_name, prop_type)
+
+_default_extractor: Optional[BatchExtractor] = None
+
+
+def _get_default_extractor() -> BatchExtractor:
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = BatchExtractor(
+            max_concurrency=int(os.environ.get('LLM_MAX_CONCURRENCY', '4')),
+        )
+    return _default_extractor
+
+
+def extract_props(candidates: Any, player_name: str, prop_type: str) -> Optional[OddsData]:
+    """Top-level extractor: prefer calling a real LLM if OPENAI_API_KEY is present, else use stub.
+    """
+    # If an OpenAI key is present we could call it. For safety and to avoid depending on
+    # network/keys in CI, default to the stub unless env var FORCE_OPENAI=1 is set.
+    if _use_openai():
+        return _get_default_extractor().extract(candidates, player_name, prop_type)
+
+    # Fallback deterministic stub, run on the player's part of the payload only
+    return _extract_pruned_with_stub(candidates, player_name, prop_type)
+
+
+def extract_props_batch(lookups: Sequence[Tuple[Any, str, str]]) -> List[Optional[OddsData]]:
+    """Batch form of `extract_props` for many (candidates, player_name, prop_type) lookups.
+
+    With FORCE_OPENAI set, lookups sharing a payload go out in one prompt and repeats are
+    served from cache; otherwise each is answered by the stub.
+    """
+    if _use_openai():
+        return _get_default_extractor().extract_many(lookups)
+    return [_extract_pruned_with_stub(c, p, t) for c, p, t in lookups]
@@ -0,0 +1,127 @@
+"""Event-loop lag measurement and a bounded executor for CPU-bound work off the loop.
+
+`LoopLagMonitor` runs a ticker task on the loop that sleeps `interval` seconds at a
+time and records how late each wake-up is. Anything that holds the loop (parsing a
+large response body inline, say) shows up directly as lag.
+
+`BoundedOffload` hands CPU-bound calls to a shared thread or process pool and caps how
+many are in flight, so a burst of responses waits in the coroutine that produced it
+instead of piling up unbounded work.
+
+Env: PARSE_EXECUTOR=thread|process (default thread), PARSE_WORKERS (default 2),
+PARSE_MAX_PENDING (default 8).
+"""
+
+import asyncio
+import contextlib
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+PARSE_EXECUTOR = os.environ.get('PARSE_EXECUTOR', 'thread').lower()
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', '2'))
+PARSE_MAX_PENDING = int(os.environ.get('PARSE_MAX_PENDING', '8'))
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag while active. Use as `async with LoopLagMonitor() as lag:`."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - start - self.interval))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._tick())
+
+    async def stop(self) -> Dict[str, float]:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        return self.stats()
+
+    async def __aenter__(self) -> 'LoopLagMonitor':
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+    def stats(self) -> Dict[str, float]:
+        """max / p95 / mean lag in milliseconds over the samples taken so far."""
+        if not self.samples:
+            return {'samples': 0, 'max_ms': 0.0, 'p95_ms': 0.0, 'mean_ms': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'samples': len(ordered),
+            'max_ms': round(ordered[-1] * 1000, 2),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 2),
+            'mean_ms': round(sum(ordered) / len(ordered) * 1000, 2),
+        }
+
+
+_executors: Dict[str, Executor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(kind: str = PARSE_EXECUTOR, workers: int = PARSE_WORKERS) -> Executor:
+    """Process-wide shared pool of the given kind ('thread' or 'process')."""
+    with _executors_lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            if kind == 'process':
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='parse')
+            _executors[kind] = executor
+        return executor
+
+
+class BoundedOffload:
+    """Run calls on an executor with at most `max_pending` in flight; `drain` waits for all.
+
+    Work that has to await something before it reaches `run` (a response body, say) is
+    registered with `async with offload.track():` so `drain` waits for it too.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, max_pending: int = PARSE_MAX_PENDING):
+        self.executor = executor
+        self._slots = asyncio.Semaphore(max_pending)
+        self._active = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @contextlib.asynccontextmanager
+    async def track(self) -> AsyncIterator[None]:
+        """Count the enclosed block as in flight until it exits."""
+        self._active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self._active -= 1
+            if not self._active:
+                self._idle.set()
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # Counted from entry, so `drain` also waits for callers still queued for a slot
+        async with self.track():
+            async with self._slots:
+                executor = self.executor or get_executor()
+                return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+    async def drain(self) -> None:
+        """Wait until every call made so far has finished."""
+        await self._idle.wait()
@@ -0,0 +1,190 @@
+"""Player-name normalization and matching shared by the scrapers.
+
+Sportsbooks and Rotowire spell the same player differently: "D.J. Moore" / "DJ Moore",
+"Marvin Harrison Jr." / "Marvin Harrison", "T. Kelce" / "Travis Kelce". Everything
+here works on one canonical key per name (lowercase ASCII, no punctuation, no
+generational suffix), computed once and cached.
+
+- `normalize_name` / `canonical_key`: cached string keys.
+- `name_matcher`: a precomputed predicate for scanning candidates against one target.
+- `NameIndex`: hash lookups for matching a whole roster against a slate; exact key,
+  then last name + a compatible first name, then a unique last name, then (optionally)
+  trigram similarity.
+
+First names are compatible when one is a bare initial or a prefix of the other ("T." /
+"Travis", "Josh" / "Joshua"); a shared initial alone is not enough, since "Travis
+Kelce" and "Tyler Kelce" are different players.
+"""
+
+import functools
+import re
+import unicodedata
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+_PUNCT_RE = re.compile(r"[^a-z0-9 ]+")
+SUFFIXES = frozenset({'jr', 'sr', 'ii', 'iii', 'iv', 'v'})
+
+
+@functools.lru_cache(maxsize=65536)
+def normalize_name(name: str) -> str:
+    """Lowercase ASCII with punctuation removed and whitespace collapsed ("D.J. Moore" -> "dj moore")."""
+    if not name:
+        return ''
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(_PUNCT_RE.sub('', ascii_name.lower()).split())
+
+
+@functools.lru_cache(maxsize=65536)
+def canonical_key(name: str) -> str:
+    """`normalize_name` without generational suffixes ("Marvin Harrison Jr." -> "marvin harrison")."""
+    tokens = normalize_name(name).split()
+    while len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return ' '.join(tokens)
+
+
+def _last_and_initial(key: str) -> Tuple[str, str]:
+    tokens = key.split()
+    if not tokens:
+        return '', ''
+    return tokens[-1], tokens[0][0] if len(tokens) > 1 else ''
+
+
+def _first_name(key: str) -> str:
+    tokens = key.split()
+    return tokens[0] if len(tokens) > 1 else ''
+
+
+def _first_names_compatible(a: str, b: str) -> bool:
+    """True when either is missing, or one is a prefix of the other (initials included)."""
+    return not a or not b or a.startswith(b) or b.startswith(a)
+
+
+def name_matcher(target: str) -> Callable[[str], bool]:
+    """Predicate for "is this candidate the target player?", with the target normalized once.
+
+    Matches the same key, any candidate carrying the target's last name whose first name
+    (if it has one) is compatible with the target's, or a candidate containing the whole
+    target name.
+    """
+    target_norm = normalize_name(target)
+    target_key = canonical_key(target)
+    target_last = _last_and_initial(target_key)[0]
+    target_first = _first_name(target_key)
+
+    def matches(candidate: str) -> bool:
+        key = canonical_key(candidate)
+        if not key or not target_key:
+            return False
+        if key == target_key:
+            return True
+        tokens = key.split()
+        if target_last in tokens:
+            # "Kelce" and "Kelce, Travis" carry no conflicting first name
+            first = tokens[0] if tokens[0] != target_last else ''
+            return _first_names_compatible(first, target_first)
+        return target_norm in normalize_name(candidate)
+
+    return matches
+
+
+@functools.lru_cache(maxsize=65536)
+def _trigrams(key: str) -> FrozenSet[str]:
+    padded = f"  {key} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class NameIndex:
+    """Index of player names for fast fuzzy lookups.
+
+    `add(name, value)` stores a value under the name's canonical key (a later add with the
+    same key replaces it). `match(name)` returns (indexed name, value, score) or None;
+    score is 1.0 for a key match, 0.9 for last name + first initial where one side gives
+    only the initial ("T. Kelce"), 0.85 for last name + prefix-compatible first names
+    ("Josh" / "Joshua"), 0.8 for a bare last name shared by no other indexed player, and
+    the trigram Jaccard similarity otherwise (below `trigram_threshold` is no match; None
+    disables it).
+    """
+
+    def __init__(self, names: Iterable[str] = (), trigram_threshold: Optional[float] = 0.5):
+        self.trigram_threshold = trigram_threshold
+        self._by_key: Dict[str, Tuple[str, Any]] = {}
+        self._by_last_initial: Dict[Tuple[str, str], Set[str]] = {}
+        self._by_last: Dict[str, Set[str]] = {}
+        self._by_trigram: Optional[Dict[str, Set[str]]] = None  # built on first fuzzy lookup
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, name: str) -> bool:
+        return canonical_key(name) in self._by_key
+
+    def add(self, name: str, value: Any = None) -> None:
+        key = canonical_key(name)
+        if not key:
+            return
+        self._by_key[key] = (name, value)
+        last, initial = _last_and_initial(key)
+        self._by_last_initial.setdefault((last, initial), set()).add(key)
+        self._by_last.setdefault(last, set()).add(key)
+        if self._by_trigram is not None:
+            for gram in _trigrams(key):
+                self._by_trigram.setdefault(gram, set()).add(key)
+
+    def _trigram_index(self) -> Dict[str, Set[str]]:
+        if self._by_trigram is None:
+            self._by_trigram = {}
+            for key in self._by_key:
+                for gram in _trigrams(key):
+                    self._by_trigram.setdefault(gram, set()).add(key)
+        return self._by_trigram
+
+    def _hit(self, key: str, score: float) -> Tuple[str, Any, float]:
+        name, value = self._by_key[key]
+        return name, value, score
+
+    def match(self, name: str) -> Optional[Tuple[str, Any, float]]:
+        key = canonical_key(name)
+        if not key:
+            return None
+        if key in self._by_key:
+            return self._hit(key, 1.0)
+
+        last, initial = _last_and_initial(key)
+        same = self._by_last_initial.get((last, initial))
+        if same:
+            first = _first_name(key)
+            compatible = [k for k in same if _first_names_compatible(_first_name(k), first)]
+            if len(compatible) == 1:
+                hit = compatible[0]
+                initial_only = len(first) == 1 or len(_first_name(hit)) == 1
+                return self._hit(hit, 0.9 if initial_only else 0.85)
+        if not same and not initial:
+            # a bare last name ("Kelce") only matches when exactly one player has it
+            same_last = self._by_last.get(last)
+            if same_last and len(same_last) == 1:
+                return self._hit(next(iter(same_last)), 0.8)
+
+        if self.trigram_threshold is None:
+            return None
+        grams = _trigrams(key)
+        index = self._trigram_index()
+        shared = Counter(k for gram in grams for k in index.get(gram, ()))
+        best_key, best_score = None, 0.0
+        for cand, common in shared.items():
+            score = common / (len(grams) + len(_trigrams(cand)) - common)
+            if score > best_score:
+                best_key, best_score = cand, score
+        if best_key is not None and best_score >= self.trigram_threshold:
+            return self._hit(best_key, best_score)
+        return None
+
+    def get(self, name: str, default: Any = None) -> Any:
+        hit = self.match(name)
+        return hit[1] if hit else default
+
+    def match_all(self, names: Iterable[str]) -> List[Optional[Tuple[str, Any, float]]]:
+        return [self.match(name) for name in names]
@@ -0,0 +1,105 @@
+"""American-odds arithmetic on whole arrays.
+
+Sportsbooks hand odds back as ints or as strings ("+150", "-110", "−110" with a Unicode
+minus, "EVEN"). `american_array` parses a column of them into a float array (NaN where
+missing or unreadable), and the rest of the module works on those arrays: implied and
+no-vig probabilities, expected value, and the best line/price across books for every
+prop of a slate in one pass.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_MINUS_SIGNS = str.maketrans({'−': '-', '–': '-'})
+
+
+def parse_american(value: Any) -> Optional[int]:
+    """One American price as an int, or None ("+150" -> 150, "−110" -> -110, "EVEN" -> 100)."""
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, np.integer, float, np.floating)):
+        if not np.isfinite(value):
+            return None
+        odds = int(value)
+    else:
+        text = str(value).strip().translate(_MINUS_SIGNS).upper()
+        if text in ('EVEN', 'EV'):
+            return 100
+        try:
+            odds = int(float(text))
+        except ValueError:
+            return None
+    # |odds| < 100 isn't a valid American price
+    return odds if abs(odds) >= 100 else None
+
+
+def american_array(values: Iterable[Any]) -> np.ndarray:
+    """Parse a column of American odds to float64, NaN where missing or unreadable."""
+    if isinstance(values, np.ndarray) and values.dtype.kind in 'fi':
+        odds = values.astype(float)
+        odds[np.abs(odds) < 100] = np.nan
+        return odds
+    # A column holds few distinct prices; parse each once
+    codes, uniques = pd.factorize(pd.Series(list(values), dtype=object))
+    parsed = [parse_american(v) for v in uniques]
+    lookup = np.array([np.nan if v is None else v for v in parsed] + [np.nan], dtype=float)
+    return lookup[codes]
+
+
+def profit_per_unit(odds: np.ndarray) -> np.ndarray:
+    """Profit on a winning 1-unit stake: +150 -> 1.5, -150 -> 0.667 (NaN stays NaN)."""
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(odds > 0, odds / 100.0, 100.0 / -odds)
+
+
+def implied_probability(odds: np.ndarray) -> np.ndarray:
+    """Break-even win probability of each price, vig included: -110 -> 0.524, +150 -> 0.4."""
+    odds = np.asarray(odds, dtype=float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(odds > 0, 100.0 / (odds + 100.0), -odds / (100.0 - odds))
+
+
+def remove_vig(over_odds: np.ndarray, under_odds: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """No-vig (fair) over/under probabilities of paired markets, proportional method.
+
+    Returns (fair_over, fair_under, overround) where overround is the book's margin
+    (0.048 for -110/-110). Pairs with a missing side come back NaN.
+    """
+    p_over = implied_probability(over_odds)
+    p_under = implied_probability(under_odds)
+    total = p_over + p_under
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return p_over / total, p_under / total, total - 1.0
+
+
+def expected_value(win_probability: np.ndarray, odds: np.ndarray) -> np.ndarray:
+    """Expected profit per unit staked at `odds` when the bet wins with `win_probability`."""
+    p = np.asarray(win_probability, dtype=float)
+    return p * profit_per_unit(odds) - (1.0 - p)
+
+
+def best_lines(lines: np.ndarray, over_odds: np.ndarray, under_odds: np.ndarray) -> Dict[str, np.ndarray]:
+    """Best book per prop from (props, books) arrays, NaN where a book has no market.
+
+    For the over that's the lowest line, and among books hanging it the best price; for
+    the under the highest line, then the best price. Book columns come back as indices
+    (-1 when no book has that side), alongside the chosen line and odds.
+    """
+    lines = np.atleast_2d(np.asarray(lines, dtype=float))
+    out: Dict[str, np.ndarray] = {}
+    for side, odds, pick_line in (('over', over_odds, np.fmin.reduce), ('under', under_odds, np.fmax.reduce)):
+        odds = np.atleast_2d(np.asarray(odds, dtype=float))
+        offered = ~np.isnan(lines) & ~np.isnan(odds)
+        with np.errstate(invalid='ignore'):
+            target = pick_line(np.where(offered, lines, np.nan), axis=1)
+            payout = np.where(offered & (lines == target[:, None]), profit_per_unit(odds), -np.inf)
+        book = np.argmax(payout, axis=1)
+        found = offered.any(axis=1)
+        rows = np.arange(len(lines))
+        out[f'{side}_book'] = np.where(found, book, -1)
+        out[f'{side}_line'] = np.where(found, lines[rows, book], np.nan)
+        out[f'{side}_odds'] = np.where(found, odds[rows, book], np.nan)
+    return out
@@ -1,7 +1,9 @@
 import asyncio
 from playwright.async_api import async_playwright, Page
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from cfb_prop_predictor.types import OddsData, MatchupOdds
+from Utilis.names import name_matcher, normalize_name
+from Utilis.rate_limit import throttled_goto
 import re
 import json
 import os
@@ -26,15 +28,14 @@ async def scrape_player_props(page: Page, player_name: str, prop_type: str) -> O
     ]
 
     prop_identifier = prop_type.split('_')[1]  # e.g., 'passing'
-    target_name = player_name.strip().lower()
-    target_last = target_name.split()[-1]
+    is_target = name_matcher(player_name)
 
     for url in urls:
         try:
-            await page.goto(url, wait_until='networkidle')
+            await throttled_goto(page, url, wait_until='networkidle')
         except Exception:
             # fallback to domcontentloaded if networkidle is unreliable
-            await page.goto(url, wait_until='domcontentloaded')
+            await throttled_goto(page, url, wait_until='domcontentloaded')
 
         # Try to parse embedded JSON data first (Rotowire often injects player data
         # into script blocks as JS objects). This is more reliable for NFL pages
@@ -66,11 +67,10 @@ async def scrape_player_props(page: Page, player_name: str, prop_type: str) -> O
                         continue
                     _debug_print(f"DEBUG: json player name={name}")
 
-                    name_norm = re.sub(r"[^a-z0-9 ]+", "", name.lower())
-                    if name_norm == target_name or target_last in name_norm.split():
+                    if is_target(name):
                         # Detailed debug for matched candidate so we can inspect available keys/values
                         try:
-                            _debug_print(f"DEBUG: matched target candidate name={name} (norm={name_norm})")
+                            _debug_print(f"DEBUG: matched target candidate name={name} (norm={normalize_name(name)})")
                             keys = list(player_obj.keys())
                             _debug_print(f"DEBUG: player_obj keys count={len(keys)}")
                             # show prop-like keys (rec, yds, pass, rush, td) and market keys
@@ -157,19 +157,7 @@ async def scrape_player_props(page: Page, player_name: str, prop_type: str) -> O
                         continue
 
                     name_text = (await name_el.text_content() or '').strip()
-                    # normalize names: remove punctuation, multiple spaces
-                    name_norm = re.sub(r"[^a-z0-9 ]+", "", name_text.lower())
-                    target_norm = re.sub(r"[^a-z0-9 ]+", "", target_name)
-                    target_last_norm = re.sub(r"[^a-z0-9]+", "", target_last)
-
-                    # Exact match first
-                    if name_norm == target_norm:
-                        matched = True
-                    else:
-                        # Containment or last-name match
-                        matched = (target_last_norm in name_norm.split()) or (target_norm in name_norm)
-
-                    if matched:
+                    if is_target(name_text):
                         # attempt to read the line and odds
                         line = await row.locator('.line-cell .line').text_content() if await row.locator('.line-cell .line').count() else None
                         odds_list = await row.locator('.line-cell .odds').all_text_contents() if await row.locator('.line-cell .odds').count() else []
@@ -198,9 +186,86 @@ async def scrape_player_props(page: Page, player_name: str, prop_type: str) -> O
     return None
 
 
+ROTOWIRE_PROPS_URLS = {
+    'NFL': 'https://www.rotowire.com/betting/nfl/player-props.php',
+    'CFB': 'https://www.rotowire.com/betting/college-football/player-props.php',
+}
+ROTOWIRE_ODDS_URLS = {
+    'NFL': 'https://www.rotowire.com/betting/nfl/odds',
+    'CFB': 'https://www.rotowire.com/betting/college-football/odds',
+}
+
+
+def parse_rotowire_players(content: str, prop_type: str) -> List[Dict[str, Any]]:
+    """Every player with a line for `prop_type` in a Rotowire player-props page.
+
+    Reads the same embedded `data: [...]` arrays as `scrape_player_props`, but keeps all
+    players instead of searching for one. Rows are {'name', 'team', 'line', 'books'}, where
+    `books` maps each sportsbook on the page to its (line, over odds, under odds).
+    """
+    from Utilis.provider_parser import extract_book_lines, extract_prop_from_candidate
+
+    prop_identifier = prop_type.split('_')[1] if '_' in prop_type else prop_type
+    rows = []
+    for arr_text in re.findall(r"data:\s*(\[[\s\S]*?\])", content):
+        try:
+            data_list = json.loads(arr_text)
+        except Exception:
+            continue
+        if not isinstance(data_list, list):
+            continue
+        for player_obj in data_list:
+            if not isinstance(player_obj, dict) or not player_obj.get('name'):
+                continue
+            line = extract_prop_from_candidate(player_obj, prop_identifier)
+            if line is None:
+                continue
+            rows.append({
+                'name': str(player_obj['name']).strip(),
+                'team': player_obj.get('team') or player_obj.get('teamAbbr'),
+                'line': line,
+                'books': extract_book_lines(player_obj, prop_identifier),
+            })
+    return rows
+
+
+async def scrape_rotowire_slate(page: Page, league: str, prop_type: str) -> List[Dict[str, Any]]:
+    """Bulk version of `scrape_player_props`: one page load for the whole league."""
+    url = ROTOWIRE_PROPS_URLS.get(league.upper())
+    if not url:
+        return []
+    try:
+        await throttled_goto(page, url, wait_until='networkidle')
+    except Exception:
+        await throttled_goto(page, url, wait_until='domcontentloaded')
+    rows = parse_rotowire_players(await page.content(), prop_type)
+    _debug_print(f"DEBUG: parsed {len(rows)} Rotowire players for {league} / {prop_type}")
+    return rows
+
+
+async def _matchup_from_row(row, teams: List[str]) -> MatchupOdds:
+    odds_elements = row.locator('.flex.w-full.justify-end .flex-col')
+
+    # Extract text content safely
+    spread_away_text = await odds_elements.nth(0).all_text_contents()
+    spread_home_text = await odds_elements.nth(1).all_text_contents()
+    moneyline_away = await odds_elements.nth(2).text_content()
+    moneyline_home = await odds_elements.nth(3).text_content()
+    total_over_text = await odds_elements.nth(4).all_text_contents()
+    total_under_text = await odds_elements.nth(5).all_text_contents()
+
+    return MatchupOdds(
+        awayTeam=teams[0].strip(),
+        homeTeam=teams[1].strip(),
+        spread={'away': " ".join(spread_away_text), 'home': " ".join(spread_home_text)},
+        moneyline={'away': moneyline_away.strip(), 'home': moneyline_home.strip()},
+        total={'over': " ".join(total_over_text), 'under': " ".join(total_under_text)}
+    )
+
+
 async def scrape_matchup_odds(page: Page, game: str) -> Optional[MatchupOdds]:
     """Scrapes Rotowire for a specific game's matchup odds."""
-    await page.goto('https://www.rotowire.com/betting/college-football/odds', wait_until='domcontentloaded')
+    await throttled_goto(page, 'https://www.rotowire.com/betting/college-football/odds', wait_until='domcontentloaded')
     
     try:
         away_team_name, home_team_name = [team.strip() for team in game.split('vs.')]
@@ -212,23 +277,26 @@ async def scrape_matchup_odds(page: Page, game: str) -> Optional[MatchupOdds]:
         row = game_rows.nth(i)
         teams = await row.locator('.w-full.flex.items-center a.text-sm').all_text_contents()
         if len(teams) >= 2 and away_team_name in teams[0] and home_team_name in teams[1]:
-            odds_elements = row.locator('.flex.w-full.justify-end .flex-col')
-            
-            # Extract text content safely
-            spread_away_text = await odds_elements.nth(0).all_text_contents()
-            spread_home_text = await odds_elements.nth(1).all_text_contents()
-            moneyline_away = await odds_elements.nth(2).text_content()
-            moneyline_home = await odds_elements.nth(3).text_content()
-            total_over_text = await odds_elements.nth(4).all_text_contents()
-            total_under_text = await odds_elements.nth(5).all_text_contents()
-
-            return MatchupOdds(
-                awayTeam=teams[0].strip(),
-                homeTeam=teams[1].strip(),
-                spread={'away': " ".join(spread_away_text), 'home': " ".join(spread_home_text)},
-                moneyline={'away': moneyline_away.strip(), 'home': moneyline_home.strip()},
-                total={'over': " ".join(total_over_text), 'under': " ".join(total_under_text)}
-            )
+            return await _matchup_from_row(row, teams)
     return None
 
+
+async def scrape_all_matchup_odds(page: Page, league: str = 'CFB') -> List[MatchupOdds]:
+    """Every game's matchup odds from one Rotowire odds page load."""
+    url = ROTOWIRE_ODDS_URLS.get(league.upper())
+    if not url:
+        return []
+    await throttled_goto(page, url, wait_until='domcontentloaded')
+    matchups = []
+    game_rows = page.locator('.odds-table-container .grid.grid-cols-12')
+    for i in range(await game_rows.count()):
+        row = game_rows.nth(i)
+        teams = await row.locator('.w-full.flex.items-center a.text-sm').all_text_contents()
+        if len(teams) >= 2:
+            try:
+                matchups.append(await _matchup_from_row(row, teams))
+            except Exception as e:
+                _debug_print(f"DEBUG: skipped matchup row {teams}: {e}")
+    return matchups
+
 # Play scraper utility
@@ -0,0 +1,99 @@
+"""Monte Carlo projections for a whole slate of props at once.
+
+Each prop's outcome is modelled as Normal(mean, std) clipped at zero (yards and catches
+can't go negative), with mean/std taken from the player's rolling features. Draws for
+all props are generated from one seeded `numpy.random.Generator` as a (props, draws)
+array. The slate is processed in row chunks of at most SIM_CHUNK_ELEMENTS samples, so
+memory stays bounded for any slate size while every prop still sees all its draws
+(confidence intervals are exact sample quantiles). Output does not depend on the
+chunk size.
+
+Env: SIM_DRAWS (default 10000), SIM_SEED (default 0), SIM_CHUNK_ELEMENTS (default
+4,000,000, about 16MB of float32), SIM_DEFAULT_CV (std as a fraction of the mean when a
+player has too few games for a variance, default 0.35).
+"""
+
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Utilis.odds_math import american_array, profit_per_unit
+
+SIM_DRAWS = int(os.environ.get('SIM_DRAWS', '10000'))
+SIM_SEED = int(os.environ.get('SIM_SEED', '0'))
+SIM_CHUNK_ELEMENTS = int(os.environ.get('SIM_CHUNK_ELEMENTS', str(4_000_000)))
+SIM_DEFAULT_CV = float(os.environ.get('SIM_DEFAULT_CV', '0.35'))
+
+
+def simulate_props(means: Sequence[float],
+                   stds: Sequence[float],
+                   lines: Sequence[float],
+                   over_odds: Optional[Sequence] = None,
+                   under_odds: Optional[Sequence] = None,
+                   draws: Optional[int] = None,
+                   seed: Optional[int] = None,
+                   ci: float = 0.9,
+                   chunk_elements: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Simulate every prop and summarize the samples.
+
+    Returns arrays aligned with the inputs:
+      p_over, p_under   share of draws above / below the line
+      sim_mean          mean of the clipped draws
+      ci_low, ci_high   central `ci` interval of the draws
+      ev_over, ev_under expected profit per unit staked at over_odds / under_odds
+                        (NaN where the price is missing)
+    Props with a missing mean or line come back as NaN throughout. A NaN or negative std
+    falls back to SIM_DEFAULT_CV * mean.
+    """
+    draws = SIM_DRAWS if draws is None else draws
+    seed = SIM_SEED if seed is None else seed
+    chunk_elements = SIM_CHUNK_ELEMENTS if chunk_elements is None else chunk_elements
+
+    means = np.asarray(means, dtype=float)
+    lines = np.asarray(lines, dtype=float)
+    stds = np.asarray(stds, dtype=float)
+    stds = np.where(np.isfinite(stds) & (stds >= 0), stds, SIM_DEFAULT_CV * np.abs(means))
+    n = len(means)
+
+    out = {k: np.full(n, np.nan) for k in ('p_over', 'p_under', 'sim_mean', 'ci_low', 'ci_high')}
+    valid = np.flatnonzero(np.isfinite(means) & np.isfinite(lines))
+    rng = np.random.default_rng(seed)
+    tail = (1.0 - ci) / 2.0
+    rows = max(1, chunk_elements // max(draws, 1))
+    buf = np.empty((min(rows, len(valid)), draws), dtype=np.float32)
+
+    for start in range(0, len(valid), rows):
+        idx = valid[start:start + rows]
+        z = buf[:len(idx)]
+        rng.standard_normal(dtype=np.float32, out=z)
+        z *= stds[idx, None].astype(np.float32)
+        z += means[idx, None].astype(np.float32)
+        np.maximum(z, 0.0, out=z)
+        line = lines[idx, None].astype(np.float32)
+        out['p_over'][idx] = np.count_nonzero(z > line, axis=1) / draws
+        out['p_under'][idx] = np.count_nonzero(z < line, axis=1) / draws
+        out['sim_mean'][idx] = z.mean(axis=1, dtype=np.float64)
+        low, high = np.quantile(z, [tail, 1.0 - tail], axis=1)
+        out['ci_low'][idx] = low
+        out['ci_high'][idx] = high
+
+    for side, odds, win, lose in (('over', over_odds, 'p_over', 'p_under'),
+                                  ('under', under_odds, 'p_under', 'p_over')):
+        profit = profit_per_unit(american_array(odds)) if odds is not None else np.full(n, np.nan)
+        out[f'ev_{side}'] = out[win] * profit - out[lose]
+    return out
+
+
+def choose_sides(p_over: np.ndarray, p_under: np.ndarray,
+                 ev_over: np.ndarray, ev_under: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pick a side per prop: the better-EV side where any price is known, else the likelier one.
+
+    Returns (is_over, p_side, ev_side); ev_side is NaN for unpriced props.
+    """
+    unpriced = np.isnan(ev_over) & np.isnan(ev_under)
+    by_ev = np.nan_to_num(ev_over, nan=-np.inf) >= np.nan_to_num(ev_under, nan=-np.inf)
+    is_over = np.where(unpriced, p_over >= p_under, by_ev)
+    p_side = np.where(is_over, p_over, p_under)
+    ev_side = np.where(unpriced, np.nan, np.where(is_over, ev_over, ev_under))
+    return is_over, p_side, ev_side
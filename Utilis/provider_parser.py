@@ -1,8 +1,12 @@
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
 import re
 
 import os
 
+import numpy as np
+
+from Utilis.odds_math import parse_american
+
 # Preferred sportsbook order — can be configured via env or extended later
 env_priority = os.environ.get('SPORTSBOOK_PRIORITY')
 if env_priority:
@@ -77,3 +81,115 @@ def extract_prop_from_candidate(candidate, prop_identifier: str, sportsbooks: It
                         return res
 
     return None
+
+
+class BookLine(NamedTuple):
+    line: Optional[float]
+    over_odds: Optional[int]
+    under_odds: Optional[int]
+
+
+_SIDE_TOKENS = frozenset({'over', 'under', 'odds', 'line'})
+
+
+def _book_field(rest: str) -> str:
+    """Which BookLine field a key (minus its book prefix) holds: 'recs' -> line,
+    'recs_over' / 'rec_odds' -> over_odds, 'recs_under_odds' -> under_odds."""
+    if 'under' in rest:
+        return 'under_odds'
+    if 'over' in rest or 'odds' in rest:
+        return 'over_odds'
+    return 'line'
+
+
+def _market_stem(rest: str) -> str:
+    """The market a key belongs to, without its side/odds tokens and plural 's', so
+    'recs', 'rec_odds' and 'recs_under' share a stem and 'receiving_yds_over' does not."""
+    tokens = [t.rstrip('s') for t in rest.split('_') if t and t not in _SIDE_TOKENS]
+    return '_'.join(tokens)
+
+
+def extract_book_lines(candidate, prop_identifier: str,
+                       sportsbooks: Iterable[str] = DEFAULT_SPORTSBOOK_PRIORITY) -> Dict[str, BookLine]:
+    """Every sportsbook's (line, over odds, under odds) for the prop, in one walk of `candidate`.
+
+    Reads book-prefixed keys ('draftkings_recs', 'fanduel_recs_over') and keys nested
+    under a book-named object ({'mgm': {'recs': '3.5'}}), matching the prop like
+    `extract_prop_from_candidate` does (the identifier or its 3-letter prefix). Keys are
+    grouped by market stem, so a line and its odds always come from the same market: per
+    book, a market naming the full identifier beats one matching only the 3-letter prefix
+    ('recs' vs 'receiving_yds'), then one with a line, then the first seen. Within a
+    market the first value seen for a field wins. Books with nothing found are left out;
+    the rest come back in `sportsbooks` order.
+    """
+    books = [b.lower() for b in sportsbooks]
+    prefixes = [(b, f"{b}_") for b in books]
+    prop_id = prop_identifier.lower()
+    short = prop_id[:3]
+    # book -> market stem -> (exact identifier match, fields)
+    found: Dict[str, Dict[str, Tuple[bool, Dict[str, Any]]]] = {}
+
+    def record(book: str, rest: str, value: Any) -> None:
+        if prop_id not in rest and short not in rest:
+            return
+        field = _book_field(rest)
+        stem = _market_stem(rest)
+        exact, fields = found.setdefault(book, {}).setdefault(stem, (False, {}))
+        if prop_id in rest and not exact:
+            found[book][stem] = (True, fields)
+        if field in fields:
+            return
+        if field == 'line':
+            nums = _collect_numeric_values(value)
+            parsed = nums[0] if nums else None
+        else:
+            parsed = parse_american(value)
+        if parsed is not None:
+            fields[field] = parsed
+
+    def walk(node: Any, book: Optional[str]) -> None:
+        if isinstance(node, list):
+            for item in node:
+                walk(item, book)
+            return
+        if not isinstance(node, dict):
+            return
+        for k, v in node.items():
+            lk = str(k).lower()
+            if isinstance(v, (dict, list)):
+                walk(v, lk if lk in books else book)
+                continue
+            for name, pref in prefixes:
+                if lk.startswith(pref):
+                    record(name, lk[len(pref):], v)
+                    break
+            else:
+                if book is not None:
+                    record(book, lk, v)
+
+    walk(candidate, None)
+    out: Dict[str, BookLine] = {}
+    for b in books:
+        markets = [(exact, 'line' in fields, -i, fields)
+                   for i, (exact, fields) in enumerate(found.get(b, {}).values()) if fields]
+        if markets:
+            fields = max(markets, key=lambda m: m[:3])[3]
+            out[b] = BookLine(fields.get('line'), fields.get('over_odds'), fields.get('under_odds'))
+    return out
+
+
+def book_line_arrays(rows: Sequence[Mapping[str, BookLine]],
+                     sportsbooks: Sequence[str] = DEFAULT_SPORTSBOOK_PRIORITY) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(props, books) arrays of lines, over odds and under odds from `extract_book_lines`
+    results (NaN where a book has no value), ready for `odds_math.best_lines`."""
+    books = [b.lower() for b in sportsbooks]
+    out = np.full((3, len(rows), len(books)), np.nan)
+    for i, row in enumerate(rows):
+        for j, book in enumerate(books):
+            entry = row.get(book)
+            if entry is None:
+                continue
+            for f, value in enumerate(entry):
+                if value is not None:
+                    out[f, i, j] = value
+    return out[0], out[1], out[2]
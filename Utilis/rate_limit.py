@@ -0,0 +1,340 @@
+"""Per-host throttling, retries and circuit breaking for sportsbook traffic.
+
+Every outbound request to a sportsbook host (requests, aiohttp or a Playwright
+navigation) goes through that host's `HostThrottle`:
+
+- a token bucket caps the request rate (SCRAPER_RATE_PER_SEC, bursts of SCRAPER_BURST);
+- 429 and 5xx responses and connection errors are retried with full-jitter exponential
+  backoff, up to SCRAPER_MAX_RETRIES times; a `Retry-After` header overrides the backoff
+  and pauses the whole host, not just the caller that saw it (even on the last attempt),
+  and a wait beyond SCRAPER_RETRY_AFTER_BUDGET seconds gives up instead of retrying early;
+- after BREAKER_THRESHOLD consecutive failures the circuit opens and requests fail fast
+  with `CircuitOpenError` for BREAKER_RESET seconds, then one probe is let through. A
+  probe that ends in an exception the wrappers don't classify reopens the circuit, and a
+  probe that never reports back is replaced after another BREAKER_RESET seconds.
+
+The throttles live in this module, so all callers in a process share them.
+`throttle_metrics()` reports requests, retries and time spent throttled per host.
+"""
+
+import asyncio
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_RATE = float(os.environ.get('SCRAPER_RATE_PER_SEC', '2'))
+DEFAULT_BURST = int(os.environ.get('SCRAPER_BURST', '4'))
+MAX_RETRIES = int(os.environ.get('SCRAPER_MAX_RETRIES', '3'))
+BACKOFF_BASE = 0.5  # seconds; attempt n waits up to BACKOFF_BASE * 2**n
+BACKOFF_CAP = 30.0
+# Longest Retry-After a caller will sleep through before retrying; a longer one gives up
+RETRY_AFTER_BUDGET = float(os.environ.get('SCRAPER_RETRY_AFTER_BUDGET', '60'))
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 60.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while a host's circuit is open."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket. Callers reserve a slot and sleep until it comes up."""
+
+    def __init__(self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds` (used for Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+
+class CircuitBreaker:
+    """Closed -> open after `threshold` consecutive failures -> half-open after `reset_timeout`.
+
+    Half-open lets one probe through; if it hasn't reported back within another
+    `reset_timeout`, the next caller becomes the probe instead.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, reset_timeout: float = BREAKER_RESET,
+                 clock: Callable[[], float] = time.monotonic):
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = 'closed'
+        self.failures = 0
+        self.opens = 0
+        self._opened_at = 0.0
+        self._probe_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self) -> bool:
+        """Raise `CircuitOpenError` unless a request may go out; True when it's the probe."""
+        with self._lock:
+            if self.state == 'closed':
+                return False
+            now = self._clock()
+            waited = now - (self._opened_at if self.state == 'open' else self._probe_at)
+            if waited >= self.reset_timeout:
+                self.state = 'half_open'  # this caller is the probe
+                self._probe_at = now
+                return True
+            raise CircuitOpenError(f"circuit {self.state}; retry in "
+                                   f"{max(0.0, self.reset_timeout - waited):.0f}s")
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = 'closed'
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.threshold:
+                if self.state != 'open':
+                    self.opens += 1
+                self.state = 'open'
+                self._opened_at = self._clock()
+
+    def release_probe(self) -> None:
+        """The probe ended without a verdict (it raised); reopen rather than stay half-open."""
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'open'
+                self._opened_at = self._clock()
+
+
+class HostThrottle:
+    """Rate limit, breaker and counters for one host."""
+
+    def __init__(self, host: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST,
+                 max_retries: int = MAX_RETRIES):
+        self.host = host
+        self.max_retries = max_retries
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker()
+        self._lock = threading.Lock()
+        self._metrics = {
+            'requests': 0, 'retries': 0, 'failures': 0, 'rejected': 0,
+            'throttled_seconds': 0.0, 'backoff_seconds': 0.0,
+        }
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._metrics[name] += amount
+
+    def _admit(self) -> Tuple[float, bool]:
+        """Check the breaker and reserve a token; returns (wait before sending, is probe)."""
+        try:
+            probe = self.breaker.before_request()
+        except CircuitOpenError:
+            self._count('rejected')
+            raise
+        wait = self.bucket.reserve()
+        self._count('requests')
+        if wait > 0:
+            self._count('throttled_seconds', wait)
+        return wait, probe
+
+    def wait_turn(self) -> bool:
+        """Block until this request may go out. True when it's the breaker's half-open probe,
+        in which case the caller must end with `succeeded`, `failed` or `abandoned`."""
+        wait, probe = self._admit()
+        time.sleep(wait)
+        return probe
+
+    async def wait_turn_async(self) -> bool:
+        wait, probe = self._admit()
+        await asyncio.sleep(wait)
+        return probe
+
+    def failed(self, attempt: int, retry_after: Optional[str] = None) -> Optional[float]:
+        """Record a failed attempt. Returns the delay before retrying, or None when out of
+        retries or when the server asks for a longer wait than RETRY_AFTER_BUDGET."""
+        self._count('failures')
+        self.breaker.record_failure()
+        delay = _parse_retry_after(retry_after)
+        if delay is not None:
+            # honored in full and for every caller, whether or not this one retries
+            self.bucket.pause(delay)
+        if attempt >= self.max_retries:
+            return None
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        elif delay > RETRY_AFTER_BUDGET:
+            return None
+        self._count('retries')
+        self._count('backoff_seconds', delay)
+        return delay
+
+    def succeeded(self) -> None:
+        self.breaker.record_success()
+
+    def abandoned(self, probe: bool) -> None:
+        """The request raised something that is neither a success nor a counted failure."""
+        if probe:
+            self.breaker.release_probe()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshot = dict(self._metrics)
+        snapshot['circuit'] = self.breaker.state
+        snapshot['circuit_opens'] = self.breaker.opens
+        return snapshot
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds; accepts delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+_throttles: Dict[str, HostThrottle] = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(url_or_host: str) -> HostThrottle:
+    host = urlsplit(url_or_host).hostname or url_or_host
+    with _throttles_lock:
+        throttle = _throttles.get(host)
+        if throttle is None:
+            throttle = _throttles[host] = HostThrottle(host)
+        return throttle
+
+
+def throttle_metrics() -> Dict[str, Dict[str, Any]]:
+    with _throttles_lock:
+        throttles = list(_throttles.values())
+    return {t.host: t.metrics() for t in throttles}
+
+
+def reset_throttles() -> None:
+    with _throttles_lock:
+        _throttles.clear()
+
+
+# --- Transport wrappers ---
+
+def throttled_get(url: str, session=None, **kwargs):
+    """`requests.get` through the host's throttle. Returns the last response, even a 429/5xx
+    once retries run out, so callers keep using `raise_for_status`."""
+    import requests
+
+    http = session or requests
+    throttle = get_throttle(url)
+    attempt = 0
+    while True:
+        probe = throttle.wait_turn()
+        try:
+            resp = http.get(url, **kwargs)
+        except requests.exceptions.RequestException:
+            delay = throttle.failed(attempt)
+            if delay is None:
+                raise
+        except BaseException:
+            throttle.abandoned(probe)
+            raise
+        else:
+            if resp.status_code not in RETRY_STATUSES:
+                throttle.succeeded()
+                return resp
+            delay = throttle.failed(attempt, resp.headers.get('Retry-After'))
+            if delay is None:
+                return resp
+        print(f"[rate_limit] Retrying {throttle.host} in {delay:.1f}s (attempt {attempt + 1}).")
+        time.sleep(delay)
+        attempt += 1
+
+
+async def throttled_get_json_async(session, url: str, loads: Callable[[bytes], Any] = json.loads,
+                                   **kwargs) -> Any:
+    """GET `url` with an aiohttp session through the host's throttle and return the body
+    decoded by `loads`. Raises aiohttp.ClientResponseError once retries run out."""
+    import aiohttp
+
+    throttle = get_throttle(url)
+    attempt = 0
+    while True:
+        probe = await throttle.wait_turn_async()
+        try:
+            async with session.get(url, **kwargs) as resp:
+                if resp.status in RETRY_STATUSES:
+                    delay = throttle.failed(attempt, resp.headers.get('Retry-After'))
+                    if delay is None:
+                        resp.raise_for_status()
+                else:
+                    resp.raise_for_status()
+                    body = loads(await resp.read())
+                    throttle.succeeded()
+                    return body
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            delay = throttle.failed(attempt)
+            if delay is None:
+                raise
+        except BaseException:
+            # 4xx, undecodable body, cancellation: not a host failure, but a probe that
+            # ends here must not leave the breaker half-open
+            throttle.abandoned(probe)
+            raise
+        print(f"[rate_limit] Retrying {throttle.host} in {delay:.1f}s (attempt {attempt + 1}).")
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def throttled_goto(page, url: str, **kwargs):
+    """`page.goto` through the host's throttle, retrying 429/5xx navigations.
+
+    Navigation errors are re-raised untouched so the caller's own fallback, e.g. retrying
+    with a weaker `wait_until`, still applies; they don't count against the breaker,
+    since a `networkidle` timeout usually means a busy page rather than a failing host.
+    If the navigation was the breaker's probe, though, the circuit reopens.
+    """
+    throttle = get_throttle(url)
+    attempt = 0
+    while True:
+        probe = await throttle.wait_turn_async()
+        try:
+            response = await page.goto(url, **kwargs)
+        except BaseException:
+            throttle.abandoned(probe)
+            raise
+        if response is None or response.status not in RETRY_STATUSES:
+            throttle.succeeded()
+            return response
+        delay = throttle.failed(attempt, response.headers.get('retry-after'))
+        if delay is None:
+            return response
+        print(f"[rate_limit] Retrying {throttle.host} in {delay:.1f}s (attempt {attempt + 1}).")
+        await asyncio.sleep(delay)
+        attempt += 1
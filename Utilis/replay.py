@@ -0,0 +1,167 @@
+"""Bulk replay of recorded DraftKings payloads for backtesting.
+
+`parse_dk_json_payload` is pure CPU work, so replaying thousands of saved payloads
+in one process is GIL-bound. `iter_replayed_props` spreads the files across a
+process pool (in chunks, to keep IPC overhead low) and yields results in input
+order as they complete; `replay_to_file` streams those results into a Parquet,
+CSV or JSON-lines file without holding the whole replay in memory.
+"""
+
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cfb_prop_predictor.types import PropRecord
+from Utilis.dk_scraper import parse_dk_json_payload
+
+OUTPUT_FIELDS = [
+    'source', 'name', 'position', 'team_name', 'team_abbrev', 'opponent_name',
+    'opponent_abbrev', 'start_time', 'league', 'market_name', 'prop_line',
+    'over_odds', 'under_odds',
+]
+
+
+def _parse_archive_file(task: Tuple[str, str, str]) -> Tuple[str, List[PropRecord], Optional[str]]:
+    """Worker: load one payload file and parse it. Errors are returned, not raised, so one bad
+    file doesn't abort the whole replay."""
+    path, league, prop_type = task
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            payload = json.load(f)
+        props = parse_dk_json_payload(payload, league, prop_type)
+        return path, props, None
+    except Exception as e:
+        return path, [], str(e)
+
+
+def iter_replayed_props(paths: Iterable[str], league: str, prop_type: str,
+                        workers: Optional[int] = None,
+                        chunksize: Optional[int] = None) -> Iterator[Tuple[str, List[PropRecord]]]:
+    """Yield (path, props) for every payload file, in the order of `paths`.
+
+    `workers` defaults to the CPU count; `workers=1` parses in-process. Files are handed
+    to workers `chunksize` at a time (default: about four chunks per worker).
+    """
+    tasks = [(path, league, prop_type) for path in paths]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(tasks) < 2:
+        results = map(_parse_archive_file, tasks)
+        for path, props, error in results:
+            if error:
+                print(f"[replay] WARNING: skipped {path}: {error}")
+            yield path, props
+        return
+
+    chunksize = chunksize or max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, props, error in pool.map(_parse_archive_file, tasks, chunksize=chunksize):
+            if error:
+                print(f"[replay] WARNING: skipped {path}: {error}")
+            yield path, props
+
+
+def _rows(path: str, props: List[PropRecord]) -> Iterator[Dict[str, Any]]:
+    for prop in props:
+        row = {field: prop.get(field) for field in OUTPUT_FIELDS[1:]}
+        row['source'] = path
+        yield row
+
+
+class _ParquetSink:
+    def __init__(self, out_path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise RuntimeError("Parquet output requires pyarrow (pip install pyarrow)") from e
+        self._pa = pa
+        numeric = {'prop_line', 'over_odds', 'under_odds'}
+        self._schema = pa.schema([
+            (f, pa.float64() if f in numeric else pa.string()) for f in OUTPUT_FIELDS
+        ])
+        self._writer = pq.ParquetWriter(out_path, self._schema)
+
+    @staticmethod
+    def _as_float(v):
+        try:
+            return None if v is None else float(v)
+        except (TypeError, ValueError):
+            return None
+
+    def write(self, rows: List[Dict[str, Any]]):
+        columns = {}
+        for field in self._schema:
+            values = [r.get(field.name) for r in rows]
+            if self._pa.types.is_floating(field.type):
+                values = [self._as_float(v) for v in values]
+            else:
+                values = [None if v is None else str(v) for v in values]
+            columns[field.name] = values
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class _CsvSink:
+    def __init__(self, out_path: str):
+        self._f = open(out_path, 'w', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._f, fieldnames=OUTPUT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._f.close()
+
+
+class _JsonLinesSink:
+    def __init__(self, out_path: str):
+        self._f = open(out_path, 'w', encoding='utf-8')
+
+    def write(self, rows: List[Dict[str, Any]]):
+        self._f.writelines(json.dumps(r) + '\n' for r in rows)
+
+    def close(self):
+        self._f.close()
+
+
+def _open_sink(out_path: str):
+    ext = os.path.splitext(out_path)[1].lower()
+    if ext == '.parquet':
+        return _ParquetSink(out_path)
+    if ext == '.csv':
+        return _CsvSink(out_path)
+    return _JsonLinesSink(out_path)
+
+
+def replay_to_file(paths: Iterable[str], out_path: str, league: str, prop_type: str,
+                   workers: Optional[int] = None, chunksize: Optional[int] = None,
+                   batch_rows: int = 50_000) -> int:
+    """Replay every payload file into `out_path` and return the number of rows written.
+
+    The format follows the extension: `.parquet` (needs pyarrow), `.csv`, else JSON lines.
+    Rows keep the input file order and carry their `source` path; they are flushed every
+    `batch_rows` rows.
+    """
+    sink = _open_sink(out_path)
+    written = 0
+    batch: List[Dict[str, Any]] = []
+    try:
+        for path, props in iter_replayed_props(paths, league, prop_type, workers=workers, chunksize=chunksize):
+            batch.extend(_rows(path, props))
+            if len(batch) >= batch_rows:
+                sink.write(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            sink.write(batch)
+            written += len(batch)
+    finally:
+        sink.close()
+    print(f"[replay] Wrote {written} rows to {out_path}.")
+    return written
@@ -0,0 +1,161 @@
+"""Join a DraftKings slate with Rotowire player lines and game-level matchup odds.
+
+The DK scan, the Rotowire player-props page and the Rotowire odds page each come back
+as separate lists. `merge_slate` hash-indexes the Rotowire rows by canonical player
+key and the matchups by team key, then makes one pass over the DK props, so the cost is
+linear in the slate size. Each matched prop gets `rotowire_line` and, when its team
+is found in a matchup, `team_spread`, `team_moneyline` and `game_total`.
+
+Rotowire and DK spell players differently (suffixes, initials); a name that misses
+the exact key is resolved through a `NameIndex` built only on the first miss, and only
+an initial-style hit ("T. Kelce" / "Travis Kelce", score 0.9) is trusted. Several
+Rotowire rows with one name (common in college football) are told apart by team; when
+the team can't settle it the prop gets no Rotowire line, and a row whose team is known
+and differs from the prop's is never used.
+
+Props from the DK API carry no team (`team_name="N/A"`: the subcategory payload has
+no event or participant data), so for them only the Rotowire name join applies; the
+matchup fields are filled for props from the Playwright scan or snapshots that know
+their team.
+"""
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from cfb_prop_predictor.types import MatchupOdds, PropRecord
+from Utilis.names import NameIndex, canonical_key, normalize_name
+
+_MISSING_TEAM = ('', 'n/a', 'na', 'none')
+# NameIndex scores: 1.0 same key, 0.9 last name + a bare first initial on one side;
+# prefix first names, bare last names and trigram hits are too loose to borrow a line from
+MIN_NAME_SCORE = 0.9
+
+
+def _team_keys(team: str) -> List[str]:
+    """Full name, plus the school/city part and the nickname, to match "Alabama" or
+    "Chiefs" against "Alabama Crimson Tide" / "Kansas City Chiefs"."""
+    norm = normalize_name(team or '')
+    if norm in _MISSING_TEAM:
+        return []
+    tokens = norm.split()
+    keys = [norm]
+    if len(tokens) > 1:
+        keys += [' '.join(tokens[:-1]), tokens[-1], tokens[0]]
+    return list(dict.fromkeys(keys))
+
+
+def build_matchup_index(matchups: Iterable[MatchupOdds]) -> Dict[str, Tuple[MatchupOdds, str]]:
+    """team key -> (matchup, 'away'|'home'). Full names always index; a partial key is
+    kept only if no other team on the slate shares it."""
+    full: Dict[str, Tuple[MatchupOdds, str]] = {}
+    partial: Dict[str, List[Tuple[MatchupOdds, str]]] = {}
+    for matchup in matchups:
+        for side, team in (('away', matchup.awayTeam), ('home', matchup.homeTeam)):
+            keys = _team_keys(team)
+            if not keys:
+                continue
+            full[keys[0]] = (matchup, side)
+            for key in keys[1:]:
+                partial.setdefault(key, []).append((matchup, side))
+    index = {key: entries[0] for key, entries in partial.items() if len(entries) == 1}
+    index.update(full)
+    return index
+
+
+def _find_matchup(prop: Mapping[str, Any], index: Dict[str, Tuple[MatchupOdds, str]]):
+    for field in ('team_abbrev', 'team_name'):
+        for key in _team_keys(prop.get(field) or ''):
+            hit = index.get(key)
+            if hit:
+                return hit
+    return None
+
+
+def _same_team(row_team: Any, prop: Mapping[str, Any]) -> bool:
+    row_keys = set(_team_keys(str(row_team or '')))
+    if not row_keys:
+        return False
+    return any(row_keys.intersection(_team_keys(prop.get(f) or '')) for f in ('team_abbrev', 'team_name'))
+
+
+def _is_abbrev(team: str) -> bool:
+    tokens = normalize_name(team).split()
+    return len(tokens) == 1 and len(tokens[0]) <= 4
+
+
+def _other_team(row_team: Any, prop: Mapping[str, Any]) -> bool:
+    """Both sides know their team and it isn't the same one. "ARI" and "Arizona Cardinals"
+    can't be compared, so an abbreviation is only checked against the prop's abbreviation
+    and a name against its name."""
+    row_team = str(row_team or '')
+    if not _team_keys(row_team):
+        return False
+    field = 'team_abbrev' if _is_abbrev(row_team) else 'team_name'
+    prop_team = prop.get(field) or ''
+    if not _team_keys(prop_team) or _is_abbrev(prop_team) != (field == 'team_abbrev'):
+        return False
+    return not set(_team_keys(row_team)).intersection(_team_keys(prop_team))
+
+
+class _RotowireLookup:
+    def __init__(self, rows: Iterable[Mapping[str, Any]], fuzzy: bool):
+        self._by_key: Dict[str, List[Mapping[str, Any]]] = {}
+        for row in rows:
+            key = canonical_key(row.get('name') or '')
+            if key:
+                self._by_key.setdefault(key, []).append(row)
+        self._fuzzy = fuzzy
+        self._names: Optional[NameIndex] = None
+
+    def find(self, prop: Mapping[str, Any]) -> Optional[Mapping[str, Any]]:
+        name = prop.get('name') or ''
+        rows = self._by_key.get(canonical_key(name))
+        if rows is None and self._fuzzy and self._by_key:
+            if self._names is None:
+                self._names = NameIndex()
+                for key in self._by_key:
+                    self._names.add(key, key)
+            hit = self._names.match(name)
+            rows = self._by_key.get(hit[1]) if hit and hit[2] >= MIN_NAME_SCORE else None
+        if not rows:
+            return None
+        rows = [row for row in rows if not _other_team(row.get('team'), prop)]
+        if len(rows) > 1:
+            # several players share the name; without a team to tell them apart, no line
+            # beats a guess
+            same = [row for row in rows if _same_team(row.get('team'), prop)]
+            return same[0] if len(same) == 1 else None
+        return rows[0] if rows else None
+
+
+def merge_slate(props: Iterable[Mapping[str, Any]],
+                rotowire_rows: Iterable[Mapping[str, Any]] = (),
+                matchups: Iterable[MatchupOdds] = (),
+                fuzzy: bool = True) -> List[Mapping[str, Any]]:
+    """Return the props with Rotowire and matchup fields filled in where a match exists.
+
+    `rotowire_rows` are {'name', 'team', 'line'} dicts (see `play_scraper.parse_rotowire_players`).
+    PropRecords come back as new PropRecords; plain dict props as new dicts. Props with no
+    match are returned unchanged.
+    """
+    rotowire = _RotowireLookup(rotowire_rows, fuzzy)
+    matchup_index = build_matchup_index(matchups)
+
+    merged = []
+    for prop in props:
+        changes: Dict[str, Any] = {}
+        row = rotowire.find(prop)
+        if row is not None and row.get('line') is not None:
+            changes['rotowire_line'] = row['line']
+        hit = _find_matchup(prop, matchup_index)
+        if hit is not None:
+            matchup, side = hit
+            changes['team_spread'] = matchup.spread.get(side)
+            changes['team_moneyline'] = matchup.moneyline.get(side)
+            changes['game_total'] = matchup.total.get('over')
+        if not changes:
+            merged.append(prop)
+        elif isinstance(prop, PropRecord):
+            merged.append(prop.replace(**changes))
+        else:
+            merged.append({**prop, **changes})
+    return merged
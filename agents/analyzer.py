@@ -1,4 +1,20 @@
+import math
+
 from cfb_prop_predictor.types import GatheredData, AnalysisOutput
+from Utilis.feature_store import get_default_store, stat_for_prop_type
+
+
+def _player_features(player_stats, prop_type: str):
+    """Rolling features for the player: precomputed by the batch path (`features`), else
+    looked up in the PLAYER_GAME_LOGS store. None when there is no history."""
+    features = getattr(player_stats, 'features', None)
+    if features is not None:
+        return features
+    store = get_default_store()
+    if store is None:
+        return None
+    return store.features(player_stats.name, stat_for_prop_type(prop_type))
+
 
 def analyze(data: GatheredData, prop_type: str) -> AnalysisOutput:
     """Analyzes the gathered data to produce key metrics and risk factors."""
@@ -10,12 +26,23 @@ def analyze(data: GatheredData, prop_type: str) -> AnalysisOutput:
     # Analyze Player Stats (if available)
     if data.player_stats:
         key_metrics['player_name'] = data.player_stats.name
-        # NOTE: This is a placeholder until historical data is integrated
-        key_metrics['season_average_placeholder'] = "Historical player data not yet implemented."
+        features = _player_features(data.player_stats, prop_type)
+        if features:
+            key_metrics['season_average'] = round(features['season_avg'], 2)
+            key_metrics['last_n_mean'] = round(features['last_n_mean'], 2)
+            last_n_var = features['last_n_var']
+            key_metrics['last_n_std'] = None if math.isnan(last_n_var) else round(math.sqrt(last_n_var), 2)
+            key_metrics['last_n_games'] = int(features['last_n_games'])
+            if features['last_n_games'] < 3:
+                risks.append(f"Only {int(features['last_n_games'])} recent games on record.")
+        else:
+            key_metrics['season_average_placeholder'] = "No game logs for this player (set PLAYER_GAME_LOGS)."
 
     # Analyze Odds Data (if available)
     if data.odds_data:
         key_metrics['prop_line'] = data.odds_data.prop_line
+        key_metrics['over_odds'] = data.odds_data.over_odds
+        key_metrics['under_odds'] = data.odds_data.under_odds
     else:
         risks.append("Could not retrieve live betting odds for this prop.")
 
@@ -1,34 +1,45 @@
 # In agents/data_gatherer.py
-from cfb_prop_predictor.types import GatheredData, OddsData
+from cfb_prop_predictor.types import GatheredData, OddsData, PropRecord
 # --- IMPORT OUR NEW API SCRAPER ---
-from Utilis.api_scraper import fetch_props_from_api
-from Utilis.dk_scraper import parse_dk_json_payload
-from typing import List, Dict, Any
+from Utilis.api_scraper import iter_props_from_api_async
+from Utilis.dk_scraper import scan_all_draftkings_props
+from Utilis.fixtures import load_fixture_dir, load_fixture_props
+from Utilis.play_scraper import scrape_all_matchup_odds, scrape_rotowire_slate
+from Utilis.slate_merge import merge_slate
+from typing import AsyncIterator, Awaitable, Callable, List, Dict, Any, Optional, Tuple
+import asyncio
+import concurrent.futures
 import os
-import json
+import time
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'tests', 'samples', 'dk_sample.json')
+
+# Source racing: how long gather_data waits for any source before giving up, and how much
+# of that budget is kept back for the local snapshot when the live sources are still running.
+GATHER_BUDGET = float(os.environ.get('GATHER_BUDGET', '30'))
+SNAPSHOT_RESERVE = float(os.environ.get('GATHER_SNAPSHOT_RESERVE', '2'))
+
+# A source fetch returns (props, as_of) where as_of is the epoch time the data reflects
+SourceFetch = Callable[[str, str], Awaitable[Tuple[List[PropRecord], Optional[float]]]]
+# start_delay None marks a fallback: see race_sources
+SourceSpec = Tuple[str, SourceFetch, Optional[float]]
 
 # --- THIS IS NOW A SYNC FUNCTION (no async/await) ---
 def gather_data(league: str, prop_type: str) -> GatheredData:
     """
-    Gathers data by scraping all available props for a given league and prop_type
-    using the direct DraftKings API, with fallback to local sample data.
+    Gathers data by scraping all available props for a given league and prop_type.
+    The configured sources (DraftKings API, optional Playwright scan, local snapshot)
+    are raced with `race_sources`; the first non-empty result wins.
     """
     print(f"[DataGatherer] Starting data gathering for ALL props: {league} / {prop_type}...")
 
-    # --- TRY API FIRST, FALLBACK TO SAMPLE DATA ---
-    scraped_props_list = []
-    try:
-        scraped_props_list = fetch_props_from_api(league, prop_type)
-        if scraped_props_list:
-            print(f"[DataGatherer] Successfully fetched {len(scraped_props_list)} props from API.")
-        else:
-            print(f"[DataGatherer] API returned no props, falling back to sample data...")
-            scraped_props_list = _load_sample_data(league, prop_type)
-    except Exception as e:
-        print(f"[DataGatherer] API failed ({e}), falling back to sample data...")
-        scraped_props_list = _load_sample_data(league, prop_type)
-
-    if not scraped_props_list:
+    scraped_props_list, source, as_of = _run_coroutine(race_sources(league, prop_type))
+    if scraped_props_list:
+        print(f"[DataGatherer] Using {len(scraped_props_list)} props from {source}.")
+        if os.environ.get('GATHER_ROTOWIRE', '0') == '1':
+            rotowire_rows, matchups = _run_coroutine(_fetch_rotowire(league, prop_type))
+            scraped_props_list = merge_slate(scraped_props_list, rotowire_rows, matchups)
+    else:
         print(f"[DataGatherer] Could not find any props for {league} / {prop_type}.")
 
     # We return the 'all_props' key, which the mapper will read.
@@ -36,27 +47,209 @@ def gather_data(league: str, prop_type: str) -> GatheredData:
         odds_data=None,       # No longer used at top level
         player_stats=None,  # No longer used at top level
         team_stats=None,    # No longer used at top level
-        all_props=scraped_props_list # NEW: Pass the full list
+        all_props=scraped_props_list, # NEW: Pass the full list
+        source=source,
+        data_as_of=as_of,
     )
 
-def _load_sample_data(league: str, prop_type: str) -> List[Dict[str, Any]]:
+def _run_coroutine(coro):
+    """asyncio.run, or on a worker thread when the caller already has a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+# --- Sources ---
+
+async def _api_source(league: str, prop_type: str) -> Tuple[List[PropRecord], Optional[float]]:
+    props: List[PropRecord] = []
+    async for batch in iter_props_from_api_async(league, prop_type):
+        props.extend(batch)
+    return props, time.time()
+
+async def _playwright_source(league: str, prop_type: str) -> Tuple[List[PropRecord], Optional[float]]:
+    from playwright.async_api import async_playwright
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            props = await scan_all_draftkings_props(page, league, prop_type)
+        finally:
+            await browser.close()
+    return props, time.time()
+
+async def _snapshot_source(league: str, prop_type: str) -> Tuple[List[PropRecord], Optional[float]]:
+    props = await asyncio.to_thread(_load_sample_data, league, prop_type)
+    try:
+        as_of = os.path.getmtime(SAMPLE_PATH)
+    except OSError:
+        as_of = None
+    return props, as_of
+
+async def _fetch_rotowire(league: str, prop_type: str):
+    """Rotowire player lines and matchup odds for the slate, one page load each."""
+    from playwright.async_api import async_playwright
+    try:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                page = await browser.new_page()
+                rows = await scrape_rotowire_slate(page, league, prop_type)
+                matchups = await scrape_all_matchup_odds(page, league)
+            finally:
+                await browser.close()
+    except Exception as e:
+        print(f"[DataGatherer] Rotowire enrichment failed ({e}).")
+        return [], []
+    print(f"[DataGatherer] Rotowire: {len(rows)} player lines, {len(matchups)} matchups.")
+    return rows, matchups
+
+def configured_sources() -> List[SourceSpec]:
+    """
+    (name, fetch, start_delay) for every enabled source, in preference order.
+    The Playwright scan launches a browser, so it only joins the race with GATHER_PLAYWRIGHT=1.
+    The snapshot is the bundled sample fixture, so it is a fallback rather than a racer.
+    """
+    sources: List[SourceSpec] = [('api', _api_source, 0.0)]
+    if os.environ.get('GATHER_PLAYWRIGHT', '0') == '1':
+        sources.append(('playwright', _playwright_source, 0.0))
+    sources.append(('snapshot', _snapshot_source, None))
+    return sources
+
+async def race_sources(league: str, prop_type: str,
+                       sources: Optional[List[SourceSpec]] = None,
+                       budget: Optional[float] = None,
+                       reserve: Optional[float] = None) -> Tuple[List[PropRecord], Optional[str], Optional[float]]:
     """
-    Fallback helper to load and parse a local sample JSON file.
+    Hedged fetch: return (props, source_name, as_of) from the first source that yields props.
+
+    Each source starts after its `start_delay`, or as soon as every source listed before it
+    has failed or come back empty. When a source wins, the others are cancelled.
+
+    A source with start_delay None is a fallback (the local snapshot): it starts only once
+    every other source has finished without props, or `reserve` seconds before the budget
+    runs out, and its props are only used if no other source delivers within the budget.
+    After `budget` seconds everything still running is cancelled and the fallback's props,
+    or ([], None, None), are returned.
     """
-    print(f"[DataGatherer] Loading local sample data...")
+    sources = configured_sources() if sources is None else sources
+    budget = GATHER_BUDGET if budget is None else budget
+    reserve = SNAPSHOT_RESERVE if reserve is None else reserve
+    loop = asyncio.get_running_loop()
+    started_at = loop.time()
+    deadline = started_at + budget
+    fallback_delay = max(0.0, budget - reserve)
+
+    def delay_of(i: int) -> float:
+        delay = sources[i][2]
+        return fallback_delay if delay is None else delay
+
+    def is_fallback(i: int) -> bool:
+        return sources[i][2] is None
+
+    pending: Dict[asyncio.Task, int] = {}
+    started = [False] * len(sources)
+    finished = [False] * len(sources)
+    held: Optional[Tuple[List[PropRecord], str, Optional[float]]] = None
+
+    def start_due():
+        elapsed = loop.time() - started_at
+        for i, (name, fetch, _) in enumerate(sources):
+            if started[i]:
+                continue
+            if is_fallback(i):
+                due = all(finished[j] for j in range(len(sources)) if not is_fallback(j))
+            else:
+                due = all(finished[:i])
+            if due or delay_of(i) <= elapsed:
+                started[i] = True
+                pending[asyncio.ensure_future(fetch(league, prop_type))] = i
+
+    def live_pending() -> bool:
+        return any(not is_fallback(i) for i in pending.values())
+
     try:
-        # Build a path from this file to the sample file
-        base_dir = os.path.dirname(os.path.abspath(__file__))
-        sample_path = os.path.join(base_dir, '..', 'tests', 'samples', 'dk_sample.json')
+        while True:
+            start_due()
+            if held is not None and not live_pending():
+                break
+            if not pending:
+                break
+            now = loop.time()
+            waits = [deadline - now]
+            waits += [started_at + delay_of(i) - now for i in range(len(sources)) if not started[i]]
+            timeout = max(0.0, min(waits))
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = pending.pop(task)
+                finished[i] = True
+                name = sources[i][0]
+                if task.exception() is not None:
+                    print(f"[DataGatherer] Source {name} failed ({task.exception()}).")
+                    continue
+                props, as_of = task.result()
+                if props and is_fallback(i):
+                    # a live result that still arrives within the budget is preferred
+                    held = (props, name, as_of)
+                elif props:
+                    print(f"[DataGatherer] Source {name} won after {loop.time() - started_at:.2f}s.")
+                    return props, name, as_of
+                else:
+                    print(f"[DataGatherer] Source {name} returned no props.")
+            if loop.time() >= deadline:
+                if held is None:
+                    print(f"[DataGatherer] No source returned props within {budget:.0f}s.")
+                break
+        if held is not None:
+            print(f"[DataGatherer] Falling back to {held[1]} after {loop.time() - started_at:.2f}s.")
+            return held
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    return [], None, None
 
-        with open(sample_path, 'r') as f:
-            payload = json.load(f)
+async def gather_data_stream(league: str, prop_type: str) -> AsyncIterator[List[PropRecord]]:
+    """
+    Async counterpart of `gather_data`: yields batches of props (one per DraftKings
+    subcategory) as they arrive, so callers can start on the first batch while the rest
+    of the scan is still in flight. Falls back to local sample data as one batch when
+    the API yields nothing.
+    """
+    print(f"[DataGatherer] Streaming props for {league} / {prop_type}...")
+    total = 0
+    try:
+        async for batch in iter_props_from_api_async(league, prop_type):
+            total += len(batch)
+            yield batch
+    except Exception as e:
+        print(f"[DataGatherer] Async API failed ({e}).")
+
+    if total:
+        print(f"[DataGatherer] Streamed {total} props from API.")
+        return
+
+    print(f"[DataGatherer] API returned no props, falling back to sample data...")
+    sample_props = _load_sample_data(league, prop_type)
+    if sample_props:
+        yield sample_props
+    else:
+        print(f"[DataGatherer] Could not find any props for {league} / {prop_type}.")
 
-        # Parse the sample data
-        props_list = parse_dk_json_payload(payload, league, prop_type)
-        print(f"[DataGatherer] Parsed {len(props_list)} props from sample file.")
-        return props_list
+def _load_sample_data(league: str, prop_type: str) -> List[PropRecord]:
+    """
+    Fallback helper to load the local sample props. Set SAMPLE_DATA_DIR to serve every
+    *.json payload in a fixture directory instead of the bundled sample file.
+    Files are parsed once and memoized until they change on disk (see Utilis.fixtures).
+    """
+    try:
+        sample_dir = os.environ.get('SAMPLE_DATA_DIR')
+        if sample_dir:
+            return load_fixture_dir(sample_dir, league, prop_type)
+        return load_fixture_props(SAMPLE_PATH, league, prop_type)
     except Exception as e:
         print(f"[DataGatherer] Error loading sample data: {e}")
         return []
-
@@ -1,17 +1,22 @@
 # Predictor agent
+from typing import List, Sequence
+
+import numpy as np
+
 from cfb_prop_predictor.types import AnalysisOutput, PredictionOutput
+from Utilis.odds_math import american_array, remove_vig
+from Utilis.projection import choose_sides, simulate_props
 
-def predict(analysis: AnalysisOutput) -> PredictionOutput:
-    """Generates a final prediction based on the analysis."""
-    print("[Predictor] Generating prediction...")
 
+def _heuristic(analysis: AnalysisOutput) -> PredictionOutput:
+    """Line-based placeholder for props with no game logs to simulate from."""
     prop_line = analysis.key_metrics.get('prop_line', 0.0)
-    
-    # NOTE: This is a placeholder until real projections are implemented
+
+    # NOTE: Placeholder when there are no game logs for the player
     projected_value = float(prop_line) * 1.05  # Simple projection: 5% over the line
-    
+
     edge = projected_value - float(prop_line)
-    
+
     # Determine confidence
     confidence = 65
     if "strong defense" in " ".join(analysis.risk_factors):
@@ -32,3 +37,77 @@ def predict(analysis: AnalysisOutput) -> PredictionOutput:
         confidence=int(confidence)
     )
 
+
+def _from_simulation(analysis: AnalysisOutput, sim, sides, fair, i: int) -> PredictionOutput:
+    metrics = analysis.key_metrics
+    prop_line = float(metrics['prop_line'])
+    projected_value = float(metrics['last_n_mean'])  # Recent form from the game-log store
+    p_over, p_under = float(sim['p_over'][i]), float(sim['p_under'][i])
+    is_over, p_side, ev = bool(sides[0][i]), float(sides[1][i]), float(sides[2][i])
+    side = "over" if is_over else "under"
+    ev = None if np.isnan(ev) else ev  # No prices: the likelier side was taken
+
+    confidence = round(100 * p_side)
+    if "strong defense" in " ".join(analysis.risk_factors):
+        confidence -= 15
+    market_p = float((fair[0] if is_over else fair[1])[i])
+    recommendation = side
+    if confidence < 50 or (ev is not None and ev <= 0):
+        recommendation = "avoid"
+
+    return PredictionOutput(
+        recommended_bet=recommendation,
+        projected_value=round(projected_value, 2),
+        edge=round(projected_value - prop_line, 2),
+        confidence=int(max(0, min(100, confidence))),
+        over_probability=round(p_over, 4),
+        under_probability=round(p_under, 4),
+        expected_value=None if ev is None else round(ev, 4),
+        interval=(round(float(sim['ci_low'][i]), 2), round(float(sim['ci_high'][i]), 2)),
+        market_probability=None if np.isnan(market_p) else round(market_p, 4),
+        probability_edge=None if np.isnan(market_p) else round(p_side - market_p, 4),
+    )
+
+
+def _predict_all(analyses: Sequence[AnalysisOutput]) -> List[PredictionOutput]:
+    simulated = [i for i, a in enumerate(analyses)
+                 if a.key_metrics.get('last_n_mean') is not None and a.key_metrics.get('prop_line') is not None]
+    results: List[PredictionOutput] = [None] * len(analyses)
+    if simulated:
+        metrics = [analyses[i].key_metrics for i in simulated]
+        over_odds = american_array([m.get('over_odds') for m in metrics])
+        under_odds = american_array([m.get('under_odds') for m in metrics])
+        sim = simulate_props(
+            means=[m['last_n_mean'] for m in metrics],
+            stds=[np.nan if m.get('last_n_std') is None else m['last_n_std'] for m in metrics],
+            lines=[m['prop_line'] for m in metrics],
+            over_odds=over_odds,
+            under_odds=under_odds,
+        )
+        sides = choose_sides(sim['p_over'], sim['p_under'], sim['ev_over'], sim['ev_under'])
+        fair = remove_vig(over_odds, under_odds)
+        for j, i in enumerate(simulated):
+            results[i] = _from_simulation(analyses[i], sim, sides, fair, j)
+    for i, analysis in enumerate(analyses):
+        if results[i] is None:
+            results[i] = _heuristic(analysis)
+    return results
+
+
+def predict_batch(analyses: Sequence[AnalysisOutput]) -> List[PredictionOutput]:
+    """Predictions for a whole slate. Props with rolling features are simulated together in
+    one Monte Carlo pass (`Utilis.projection.simulate_props`); the rest use the heuristic."""
+    print(f"[Predictor] Generating predictions for {len(analyses)} props...")
+    return _predict_all(analyses)
+
+
+def predict(analysis: AnalysisOutput) -> PredictionOutput:
+    """Generates a final prediction based on the analysis."""
+    print("[Predictor] Generating prediction...")
+    return _predict_all([analysis])[0]
+
+
+def rank_by_edge(predictions: Sequence[PredictionOutput]) -> List[int]:
+    """Indices of `predictions`, largest model-vs-market probability edge first (unpriced last)."""
+    edges = np.array([np.nan if p.probability_edge is None else p.probability_edge for p in predictions], dtype=float)
+    return np.argsort(np.where(np.isnan(edges), np.inf, -edges), kind='stable').tolist()
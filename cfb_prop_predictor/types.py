@@ -1,5 +1,7 @@
-from typing import Any, Dict, Optional, List
-from pydantic import BaseModel
+import sys
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, List, Tuple, Union
+from pydantic import BaseModel, ConfigDict
 
 
 class OddsData(BaseModel):
@@ -16,7 +18,94 @@ class MatchupOdds(BaseModel):
     total: Dict[str, Any]
 
 
+class PropRecord(Mapping):
+    """Compact, read-only record for a single scraped prop.
+
+    Scrapers emit one of these per prop instead of a plain dict. Values live in
+    ``__slots__`` (no per-instance ``__dict__``) and the low-cardinality string
+    fields (league, market, teams) are interned so every prop for the same
+    slate shares one string object.
+
+    The record behaves like a ``Mapping`` so existing callers that do
+    ``prop.get('team_abbrev', ...)`` or ``prop['name']`` keep working. Fields
+    that the scraper did not provide are left unset and are reported as
+    missing keys, exactly like the dicts they replace.
+    """
+
+    __slots__ = (
+        "name",
+        "position",
+        "team_name",
+        "team_abbrev",
+        "opponent_name",
+        "opponent_abbrev",
+        "start_time",
+        "league",
+        "market_name",
+        "prop_line",
+        "over_odds",
+        "under_odds",
+        # Filled by Utilis.slate_merge when Rotowire / matchup data is joined in
+        "rotowire_line",
+        "team_spread",
+        "team_moneyline",
+        "game_total",
+    )
+
+    _FIELDS = frozenset(__slots__)
+    _INTERNED = frozenset((
+        "position", "team_name", "team_abbrev", "opponent_name",
+        "opponent_abbrev", "league", "market_name",
+    ))
+
+    def __init__(self, **fields: Any):
+        for key, value in fields.items():
+            if key in self._INTERNED and type(value) is str:
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._FIELDS:
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.__slots__:
+            if hasattr(self, key):
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("PropRecord is read-only")
+
+    def __reduce__(self):
+        return (_prop_record_from_dict, (self.to_dict(),))
+
+    def __repr__(self) -> str:
+        return f"PropRecord({self.to_dict()!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {key: getattr(self, key) for key in self}
+
+    def replace(self, **changes: Any) -> "PropRecord":
+        """A copy with `changes` applied; fields set to None are still present."""
+        return PropRecord(**{**self.to_dict(), **changes})
+
+
+def _prop_record_from_dict(fields: Dict[str, Any]) -> PropRecord:
+    return PropRecord(**fields)
+
+
 class GatheredData(BaseModel):
+    # `all_props` holds PropRecord instances; allow them through without
+    # Pydantic coercing each Mapping back into a plain dict.
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     odds_data: Optional[OddsData]
     # Historically this repo used plain dicts for player/team stats, but
     # agent code expects attribute access (e.g., `.name` or `.defensive_rank`).
@@ -25,7 +114,11 @@ class GatheredData(BaseModel):
     player_stats: Optional[Any]
     team_stats: Optional[Any]
     # When running the scanner workflow, gather_data will populate `all_props`.
-    all_props: Optional[List[Dict[str, Any]]] = None
+    all_props: Optional[List[Union[PropRecord, Dict[str, Any]]]] = None
+    # Which source won the gather race ('api', 'playwright', 'snapshot') and the
+    # epoch time its data reflects (fetch time for live sources, file mtime for snapshots).
+    source: Optional[str] = None
+    data_as_of: Optional[float] = None
 
 
 class AnalysisOutput(BaseModel):
@@ -39,3 +132,10 @@ class PredictionOutput(BaseModel):
     projected_value: float
     edge: float
     confidence: int
+    # Filled in when the prop was simulated (see Utilis.projection)
+    over_probability: Optional[float] = None
+    under_probability: Optional[float] = None
+    expected_value: Optional[float] = None
+    interval: Optional[Tuple[float, float]] = None
+    market_probability: Optional[float] = None  # no-vig probability of the recommended side
+    probability_edge: Optional[float] = None    # model minus market probability
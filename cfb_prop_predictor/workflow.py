@@ -1,19 +1,24 @@
 # cfb_prop_predictor/workflow.py
-from typing import Dict, Any
+import asyncio
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional
+
+from Utilis.feature_store import get_default_store, stat_for_prop_type
+from Utilis.odds_math import parse_american
 
 # Try package-style imports; fall back to top-level module imports when running
 # from the repository root where the package context may not be set.
 try:
-    from cfb_prop_predictor.agents.data_gatherer import gather_data
+    from cfb_prop_predictor.agents.data_gatherer import gather_data, gather_data_stream
     from cfb_prop_predictor.agents.analyzer import analyze as analyze_fn
-    from cfb_prop_predictor.agents.predictor import predict as predict_fn
-    from cfb_prop_predictor.types import GatheredData, AnalysisOutput, PredictionOutput
+    from cfb_prop_predictor.agents.predictor import predict_batch as predict_batch_fn
+    from cfb_prop_predictor.types import GatheredData, AnalysisOutput, PredictionOutput, OddsData
 except Exception:
     # Fallback to top-level imports when running from repo root
-    from agents.data_gatherer import gather_data  # type: ignore
+    from agents.data_gatherer import gather_data, gather_data_stream  # type: ignore
     from agents.analyzer import analyze as analyze_fn  # type: ignore
-    from agents.predictor import predict as predict_fn  # type: ignore
-    from cfb_prop_predictor.types import GatheredData, AnalysisOutput, PredictionOutput
+    from agents.predictor import predict_batch as predict_batch_fn  # type: ignore
+    from cfb_prop_predictor.types import GatheredData, AnalysisOutput, PredictionOutput, OddsData
 
 def run_workflow(league: str, prop_type: str) -> Dict[str, Any]:
     """
@@ -52,3 +57,90 @@ def run_workflow(league: str, prop_type: str) -> Dict[str, Any]:
 def run_workflow_sync(league: str, prop_type: str) -> Dict[str, Any]:
     """Synchronous wrapper for the workflow."""
     return run_workflow(league, prop_type)
+
+
+def _batch_features(batch: List[Mapping[str, Any]], prop_type: str) -> List[Optional[Dict[str, Any]]]:
+    """Rolling features for a whole batch from the game-log store in one bulk read
+    ({} for players with no history, so the analyzer doesn't look them up again)."""
+    store = get_default_store()
+    if store is None:
+        return [None] * len(batch)
+    feats = store.bulk_features([p.get('name') or '' for p in batch], stat_for_prop_type(prop_type))
+    out = []
+    for i in range(len(batch)):
+        if not feats['last_n_games'][i]:
+            out.append({})
+        else:
+            out.append({k: v[i].item() for k, v in feats.items()})
+    return out
+
+
+def _prop_analysis(prop: Mapping[str, Any], prop_type: str, features: Optional[Dict[str, Any]] = None) -> AnalysisOutput:
+    """Run the single-player analyzer on one scanned prop."""
+    try:
+        odds = OddsData(
+            prop_line=float(prop.get('prop_line')),
+            over_odds=parse_american(prop.get('over_odds')),
+            under_odds=parse_american(prop.get('under_odds')),
+        )
+    except (TypeError, ValueError):
+        odds = None
+    gathered = GatheredData(
+        odds_data=odds,
+        player_stats=SimpleNamespace(name=prop.get('name'), features=features),
+        team_stats=None,
+    )
+    return analyze_fn(gathered, prop_type)
+
+
+def _analyze_batch(batch: List[Mapping[str, Any]], prop_type: str) -> List[Dict[str, Any]]:
+    """Analyze a batch of props, then predict them together (one simulation for the batch)."""
+    analyses = [_prop_analysis(prop, prop_type, features)
+                for prop, features in zip(batch, _batch_features(batch, prop_type))]
+    predictions = predict_batch_fn(analyses)
+    return [
+        {"prop": prop, "analysis": analysis.model_dump(), "prediction": prediction.model_dump()}
+        for prop, analysis, prediction in zip(batch, analyses, predictions)
+    ]
+
+
+async def iter_workflow(league: str, prop_type: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async, streaming version of the workflow.
+
+    Props are analyzed and predicted as soon as their DraftKings subcategory arrives, and
+    one dict per prop (`prop`, `analysis`, `prediction`) is yielded right away, so the
+    first rows are available after the first subcategory instead of after the whole scan.
+    """
+    print(f"[Workflow] Streaming workflow for {league} / {prop_type}")
+    async for batch in gather_data_stream(league=league, prop_type=prop_type):
+        for item in _analyze_batch(batch, prop_type):
+            yield item
+        # let the remaining subcategory requests make progress between batches
+        await asyncio.sleep(0)
+
+
+async def run_workflow_async(league: str, prop_type: str) -> Dict[str, Any]:
+    """
+    Drains `iter_workflow` into the same shape `run_workflow` returns, plus
+    `prop_results` with the per-prop analysis and prediction.
+    """
+    all_props = []
+    prop_results = []
+    async for item in iter_workflow(league, prop_type):
+        all_props.append(item["prop"])
+        prop_results.append({"analysis": item["analysis"], "prediction": item["prediction"]})
+
+    gathered_data = GatheredData(odds_data=None, player_stats=None, team_stats=None, all_props=all_props)
+    analysis = AnalysisOutput(
+        summary=f"Data gathered for {league}. Per-prop analysis is under prop_results.",
+        key_metrics={},
+        risk_factors=[],
+    )
+    prediction = PredictionOutput(recommended_bet="N/A", projected_value=0.0, edge=0.0, confidence=0)
+    return {
+        "gathered_data": gathered_data.model_dump(),
+        "analysis": analysis.model_dump(),
+        "prediction": prediction.model_dump(),
+        "prop_results": prop_results,
+    }
@@ -2,13 +2,61 @@
 
 This implementation accepts dicts, types.SimpleNamespace, or the "SimpleNamespace(...)" style
 string that older code sometimes produced. It prefers structured fields when present.
+
+`_rows_from_gathered` returns a list of row dicts; `_frame_from_gathered` builds the same
+table as a pandas DataFrame in column-wise passes and can be handed straight to `st.dataframe`.
 """
 
 import re
 import datetime
+import functools
 from types import SimpleNamespace
 from typing import Any, Dict, List
 
+import numpy as np
+import pandas as pd
+
+from cfb_prop_predictor.types import PropRecord
+from Utilis.hit_rate import format_hit_rate, get_default_cache
+from Utilis.odds_math import american_array, implied_probability, remove_vig
+
+ROW_COLUMNS = [
+    'player', 'position', 'team', 'opponent', 'datetime', 'market',
+    'prediction_score', 'rotowire', 'hit_rate', 'league',
+]
+
+
+# Tokenizer for "SimpleNamespace(key=value, ...)" strings: find every `key=` and read the
+# value up to the next ',' or ')'. Keys are scanned independently of values, so a key that
+# appears inside another value (e.g. `odds_data=OddsData(prop_line=3.5)`) is still found.
+_NS_KEY_RE = re.compile(r"\b(\w+)=")
+_NS_VALUE_RE = re.compile(r"[^,\)]+")
+
+_NAMESPACE_FIELDS = ("name", "position", "team_name", "team_abbrev", "league", "opponent_name", "opponent_abbrev", "start_time")
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_namespace_pairs(ns_string: str) -> Dict[str, str]:
+    """Parse all key=value pairs from a SimpleNamespace(...) style string in one pass.
+
+    The first occurrence of each key wins. Results are cached by input string, so replays of
+    archived results that repeat the same strings only tokenize each one once. The returned
+    dict is shared by the cache; callers must not mutate it.
+    """
+    pairs: Dict[str, str] = {}
+    for m in _NS_KEY_RE.finditer(ns_string):
+        key = m.group(1)
+        if key in pairs:
+            continue
+        v = _NS_VALUE_RE.match(ns_string, m.end())
+        if not v:
+            continue
+        val = v.group(0).strip()
+        if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
+            val = val[1:-1]
+        pairs[key] = val
+    return pairs
+
 
 def _parse_namespace_str(ns_string: str, key: str):
     """Parse key=value like patterns from a SimpleNamespace(...) style string.
@@ -18,16 +66,7 @@ def _parse_namespace_str(ns_string: str, key: str):
     """
     if not ns_string or not isinstance(ns_string, str):
         return None
-    try:
-        m = re.search(rf"\b{re.escape(key)}=([^,\)]+)", ns_string)
-        if not m:
-            return None
-        val = m.group(1).strip()
-        if (val.startswith('"') and val.endswith('"')) or (val.startswith("'") and val.endswith("'")):
-            val = val[1:-1]
-        return val
-    except Exception:
-        return None
+    return _parse_namespace_pairs(ns_string).get(key)
 
 
 def _format_market_name(analysis_summary: Any):
@@ -62,6 +101,60 @@ def _format_datetime_human(dt_str: str):
         return dt_str
 
 
+def _format_datetime_column(values: pd.Series) -> pd.Series:
+    """Vectorized `_format_datetime_human` over a column of ISO strings.
+
+    A slate only has a handful of kickoff times, so the column is factorized first and
+    the distinct values are parsed with one `pd.to_datetime` call, then broadcast back.
+    Values mixing timezone offsets can't share a dtype; those fall back to the per-value
+    formatter.
+    """
+    present = _truthy(values)
+    codes, uniques = pd.factorize(values.where(present))
+    uniques = pd.Series(uniques, dtype=object)
+    try:
+        parsed = pd.to_datetime(uniques, errors='coerce', format='ISO8601')
+        formatted = parsed.dt.strftime("%a %m/%d %I:%M %p").astype(object)
+        # Unparseable values are shown as-is, like `_format_datetime_human`
+        formatted = formatted.where(parsed.notna(), uniques)
+    except (ValueError, TypeError):
+        formatted = uniques.map(_format_datetime_human).astype(object)
+    # Missing values factorize to code -1, which indexes the trailing 'N/A'
+    lookup = np.append(formatted.to_numpy(dtype=object), 'N/A')
+    return pd.Series(lookup.take(codes), index=values.index, dtype=object)
+
+
+def _truthy(values: pd.Series) -> pd.Series:
+    """Column-wise equivalent of `bool(v)` for scalar prop fields (missing counts as falsy)."""
+    return values.notna() & ~values.isin([0, '', False])
+
+
+_PROP_KEYS = (
+    'name', 'position', 'team_name', 'team_abbrev', 'opponent_name', 'opponent_abbrev',
+    'start_time', 'league', 'market_name', 'prop_line', 'prop_value', 'odds_data',
+    'rotowire_line', 'over_odds', 'under_odds',
+)
+
+
+def _columns_from_props(props_list: list, keys) -> pd.DataFrame:
+    """Pull `keys` out of a list of prop dicts/PropRecords into an object-dtype frame.
+
+    PropRecord fields are slots, so plain `getattr` reads them without going through the
+    Mapping protocol; missing fields come back as None.
+    """
+    if all(type(p) is PropRecord for p in props_list):
+        columns = {k: [getattr(p, k, None) for p in props_list] for k in keys}
+    else:
+        columns = {k: [p.get(k) for p in props_list] for k in keys}
+    return pd.DataFrame(columns, dtype=object)
+
+
+def _props_from_gathered(gathered_data) -> list:
+    if isinstance(gathered_data, dict):
+        return gathered_data.get('all_props', []) or []
+    return getattr(gathered_data, 'all_props', []) or []
+
+
 def _normalize(obj: Any):
     """Return a dict-like view for dict, SimpleNamespace or string namespace."""
     if obj is None:
@@ -72,12 +165,8 @@ def _normalize(obj: Any):
         return vars(obj)
     if isinstance(obj, str):
         # crude parse of a SimpleNamespace(...) textual repr
-        out = {}
-        for k in ("name", "position", "team_name", "team_abbrev", "league", "opponent_name", "opponent_abbrev", "start_time"):
-            v = _parse_namespace_str(obj, k)
-            if v is not None:
-                out[k] = v
-        return out
+        pairs = _parse_namespace_pairs(obj)
+        return {k: pairs[k] for k in _NAMESPACE_FIELDS if k in pairs}
     # fallback: try mapping attributes
     try:
         return {k: getattr(obj, k) for k in dir(obj) if not k.startswith("__")}
@@ -85,6 +174,21 @@ def _normalize(obj: Any):
         return {}
 
 
+def _hit_rate_labels(players, markets, lines):
+    """Hit-rate labels from the local game logs (PLAYER_GAME_LOGS), or None without them."""
+    cache = get_default_cache()
+    if cache is None:
+        return None
+    return cache.column(players, markets, lines)
+
+
+def _market_over_probability(over_odds: pd.Series, under_odds: pd.Series) -> np.ndarray:
+    """No-vig probability of the over; the raw implied probability when the under isn't priced."""
+    over = american_array(over_odds.tolist())
+    fair_over, _, _ = remove_vig(over, american_array(under_odds.tolist()))
+    return np.where(np.isnan(fair_over), implied_probability(over), fair_over)
+
+
 def _rows_from_gathered(gathered_data, request=None, result=None):
     """
     Maps the 'result' object to a list of table rows.
@@ -96,12 +200,10 @@ def _rows_from_gathered(gathered_data, request=None, result=None):
         return []
 
     # Get the list of props from the new key
-    if isinstance(gathered_data, dict):
-        props_list = gathered_data.get('all_props', [])
-    else:
-        props_list = getattr(gathered_data, 'all_props', []) or []
-    
+    props_list = _props_from_gathered(gathered_data)
+
     mapped_rows = []
+    hit_rate_inputs = []
     
     # Loop over each prop and build a row
     for prop in props_list:
@@ -121,6 +223,7 @@ def _rows_from_gathered(gathered_data, request=None, result=None):
             market_with_line = f"{market} ({prop_line})" if prop_line != 'N/A' else market
 
             league = prop.get('league', 'N/A')
+            rotowire_line = prop.get('rotowire_line')
             
             row = {
                 'player': player_name,
@@ -130,18 +233,85 @@ def _rows_from_gathered(gathered_data, request=None, result=None):
                 'datetime': start_time_str,
                 'market': market_with_line,
                 'prediction_score': 0, # Prediction is bypassed for scanner
-                'rotowire': 'N/A',
+                'rotowire': rotowire_line if rotowire_line is not None else 'N/A',
                 'hit_rate': 'N/A',
                 'league': league
             }
             mapped_rows.append(row)
+            hit_rate_inputs.append((player_name, market, prop_line))
         
         except Exception as e:
             print(f"Error mapping prop to row: {e}")
             continue
+
+    if mapped_rows:
+        labels = _hit_rate_labels(*zip(*hit_rate_inputs))
+        if labels is not None:
+            for row, label in zip(mapped_rows, labels):
+                row['hit_rate'] = label
             
     return mapped_rows
 
 
+def _frame_from_gathered(gathered_data, request=None, result=None, with_line: bool = False) -> pd.DataFrame:
+    """
+    DataFrame version of `_rows_from_gathered`.
+
+    Builds one column per field instead of one dict per prop: timestamps are parsed in a
+    single `pd.to_datetime` pass over the distinct kickoff times and the market label is assembled with vectorized string
+    concatenation. Missing and None fields are treated alike (both fall back to 'N/A' or
+    to the team/opponent name).
+
+    With `with_line=True` numeric 'line' and 'edge' columns (NaN when unknown) are appended
+    for range filtering and sorting; 'edge' is the hit rate minus the market's no-vig over
+    probability.
+    """
+    columns = ROW_COLUMNS + ['line', 'edge'] if with_line else ROW_COLUMNS
+    if not result:
+        return pd.DataFrame(columns=columns)
+
+    props_list = _props_from_gathered(gathered_data)
+    if not props_list:
+        return pd.DataFrame(columns=columns)
+
+    props = _columns_from_props(props_list, _PROP_KEYS)
+
+    prop_line = props['prop_line']
+    prop_line = prop_line.where(_truthy(prop_line), props['prop_value'])
+    if props['odds_data'].notna().any():
+        odds_line = props['odds_data'].map(lambda o: getattr(o, 'prop_line', None))
+        prop_line = prop_line.where(_truthy(prop_line), odds_line)
+    has_line = _truthy(prop_line)
+
+    market = props['market_name'].fillna('N/A').astype(str)
+    market = market.where(~has_line, market + ' (' + prop_line.astype(str) + ')')
+
+    frame = pd.DataFrame({
+        'player': props['name'].fillna('N/A'),
+        'position': props['position'].fillna('N/A'),
+        'team': props['team_abbrev'].fillna(props['team_name']).fillna('N/A'),
+        'opponent': props['opponent_abbrev'].fillna(props['opponent_name']).fillna('N/A'),
+        'datetime': _format_datetime_column(props['start_time']),
+        'market': market,
+        'prediction_score': 0,  # Prediction is bypassed for scanner
+        'rotowire': props['rotowire_line'].fillna('N/A'),
+        'hit_rate': 'N/A',
+        'league': props['league'].fillna('N/A'),
+    }, columns=ROW_COLUMNS)
+    cache = get_default_cache()
+    hit_probability = np.full(len(frame), np.nan)
+    if cache is not None:
+        hits, games = cache.counts(frame['player'].tolist(), props['market_name'].tolist(),
+                                   prop_line.where(has_line).tolist())
+        frame['hit_rate'] = [format_hit_rate(h, g) for h, g in zip(hits.tolist(), games.tolist())]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            hit_probability = np.where(games > 0, hits / games, np.nan)
+    if with_line:
+        frame['line'] = pd.to_numeric(prop_line.where(has_line), errors='coerce').astype(float)
+        # Recent hit rate minus the market's no-vig over probability: > 0 leans over, < 0 under
+        frame['edge'] = hit_probability - _market_over_probability(props['over_odds'], props['under_odds'])
+    return frame
+
+
 if __name__ == '__main__':
     print('mapper module ok')
@@ -0,0 +1,64 @@
+"""Background warm-up of the dashboard's result cache.
+
+Without this, the first user to pick a league/prop combination waits for a full
+`run_workflow`. `PrefetchWorker` runs on a daemon thread next to the app and keeps
+every combination in the shared `ResultCache` warm. Each combination is refreshed at
+most once per `interval`. The age check reads the shared store, so this holds across
+sessions and server processes.
+"""
+
+import threading
+from typing import Any, Callable, Mapping, Optional
+
+from dashboard.result_cache import ResultCache
+
+DEFAULT_INTERVAL = 480  # seconds; refresh a bit ahead of the 10-minute staleness TTL
+DEFAULT_POLL = 30  # how often the worker wakes up to look for due combinations
+
+
+class PrefetchWorker:
+    """Periodically refreshes every job in `jobs` (cache key -> refresh callable).
+
+    Jobs run one after another on a single thread, so at most one prefetch scrape is
+    in flight per worker.
+    """
+
+    def __init__(self, cache: ResultCache, jobs: Mapping[str, Callable[[], Any]],
+                 interval: float = DEFAULT_INTERVAL, poll: float = DEFAULT_POLL):
+        self.cache = cache
+        self.jobs = dict(jobs)
+        self.interval = interval
+        self.poll = min(poll, interval)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """Refresh every due job once; returns how many were refreshed."""
+        refreshed = 0
+        for key, refresh_fn in self.jobs.items():
+            if self._stop.is_set():
+                break
+            if self.cache.refresh_if_older_than(key, refresh_fn, max_age=self.interval):
+                print(f"[Prefetch] Refreshed {key}.")
+                refreshed += 1
+        return refreshed
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"[Prefetch] Warm-up pass failed: {e}")
+            self._stop.wait(self.poll)
+
+    def start(self) -> "PrefetchWorker":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dashboard-prefetch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
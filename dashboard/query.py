@@ -0,0 +1,96 @@
+"""Query layer over mapped scan results.
+
+Full NFL+CFB slates are too large to ship to the browser on every rerun, so the
+dashboard filters, sorts and paginates the mapped DataFrame on the server and
+only renders one page. `raw_preview` does the same for the raw JSON view.
+"""
+
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_RAW_PROPS = 25
+
+
+def _contains(column: pd.Series, needle: str) -> pd.Series:
+    return column.astype(str).str.contains(needle, case=False, regex=False, na=False)
+
+
+def filter_props(frame: pd.DataFrame, team: Optional[str] = None, player: Optional[str] = None,
+                 market: Optional[str] = None, line_min: Optional[float] = None,
+                 line_max: Optional[float] = None) -> pd.DataFrame:
+    """Return the rows matching every given filter.
+
+    Text filters are case-insensitive substring matches; `team` matches either side of
+    the game. The line range needs the numeric 'line' column from
+    `_frame_from_gathered(..., with_line=True)`; rows without a line never match a range.
+    """
+    mask = pd.Series(True, index=frame.index)
+    if team:
+        mask &= _contains(frame['team'], team) | _contains(frame['opponent'], team)
+    if player:
+        mask &= _contains(frame['player'], player)
+    if market:
+        mask &= _contains(frame['market'], market)
+    if line_min is not None:
+        mask &= frame['line'] >= line_min
+    if line_max is not None:
+        mask &= frame['line'] <= line_max
+    if mask.all():
+        return frame
+    return frame[mask]
+
+
+def sort_props(frame: pd.DataFrame, sort_by: Optional[str] = None, ascending: bool = True) -> pd.DataFrame:
+    """Stable sort on one column; rows with missing values go last."""
+    if not sort_by or sort_by not in frame.columns:
+        return frame
+    return frame.sort_values(sort_by, ascending=ascending, kind='stable', na_position='last')
+
+
+def paginate(frame: pd.DataFrame, page: int = 1, page_size: int = DEFAULT_PAGE_SIZE) -> Tuple[pd.DataFrame, int, int]:
+    """Slice out one 1-based page; returns (rows, page, page_count) with `page` clamped."""
+    page_size = max(1, int(page_size))
+    page_count = max(1, math.ceil(len(frame) / page_size))
+    page = min(max(1, int(page)), page_count)
+    start = (page - 1) * page_size
+    return frame.iloc[start:start + page_size], page, page_count
+
+
+def query_props(frame: pd.DataFrame, team: Optional[str] = None, player: Optional[str] = None,
+                market: Optional[str] = None, line_min: Optional[float] = None,
+                line_max: Optional[float] = None, sort_by: Optional[str] = None,
+                ascending: bool = True, page: int = 1,
+                page_size: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+    """Filter, sort and paginate in one call.
+
+    Returns a dict with the page's `rows`, the number of `matches` across all pages,
+    and the (clamped) `page` and `page_count`.
+    """
+    matched = filter_props(frame, team=team, player=player, market=market,
+                           line_min=line_min, line_max=line_max)
+    ordered = sort_props(matched, sort_by=sort_by, ascending=ascending)
+    rows, page, page_count = paginate(ordered, page=page, page_size=page_size)
+    return {'rows': rows, 'matches': len(matched), 'page': page, 'page_count': page_count}
+
+
+def raw_preview(result: Dict[str, Any], max_props: int = DEFAULT_RAW_PROPS) -> Dict[str, Any]:
+    """Shallow copy of a workflow result with `gathered_data.all_props` cut to `max_props`.
+
+    The full prop count is reported under `all_props_total` so the view shows what was dropped.
+    """
+    gathered = result.get('gathered_data')
+    if not isinstance(gathered, dict):
+        return result
+    props = gathered.get('all_props') or []
+    if len(props) <= max_props:
+        return result
+    preview = dict(result)
+    preview['gathered_data'] = {
+        **gathered,
+        'all_props': props[:max_props],
+        'all_props_total': len(props),
+    }
+    return preview
@@ -0,0 +1,227 @@
+"""Shared on-disk result cache for the dashboard.
+
+`st.cache_data` keeps results inside one Streamlit server process: they vanish on
+restart and a miss blocks the rerun while the scrape runs. `ResultCache` stores
+workflow results in a SQLite file instead, so every session and every server
+process on the host shares one snapshot per key.
+
+- Fresh hit: returned straight from disk.
+- Stale hit: the old snapshot is returned immediately and a single background
+  refresh is started (stale-while-revalidate).
+- Miss: the caller waits, but concurrent misses for the same key are merged
+  into one refresh. Within a process this is a per-key future; across
+  processes a lease row in the database makes sure only one of them scrapes.
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import closing
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_TTL = 600  # seconds; matches the old st.cache_data(ttl=600)
+DEFAULT_LEASE_TIMEOUT = 300  # a refresh holding the lease longer than this is presumed dead
+
+
+def default_cache_path() -> str:
+    """`RESULT_CACHE_PATH` if set, else `.cache/results.sqlite` under the repo root."""
+    env_path = os.environ.get('RESULT_CACHE_PATH')
+    if env_path:
+        return env_path
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_dir, '.cache', 'results.sqlite')
+
+
+class ResultCache:
+    """SQLite-backed key/value cache with stale-while-revalidate and single-flight refresh."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 lease_timeout: float = DEFAULT_LEASE_TIMEOUT, poll_interval: float = 0.25):
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.lease_timeout = lease_timeout
+        self.poll_interval = poll_interval
+        self._owner = f"{os.getpid()}:{id(self)}"
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        # Last decoded value per key, so repeat reads of an unchanged snapshot skip unpickling
+        self._decoded: Dict[str, Tuple[Any, float]] = {}
+
+        cache_dir = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(cache_dir, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                " key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    # --- Storage ---
+
+    def get(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Return (value, updated_at) for `key`, or None if it was never stored.
+
+        Only the timestamp is read when this process already decoded that version of the
+        snapshot; the same value object is returned again in that case.
+        """
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT updated_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            decoded = self._decoded.get(key)
+            if decoded is not None and decoded[1] == row[0]:
+                return decoded
+            row = conn.execute("SELECT value, updated_at FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        entry = (pickle.loads(row[0]), row[1])
+        self._decoded[key] = entry
+        return entry
+
+    def set(self, key: str, value: Any) -> Tuple[Any, float]:
+        """Store `value` under `key`; returns the new (value, updated_at) entry."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        updated_at = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, updated_at) VALUES (?, ?, ?)",
+                (key, blob, updated_at),
+            )
+        entry = (value, updated_at)
+        self._decoded[key] = entry
+        return entry
+
+    def is_stale(self, updated_at: float) -> bool:
+        return time.time() - updated_at >= self.ttl
+
+    # --- Cross-process lease ---
+
+    def _acquire_lease(self, key: str) -> bool:
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("SELECT owner, expires_at FROM leases WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[0] != self._owner and row[1] > now:
+                    conn.execute("COMMIT")
+                    return False
+                conn.execute(
+                    "INSERT OR REPLACE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+                    (key, self._owner, now + self.lease_timeout),
+                )
+                conn.execute("COMMIT")
+                return True
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _release_lease(self, key: str) -> None:
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    # --- Refresh ---
+
+    def _run_refresh(self, key: str, refresh_fn: Callable[[], Any],
+                     wait_for_peer: bool) -> Optional[Tuple[Any, float]]:
+        """Refresh `key` unless another process already is; returns the new entry.
+
+        With `wait_for_peer`, block until the other process stores its result (or its
+        lease lapses, in which case this process takes over). Without it, return None
+        and let the peer's result land on its own.
+        """
+        started = time.time()
+        while True:
+            if self._acquire_lease(key):
+                try:
+                    return self.set(key, refresh_fn())
+                finally:
+                    self._release_lease(key)
+            if not wait_for_peer:
+                return None
+            time.sleep(self.poll_interval)
+            entry = self.get(key)
+            if entry is not None and entry[1] >= started:
+                return entry
+
+    def _single_flight(self, key: str, refresh_fn: Callable[[], Any], wait_for_peer: bool) -> Future:
+        """Start (or join) the in-process refresh for `key` and return its future."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._inflight[key] = future
+
+        try:
+            future.set_result(self._run_refresh(key, refresh_fn, wait_for_peer))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return future
+
+    def refresh_in_background(self, key: str, refresh_fn: Callable[[], Any]) -> None:
+        """Kick off a refresh for `key` on a daemon thread unless one is already running here."""
+        with self._lock:
+            if key in self._inflight:
+                return
+
+        def _worker():
+            future = self._single_flight(key, refresh_fn, wait_for_peer=False)
+            if future.exception() is not None:
+                print(f"[ResultCache] Background refresh for {key} failed: {future.exception()}")
+
+        threading.Thread(target=_worker, name=f"result-cache-refresh:{key}", daemon=True).start()
+
+    def refresh_if_older_than(self, key: str, refresh_fn: Callable[[], Any], max_age: float) -> bool:
+        """Synchronously refresh `key` if it is missing or older than `max_age` seconds.
+
+        Shares the single-flight and lease machinery with `get_or_refresh`, so it never runs
+        alongside another refresh of the same key. Returns True if this call refreshed it.
+        """
+        entry = self.get(key)
+        if entry is not None and time.time() - entry[1] < max_age:
+            return False
+        future = self._single_flight(key, refresh_fn, wait_for_peer=False)
+        if future.exception() is not None:
+            print(f"[ResultCache] Refresh for {key} failed: {future.exception()}")
+            return False
+        return future.result() is not None
+
+    def get_or_refresh_entry(self, key: str, refresh_fn: Callable[[], Any]) -> Tuple[Any, float]:
+        """Like `get_or_refresh`, but also returns when the snapshot was taken."""
+        entry = self.get(key)
+        if entry is not None:
+            if self.is_stale(entry[1]):
+                print(f"[ResultCache] Serving stale {key}; refreshing in background.")
+                self.refresh_in_background(key, refresh_fn)
+            return entry
+
+        print(f"[ResultCache] Cache miss for {key}.")
+        entry = self._single_flight(key, refresh_fn, wait_for_peer=True).result()
+        if entry is None:
+            # Joined a prefetch/background refresh that gave way to another process's lease;
+            # this caller needs a value, so wait for the peer's result (or take over)
+            entry = self.get(key) or self._run_refresh(key, refresh_fn, wait_for_peer=True)
+        return entry
+
+    def get_or_refresh(self, key: str, refresh_fn: Callable[[], Any]) -> Any:
+        """Return the cached value for `key`, refreshing it as needed.
+
+        A stale value is returned as-is while one background refresh runs. On a miss the
+        caller blocks on a refresh shared with every other caller waiting on the same key;
+        if that refresh raises, every waiter sees the exception and nothing is stored.
+        """
+        return self.get_or_refresh_entry(key, refresh_fn)[0]
@@ -1,6 +1,8 @@
 import streamlit as st
 import sys
 import os
+import json
+from collections.abc import Mapping
 from datetime import datetime
 
 # Adjust path to import from parent directory
@@ -8,7 +10,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
     from cfb_prop_predictor.workflow import run_workflow_sync
-    from dashboard.mapper import _rows_from_gathered
+    from dashboard.mapper import _frame_from_gathered
+    from dashboard.result_cache import ResultCache
+    from dashboard.prefetch import PrefetchWorker
+    from dashboard.query import DEFAULT_PAGE_SIZE, query_props, raw_preview
     # dashboard.renderer is optional — use mapper + native Streamlit if not present
 except ImportError:
     st.error("Failed to import workflow modules. Make sure you are in the correct environment.")
@@ -33,20 +38,70 @@ def _on_league_change():
     st.query_params["league"] = league
     # No rerun needed, Streamlit reruns on widget change
 
+def _json_default(obj):
+    """json.dumps fallback: PropRecords (and other mappings) render as objects."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return repr(obj)
+
 # --- Caching ---
-@st.cache_data(ttl=600) # Cache for 10 minutes
+LEAGUES = ("CFB", "NFL")
+PROP_TYPES = ("player_passing_yards", "player_rushing_yards", "player_receiving_yards")
+
+
+@st.cache_resource
+def _result_cache() -> ResultCache:
+    """One shared on-disk cache per server process (the file itself is shared by all)."""
+    return ResultCache(ttl=600)  # Snapshots go stale after 10 minutes
+
+
+def _cache_key(league: str, prop_type: str) -> str:
+    return f"{league}:{prop_type}"
+
+
+def _workflow_refresher(league: str, prop_type: str):
+    def _refresh():
+        print(f"Cache refresh. Running workflow for {league} / {prop_type}...")
+        return run_workflow_sync(league=league, prop_type=prop_type)
+    return _refresh
+
+
+@st.cache_resource
+def _start_prefetch():
+    """Start the warm-up worker once per server process (set DASHBOARD_PREFETCH=0 to disable)."""
+    if os.environ.get('DASHBOARD_PREFETCH', '1') not in ('1', 'true', 'True'):
+        return None
+    jobs = {
+        _cache_key(league, prop): _workflow_refresher(league, prop)
+        for league in LEAGUES
+        for prop in PROP_TYPES
+    }
+    return PrefetchWorker(_result_cache(), jobs).start()
+
+
 def load_market_data(league: str, prop_type: str):
     """
-    Cached function to run the workflow.
-    This runs automatically when the app loads or filters change.
+    Runs the workflow through the shared result cache.
+    This runs automatically when the app loads or filters change; stale snapshots are
+    served instantly while a single background refresh runs.
+
+    Returns (result, snapshot_time); snapshot_time is None for errors.
     """
-    print(f"Cache miss. Running workflow for {league} / {prop_type}...")
     try:
-        result = run_workflow_sync(league=league, prop_type=prop_type)
-        return result
+        return _result_cache().get_or_refresh_entry(_cache_key(league, prop_type), _workflow_refresher(league, prop_type))
     except Exception as e:
         print(f"Error running workflow: {e}")
-        return {"error": str(e)}
+        return {"error": str(e)}, None
+
+
+@st.cache_resource(max_entries=16)
+def _props_table(cache_key: str, snapshot_time: float, _result):
+    """Map a snapshot to a DataFrame once; reruns reuse it until the snapshot changes."""
+    gathered_data = _result.get("gathered_data", {})
+    return _frame_from_gathered(gathered_data, request=None, result=_result, with_line=True)
+
+
+_start_prefetch()
 
 # --- Sidebar ---
 with st.sidebar:
@@ -61,7 +116,7 @@ with st.sidebar:
     
     st.selectbox(
         "League",
-        ("CFB", "NFL"),
+        LEAGUES,
         key='league_filter',
         index=0 if default_league == "CFB" else 1,
         on_change=_on_league_change,
@@ -69,11 +124,22 @@ with st.sidebar:
     
     prop_type = st.selectbox(
         "Prop Type",
-        ("player_passing_yards", "player_rushing_yards", "player_receiving_yards"),
+        PROP_TYPES,
         key='prop_type_filter',
         index=0
     )
 
+    st.header("Table")
+    st.text_input("Team", key='team_query')
+    st.text_input("Player", key='player_query')
+    st.text_input("Market", key='market_query')
+    line_cols = st.columns(2)
+    line_cols[0].number_input("Min line", value=None, key='line_min')
+    line_cols[1].number_input("Max line", value=None, key='line_max')
+    st.selectbox("Sort by", ("player", "team", "datetime", "line", "edge"), key='sort_by')
+    st.checkbox("Descending", key='sort_desc')
+    st.selectbox("Rows per page", (25, DEFAULT_PAGE_SIZE, 100, 250), index=1, key='page_size')
+
 # --- Main Page ---
 st.title("🏈 CFB Prop Predictor")
 st.markdown("An AI-powered agent workflow to analyze and predict college/NFL player props.")
@@ -88,25 +154,50 @@ current_prop = st.session_state.get('prop_type_filter', 'player_passing_yards')
 # Automatically run the workflow.
 # Streamlit will use the cached result if filters haven't changed.
 with st.spinner(f"Scanning {current_league} {current_prop.split('_')[1]} props..."):
-    result = load_market_data(league=current_league, prop_type=current_prop)
+    result, snapshot_time = load_market_data(league=current_league, prop_type=current_prop)
 
 # --- Display Results ---
 if "error" in result:
     st.error(f"Failed to load data: {result['error']}")
 elif result:
-    gathered_data = result.get("gathered_data", {})
-    
-    # Map the list of props to table rows
-    rows = _rows_from_gathered(gathered_data, request=None, result=result)
+    # Map the list of props to a table once per snapshot, then only send one page of it
+    table = _props_table(_cache_key(current_league, current_prop), snapshot_time, result)
     
-    if not rows:
+    if table.empty:
         st.warning(f"No props found for {current_league} {current_prop.split('_')[1]}.")
     else:
-        st.success(f"Found {len(rows)} props.")
+        st.success(f"Found {len(table)} props.")
+        gathered = result.get('gathered_data') or {}
+        if gathered.get('source'):
+            as_of = gathered.get('data_as_of')
+            as_of_text = datetime.fromtimestamp(as_of).strftime('%b %d, %I:%M %p') if as_of else 'unknown'
+            st.caption(f"Source: {gathered['source']} · data as of {as_of_text}")
+
+        page = st.number_input("Page", min_value=1, value=1, step=1, key='page')
+        query = query_props(
+            table,
+            team=st.session_state.get('team_query'),
+            player=st.session_state.get('player_query'),
+            market=st.session_state.get('market_query'),
+            line_min=st.session_state.get('line_min'),
+            line_max=st.session_state.get('line_max'),
+            sort_by=st.session_state.get('sort_by'),
+            ascending=not st.session_state.get('sort_desc', False),
+            page=page,
+            page_size=st.session_state.get('page_size', DEFAULT_PAGE_SIZE),
+        )
+        rows = query['rows']
+        st.caption(f"{query['matches']} matching props · page {query['page']} of {query['page_count']}")
         
         # Build the table with configured columns
         column_config = {
             "player": st.column_config.TextColumn("Player"),
+            "line": st.column_config.NumberColumn("Line"),
+            "edge": st.column_config.NumberColumn(
+                "Edge",
+                format="%.2f",
+                help="Recent hit rate minus the no-vig market probability of the over.",
+            ),
             "prediction_score": st.column_config.ProgressColumn(
                 "Prediction",
                 format="%d%%",
@@ -124,9 +215,10 @@ elif result:
             hide_index=True
         )
 
-    # Show detailed data in an expander
+    # Show detailed data in an expander; only serialized on request, and truncated
     with st.expander("Show Detailed Data (Raw JSON)"):
-        st.json(result)
+        if st.checkbox("Load raw JSON", key='show_raw_json'):
+            st.json(json.dumps(raw_preview(result), default=_json_default))
 else:
     st.info("Workflow returned no result.")
 
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Backtest the predictor over archived prop snapshots against real game logs.
+
+Example:
+    python scripts/backtest_predictor.py snapshots.parquet game_logs/ --workers 4 \
+        --summary-out summary.csv --calibration-out calibration.csv
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.backtest import BACKTEST_DRAWS, run_backtest_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('snapshots', help="snapshot file from replay_payload_archive.py (.parquet, .csv or .jsonl)")
+    parser.add_argument('outcomes', help="game-log CSV/Parquet file or directory")
+    parser.add_argument('--window', type=int, default=5, help="games in the rolling features")
+    parser.add_argument('--draws', type=int, default=BACKTEST_DRAWS)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1, help="processes for the simulation")
+    parser.add_argument('--summary-out', default=None)
+    parser.add_argument('--calibration-out', default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run_backtest_files(args.snapshots, args.outcomes, window=args.window, draws=args.draws,
+                                seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+    print(report['summary'].to_string(index=False))
+    print(f"{len(report['bets'])} bets settled in {elapsed:.2f}s")
+    if args.summary_out:
+        report['summary'].to_csv(args.summary_out, index=False)
+    if args.calibration_out:
+        report['calibration'].to_csv(args.calibration_out, index=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Compare decode + parse cost of a DraftKings subcategory response per JSON backend.
+
+Builds a synthetic response shaped like the live API (including the fields the
+scraper ignores), or loads a recorded one with --file, then reports the best-of-N
+wall time and tracemalloc peak for each available path:
+
+    stdlib json + schema walk, orjson + schema walk, msgspec + schema walk, msgspec typed
+
+Example:
+    python scripts/bench_json_decode.py --markets 20000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis import fast_json
+from Utilis.api_scraper import _props_from_body, _props_from_subcategory
+
+
+def _outcome(i, label, line):
+    return {
+        'providerOutcomeId': f"{i}{label}", 'providerId': 2, 'providerOfferId': f"o{i}",
+        'label': label, 'oddsAmerican': '-115' if label == 'Over' else '-105',
+        'oddsDecimal': 1.87, 'oddsDecimalDisplay': '1.87', 'oddsFractional': '20/23',
+        'line': line, 'participant': f"Player {i}", 'participantType': 'Player',
+        'criterionName': 'Receiving Yards', 'main': True, 'tags': ['SGP', 'MainPointLine'],
+    }
+
+
+def synthetic_response(markets: int) -> bytes:
+    offers = [[{
+        'providerOfferId': f"o{i}", 'providerId': 2, 'eventId': 1000 + i // 40,
+        'eventGroupId': 88808, 'label': f"Player {i} Receiving Yards", 'isSuspended': False,
+        'isOpen': True, 'offerSubcategoryId': 16215, 'startDate': '2025-11-30T18:00:00Z',
+        'outcomes': [_outcome(i, 'Over', 40.5 + i % 30), _outcome(i, 'Under', 40.5 + i % 30)],
+    }] for i in range(markets)]
+    payload = {'eventGroup': {'eventGroupId': 88808, 'name': 'NFL', 'offerCategories': [{
+        'offerCategoryId': 1002, 'name': 'Receiving Props',
+        'offerSubcategoryDescriptors': [{
+            'subcategoryId': 16215, 'name': 'Receiving Yards',
+            'offerSubcategory': {'name': 'Receiving Yards', 'subcategoryId': 16215, 'offers': offers},
+        }],
+    }]}}
+    return json.dumps(payload).encode()
+
+
+def measure(fn, body, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = fn(body)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--markets', type=int, default=20_000)
+    parser.add_argument('--file', help="recorded subcategory response to use instead")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.file:
+        with open(args.file, 'rb') as f:
+            body = f.read()
+    else:
+        body = synthetic_response(args.markets)
+    print(f"Response: {len(body) / 1e6:.1f} MB")
+
+    paths = {'json + schema walk': lambda b: _props_from_subcategory(json.loads(b), 'NFL')}
+    if fast_json.orjson is not None:
+        paths['orjson + schema walk'] = lambda b: _props_from_subcategory(fast_json.orjson.loads(b), 'NFL')
+    if fast_json.msgspec is not None:
+        generic = fast_json.msgspec.json.Decoder()
+        paths['msgspec + schema walk'] = lambda b: _props_from_subcategory(generic.decode(b), 'NFL')
+    if fast_json.BACKEND == 'msgspec':
+        paths['msgspec typed'] = lambda b: _props_from_body(b, 'NFL')
+
+    for name, fn in paths.items():
+        seconds, peak, rows = measure(fn, body, args.repeat)
+        print(f"{name:22s} {seconds * 1000:8.1f} ms  peak {peak / 1e6:7.1f} MB  ({rows} props)")
+
+
+if __name__ == '__main__':
+    main()
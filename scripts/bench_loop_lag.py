@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Event-loop lag while DraftKings response bodies are parsed, inline vs offloaded.
+
+Replays a burst of synthetic response bodies through the same handler shape as
+`scan_all_draftkings_props` (one task per response, arriving `--gap` ms apart) and
+reports `LoopLagMonitor` stats for each mode:
+
+    inline    decode + walk on the loop, as the scraper used to
+    thread    BoundedOffload on the shared thread pool
+    process   BoundedOffload on the shared process pool
+
+Example:
+    python scripts/bench_loop_lag.py --responses 20 --players 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.dk_scraper import _props_from_body
+from Utilis.loop_lag import BoundedOffload, LoopLagMonitor, get_executor
+
+
+def synthetic_body(players: int, seed: int) -> bytes:
+    return json.dumps({'players': [{
+        'playerId': str(seed * players + i), 'playerName': f"Player {seed}-{i}",
+        'teamName': 'Home', 'opponentName': 'Away', 'startDate': '2024-09-08T17:00:00Z',
+        'markets': {'rec_yds': f"{40 + i % 30}.5", 'rec_odds': '-115', 'recs': '3.5'},
+    } for i in range(players)]}).encode()
+
+
+async def replay(bodies, mode: str, gap: float, max_pending: int):
+    offload = None if mode == 'inline' else BoundedOffload(get_executor(mode), max_pending)
+    props = []
+
+    async def handle(body):
+        if offload is None:
+            props.extend(_props_from_body(body, 'NFL', 'player_receiving_yards'))
+        else:
+            props.extend(await offload.run(_props_from_body, body, 'NFL', 'player_receiving_yards'))
+
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    async with LoopLagMonitor() as lag:
+        tasks = []
+        for body in bodies:
+            tasks.append(loop.create_task(handle(body)))
+            await asyncio.sleep(gap)
+        await asyncio.gather(*tasks)
+    return len(props), time.perf_counter() - start, lag.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--responses', type=int, default=20)
+    parser.add_argument('--players', type=int, default=5000, help='player objects per response body')
+    parser.add_argument('--gap', type=float, default=5.0, help='ms between responses')
+    parser.add_argument('--max-pending', type=int, default=8)
+    parser.add_argument('--modes', default='inline,thread,process')
+    args = parser.parse_args()
+
+    bodies = [synthetic_body(args.players, i) for i in range(args.responses)]
+    size_mb = sum(len(b) for b in bodies) / 1e6
+    print(f"{args.responses} bodies, {args.players} players each, {size_mb:.1f} MB total")
+    for mode in args.modes.split(','):
+        if mode != 'inline':
+            get_executor(mode).submit(int).result()  # spin the pool up outside the timing
+        count, wall, stats = asyncio.run(replay(bodies, mode, args.gap / 1000, args.max_pending))
+        print(f"{mode:>8}: {count} props in {wall:.2f}s | lag max {stats['max_ms']:.1f}ms "
+              f"p95 {stats['p95_ms']:.1f}ms mean {stats['mean_ms']:.1f}ms ({stats['samples']} samples)")
+
+
+if __name__ == '__main__':
+    main()
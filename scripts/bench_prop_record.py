@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Measure per-prop memory of plain dicts vs. PropRecord.
+
+Builds N props shaped like the scraper output (same keys, fresh strings per
+prop as they would come off json.loads) and reports tracemalloc bytes/prop.
+"""
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cfb_prop_predictor.types import PropRecord
+
+N = 100_000
+TEAMS = ["Alabama", "Georgia", "Texas", "Ohio State", "Michigan", "Oregon"]
+
+
+def _fields(i):
+    team = TEAMS[i % len(TEAMS)]
+    opp = TEAMS[(i + 1) % len(TEAMS)]
+    # ''.join forces a new string object, mimicking JSON decoding
+    return {
+        "name": f"Player {i}",
+        "position": "".join(["Q", "B"]),
+        "team_name": "".join(team),
+        "team_abbrev": "".join(team[:3].upper()),
+        "opponent_name": "".join(opp),
+        "opponent_abbrev": "".join(opp[:3].upper()),
+        "start_time": "2025-10-18T19:30:00",
+        "league": "".join(["C", "F", "B"]),
+        "market_name": "player_passing_yards".replace('_', ' ').title(),
+        "prop_line": 200.5 + i % 50,
+        "over_odds": -110,
+        "under_odds": -110,
+    }
+
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    items = [build(i) for i in range(N)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del items
+    return (after - before) / N
+
+
+def main():
+    as_dict = measure(_fields)
+    as_record = measure(lambda i: PropRecord(**_fields(i)))
+    print(f"props:            {N}")
+    print(f"dict bytes/prop:   {as_dict:8.1f}")
+    print(f"record bytes/prop: {as_record:8.1f}")
+    print(f"saved:             {as_dict - as_record:8.1f} ({(1 - as_record / as_dict) * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Replay a directory of saved DK JSON payloads through parse_dk_json_payload.
+
+Example:
+    python scripts/replay_payload_archive.py archive/ out.parquet --league NFL \
+        --prop-type player_receiving_yards --workers 8
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.replay import replay_to_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('archive_dir', help="directory of *.json payloads (searched recursively)")
+    parser.add_argument('out_path', help="output file: .parquet, .csv or .jsonl")
+    parser.add_argument('--league', default='NFL')
+    parser.add_argument('--prop-type', default='player_receiving_yards')
+    parser.add_argument('--workers', type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args()
+
+    # Sorted so rows come out in archive (filename/timestamp) order
+    paths = sorted(glob.glob(os.path.join(args.archive_dir, '**', '*.json'), recursive=True))
+    print(f"Replaying {len(paths)} payloads...")
+    start = time.perf_counter()
+    rows = replay_to_file(paths, args.out_path, args.league, args.prop_type,
+                          workers=args.workers, chunksize=args.chunksize)
+    elapsed = time.perf_counter() - start
+    print(f"{rows} rows from {len(paths)} files in {elapsed:.2f}s ({len(paths) / max(elapsed, 1e-9):.0f} files/s)")
+
+
+if __name__ == '__main__':
+    main()
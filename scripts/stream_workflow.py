@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Stream the async workflow from the command line, printing each prop as soon as it is
+analyzed, and report time to the first row vs. the whole scan.
+
+    python scripts/stream_workflow.py NFL player_receiving_yards
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from cfb_prop_predictor.workflow import iter_workflow
+
+
+async def main(league: str, prop_type: str):
+    start = time.perf_counter()
+    first = None
+    count = 0
+    async for item in iter_workflow(league, prop_type):
+        if first is None:
+            first = time.perf_counter() - start
+        count += 1
+        prop, pred = item["prop"], item["prediction"]
+        print(f"{prop.get('name')}: line={prop.get('prop_line')} -> {pred['recommended_bet']} "
+              f"(proj {pred['projected_value']}, conf {pred['confidence']})")
+    total = time.perf_counter() - start
+    if first is None:
+        print(f"No props after {total:.2f}s")
+    else:
+        print(f"{count} props; first row after {first:.2f}s, all rows after {total:.2f}s")
+
+
+if __name__ == '__main__':
+    league = sys.argv[1] if len(sys.argv) > 1 else 'CFB'
+    prop_type = sys.argv[2] if len(sys.argv) > 2 else 'player_passing_yards'
+    asyncio.run(main(league, prop_type))
@@ -0,0 +1,80 @@
+"""Local stand-in for an OpenAI-compatible /chat/completions endpoint.
+
+Answers the batch prompts built by `Utilis.llm_extractor.build_batch_prompt` by running
+the deterministic stub over the embedded data, and counts requests so tests can assert
+how many LLM calls were made. Run directly to serve on a fixed port:
+
+    python tests/fake_llm_server.py 8765
+    OPENAI_BASE_URL=http://127.0.0.1:8765 FORCE_OPENAI=1 OPENAI_API_KEY=x ...
+"""
+import json
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.llm_extractor import extract_with_llm_stub
+
+
+def answer_prompt(prompt: str) -> str:
+    m = re.search(r"Requests:\n(.*?)\nData:\n(.*)\n$", prompt, re.S)
+    if not m:
+        return "[]"
+    items = json.loads(m.group(1))
+    data = m.group(2)
+    out = []
+    for item in items:
+        odds = extract_with_llm_stub(data, item['player'], item['prop_type'])
+        out.append({
+            'id': item['id'],
+            'prop_line': odds.prop_line if odds else None,
+            'over_odds': None,
+            'under_odds': None,
+        })
+    return json.dumps(out)
+
+
+class FakeLLMServer:
+    """Threaded HTTP server on 127.0.0.1; use as a context manager."""
+
+    def __init__(self, port: int = 0):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with server.lock:
+                    server.requests.append(body)
+                content = answer_prompt(body['messages'][0]['content'])
+                reply = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': content}}]}).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(reply)))
+                self.end_headers()
+                self.wfile.write(reply)
+
+            def log_message(self, *args):
+                pass
+
+        self.lock = threading.Lock()
+        self.requests = []
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == '__main__':
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    with FakeLLMServer(port) as srv:
+        print(f"Fake LLM server listening on {srv.url}")
+        threading.Event().wait()
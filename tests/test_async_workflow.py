@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from aiohttp import web
+
+from Utilis import api_scraper
+from Utilis.rate_limit import reset_throttles
+from cfb_prop_predictor import workflow
+
+
+def subcategory_payload(name, players, line):
+    offers = [[{'outcomes': [
+        {'participant': p, 'line': line, 'oddsAmerican': '-110', 'label': 'Over'},
+        {'participant': p, 'line': line, 'oddsAmerican': '-110', 'label': 'Under'},
+    ]}] for p in players]
+    return {'eventGroup': {'offerCategories': [{'offerSubcategoryDescriptors': [
+        {'name': name, 'offerSubcategory': {'offers': offers}}]}]}}
+
+
+async def start_fake_dk(delays):
+    async def category(request):
+        return web.json_response({'eventGroup': {'offerCategories': [{'offerSubcategoryDescriptors': [
+            {'subcategoryId': sub_id} for sub_id in delays]}]}})
+
+    async def subcategory(request):
+        sub_id = int(request.match_info['sub_id'])
+        await asyncio.sleep(delays[sub_id])
+        return web.json_response(subcategory_payload(f'Market {sub_id}', [f'Player {sub_id}'], 10.5 + sub_id))
+
+    app = web.Application()
+    app.router.add_get('/eventgroups/{eg}/categories/{cat}', category)
+    app.router.add_get('/eventgroups/{eg}/categories/{cat}/subcategories/{sub_id}', subcategory)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+
+def test_async_scrape_yields_subcategories_as_they_arrive(monkeypatch):
+    reset_throttles()
+
+    async def run():
+        runner, base = await start_fake_dk({1: 0.6, 2: 0.0, 3: 0.1})
+        monkeypatch.setattr(api_scraper, 'BASE_URL', base)
+        try:
+            start = time.perf_counter()
+            arrivals = []
+            async for batch in api_scraper.iter_props_from_api_async('NFL', 'player_receiving_yards'):
+                arrivals.append((batch[0]['name'], time.perf_counter() - start))
+            return arrivals
+        finally:
+            await runner.cleanup()
+
+    arrivals = asyncio.run(run())
+    assert [name for name, _ in arrivals] == ['Player 2', 'Player 3', 'Player 1']
+    # the first batch does not wait for the slow subcategory
+    assert arrivals[0][1] < 0.4
+
+
+def test_iter_workflow_analyzes_each_batch(monkeypatch):
+    async def fake_stream(league, prop_type):
+        yield [{'name': 'A', 'prop_line': 100.0}]
+        yield [{'name': 'B', 'prop_line': 'N/A'}]
+
+    monkeypatch.setattr(workflow, 'gather_data_stream', fake_stream)
+
+    result = asyncio.run(workflow.run_workflow_async('NFL', 'player_receiving_yards'))
+    assert [p['name'] for p in result['gathered_data']['all_props']] == ['A', 'B']
+    first, second = result['prop_results']
+    assert first['analysis']['key_metrics']['prop_line'] == 100.0
+    assert first['prediction']['projected_value'] == 105.0
+    assert 'prop_line' not in second['analysis']['key_metrics']
@@ -0,0 +1,70 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.backtest import calibration, run_backtest, summarize
+from Utilis.feature_store import read_game_logs
+
+SAMPLE_LOGS = os.path.join(os.path.dirname(__file__), 'samples', 'game_logs.csv')
+
+
+def snapshots():
+    return pd.DataFrame({
+        'name': ['Travis Kelce', 'Travis Kelce', 'Marvin Harrison Jr.', 'Nobody', 'Travis Kelce'],
+        'league': 'NFL',
+        'market_name': 'Receiving Yards',
+        'prop_line': [40.5, 40.5, 60.5, 10.5, 40.5],
+        'over_odds': ['-110', '-110', None, '-110', '-110'],
+        'under_odds': [-110, -110, None, -110, -110],
+        # Sunday-night kickoff: 00:20Z is still Oct 20 in the logs' (Eastern) calendar
+        'start_time': ['2024-10-21T00:20:00Z', '2024-10-21T00:20:00Z', '2024-09-15T17:00:00Z',
+                       '2024-09-15T17:00:00Z', '2024-11-03T17:00:00Z'],
+        'snapshot_time': ['2024-10-19T12:00:00Z', '2024-10-20T12:00:00Z', '2024-09-14T12:00:00Z',
+                          '2024-09-14T12:00:00Z', '2024-11-02T12:00:00Z'],
+    })
+
+
+def test_backtest_settles_against_the_logs():
+    report = run_backtest(snapshots(), read_game_logs(SAMPLE_LOGS), draws=2000)
+    bets = report['bets']
+    # Unknown player and the game with no outcome (Nov 3) are not settled
+    assert bets['name'].tolist() == ['Travis Kelce', 'Travis Kelce', 'Marvin Harrison Jr.']
+    # Kelce's last 5 before Oct 20 average 51.4 > 40.5; he had 56
+    assert bets['side'].tolist()[:2] == ['over', 'over']
+    assert bets['actual'].tolist() == [56.0, 56.0, 130.0]
+    assert bets['profit'][0] == pytest.approx(100 / 110)
+    # Harrison's only prior game (23 yards) says under; he had 130, unpriced loss
+    assert (bets['side'][2], bets['result'][2], bets['profit'][2]) == ('under', -1, -1.0)
+
+    summary = report['summary'].iloc[0]
+    assert (summary['bets'], summary['wins'], summary['losses']) == (3, 2, 1)
+    assert summary['roi'] == pytest.approx((2 * 100 / 110 - 1) / 3)
+    assert summary['hit_rate'] == pytest.approx(2 / 3)
+
+
+def test_backtest_is_deterministic_across_workers(monkeypatch):
+    import Utilis.backtest as backtest
+
+    monkeypatch.setattr(backtest, 'SIM_CHUNK_ROWS', 1)
+    logs = read_game_logs(SAMPLE_LOGS)
+    one = run_backtest(snapshots(), logs, draws=500, workers=1)['bets']
+    two = run_backtest(snapshots(), logs, draws=500, workers=2)['bets']
+    pd.testing.assert_frame_equal(one, two)
+
+
+def test_summary_and_calibration_tables():
+    bets = pd.DataFrame({
+        'league': 'NFL', 'market_name': ['A', 'A', 'A', 'B'],
+        'p_side': [0.55, 0.58, 0.91, 0.6], 'result': [1, -1, 1, 0], 'profit': [1.0, -1.0, 0.5, 0.0],
+    })
+    summary = summarize(bets).set_index('market_name')
+    assert summary.loc['A', 'roi'] == pytest.approx(0.5 / 3)
+    assert summary.loc['B', 'pushes'] == 1 and np.isnan(summary.loc['B', 'hit_rate'])
+    calib = calibration(bets)
+    assert calib[['bin', 'bets']].values.tolist() == [[0.5, 2], [0.9, 1]]
+    assert calib['observed'].tolist() == [0.5, 1.0]
@@ -0,0 +1,110 @@
+import asyncio
+import time
+
+from agents import data_gatherer
+from agents.data_gatherer import race_sources
+
+
+def make_source(props, delay=0.0, as_of=1000.0, error=None, log=None, name=None):
+    async def fetch(league, prop_type):
+        if log is not None:
+            log.append(('start', name))
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            if log is not None:
+                log.append(('cancelled', name))
+            raise
+        if error:
+            raise error
+        return props, as_of
+    return fetch
+
+
+def test_fastest_good_source_wins_and_losers_are_cancelled():
+    log = []
+    sources = [
+        ('api', make_source([{'name': 'A'}], delay=0.5, log=log, name='api'), 0.0),
+        ('playwright', make_source([{'name': 'B'}], delay=0.05, as_of=2000.0, log=log, name='playwright'), 0.0),
+    ]
+    props, source, as_of = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=5))
+    assert (props, source, as_of) == ([{'name': 'B'}], 'playwright', 2000.0)
+    assert ('cancelled', 'api') in log
+
+
+def test_snapshot_hedge_starts_early_when_live_sources_fail():
+    log = []
+    sources = [
+        ('api', make_source([], error=RuntimeError('blocked'), log=log, name='api'), 0.0),
+        ('snapshot', make_source([{'name': 'S'}], log=log, name='snapshot'), 10.0),
+    ]
+    start = time.perf_counter()
+    props, source, _ = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=5))
+    # the 10s hedge delay is skipped because the only live source already failed
+    assert source == 'snapshot' and props == [{'name': 'S'}]
+    assert time.perf_counter() - start < 1
+
+
+def test_snapshot_waits_for_hedge_delay_while_live_source_runs():
+    log = []
+    sources = [
+        ('api', make_source([{'name': 'A'}], delay=0.1, log=log, name='api'), 0.0),
+        ('snapshot', make_source([{'name': 'S'}], log=log, name='snapshot'), 1.0),
+    ]
+    _, source, _ = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=5))
+    assert source == 'api'
+    assert ('start', 'snapshot') not in log
+
+
+def test_budget_exhausted_returns_empty():
+    sources = [('api', make_source([{'name': 'A'}], delay=5), 0.0)]
+    start = time.perf_counter()
+    assert asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=0.1)) == ([], None, None)
+    assert time.perf_counter() - start < 1
+
+
+def test_gather_data_records_winning_source(monkeypatch):
+    async def failing_api(league, prop_type):
+        raise RuntimeError('offline')
+
+    monkeypatch.setattr(data_gatherer, '_api_source', failing_api)
+    gathered = data_gatherer.gather_data('NFL', 'player_receiving_yards')
+    assert gathered.source == 'snapshot'
+    assert gathered.all_props and gathered.data_as_of
+    assert gathered.model_dump()['source'] == 'snapshot'
+
+
+def test_slow_live_source_is_preferred_over_snapshot_within_budget():
+    log = []
+    sources = [
+        ('api', make_source([{'name': 'A'}], delay=0.4, log=log, name='api'), 0.0),
+        ('snapshot', make_source([{'name': 'S'}], log=log, name='snapshot'), None),
+    ]
+    # the snapshot starts with 0.3s of budget left and is ready at once, but the API still
+    # delivers before the budget runs out, so it wins
+    _, source, _ = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=1.0, reserve=0.7))
+    assert source == 'api'
+    assert ('start', 'snapshot') in log
+
+
+def test_snapshot_is_used_when_live_source_misses_the_budget():
+    log = []
+    sources = [
+        ('api', make_source([{'name': 'A'}], delay=5, log=log, name='api'), 0.0),
+        ('snapshot', make_source([{'name': 'S'}], log=log, name='snapshot'), None),
+    ]
+    start = time.perf_counter()
+    props, source, _ = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=0.3, reserve=0.1))
+    assert (props, source) == ([{'name': 'S'}], 'snapshot')
+    assert ('cancelled', 'api') in log
+    assert time.perf_counter() - start < 1
+
+
+def test_snapshot_fallback_starts_once_live_sources_come_back_empty():
+    sources = [
+        ('api', make_source([], delay=0.05), 0.0),
+        ('snapshot', make_source([{'name': 'S'}]), None),
+    ]
+    start = time.perf_counter()
+    _, source, _ = asyncio.run(race_sources('NFL', 'player_receiving_yards', sources, budget=10, reserve=1))
+    assert source == 'snapshot' and time.perf_counter() - start < 1
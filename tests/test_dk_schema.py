@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from Utilis import dk_schema
+from Utilis.dk_schema import OfferMarket, iter_markets, iter_markets_from_bytes, subcategory_ids
+
+
+def outcome(label, line=45.5, odds='-110', participant='Travis Kelce'):
+    o = {'label': label, 'line': line, 'oddsAmerican': odds, 'oddsDecimal': 1.9}
+    if participant:
+        o['participant'] = participant
+    return o
+
+
+def response(*markets, name='Receiving Yards'):
+    return {'eventGroup': {'offerCategories': [
+        {'offerSubcategoryDescriptors': [
+            {'name': name, 'subcategoryId': 16215, 'offerSubcategory': {'offers': [[m] for m in markets]}},
+        ]},
+    ]}}
+
+
+def decode_both(data):
+    generic = list(iter_markets(data))
+    assert list(iter_markets_from_bytes(json.dumps(data).encode())) == generic
+    return generic
+
+
+def test_over_and_under_are_picked_by_label():
+    markets = decode_both(response({'outcomes': [outcome('Under', odds='-105'), outcome('Over', odds='-115')],
+                                    'startDate': '2025-11-30T18:00:00Z'}))
+    assert markets == [OfferMarket('Receiving Yards', '2025-11-30T18:00:00Z', 'Travis Kelce', 45.5, '-115', '-105')]
+
+
+def test_unlabelled_two_way_market_falls_back_to_position():
+    markets = decode_both(response({'outcomes': [outcome(None, odds='-115'), outcome(None, odds='-105')]}))
+    assert (markets[0].over_odds, markets[0].under_odds) == ('-115', '-105')
+
+
+def test_malformed_markets_are_skipped_one_at_a_time():
+    good = {'outcomes': [outcome('Over'), outcome('Under')]}
+    data = response(
+        good,
+        {'outcomes': [outcome('Over', line='forty'), outcome('Under')]},  # bad type
+        {'outcomes': 'nope'},                                              # bad shape
+        {'outcomes': [outcome('Under')]},                                  # no Over
+        {'outcomes': [outcome('Over', participant=None), outcome('Under', participant=None)]},  # team line
+        dict(good, outcomes=[outcome('Over', participant='Rashee Rice'), outcome('Under')]),
+    )
+    data['eventGroup']['offerCategories'].insert(0, 'garbage')
+    data['eventGroup']['offerCategories'][1]['offerSubcategoryDescriptors'][0]['offerSubcategory']['offers'].append('x')
+    assert [m.participant for m in decode_both(data)] == ['Travis Kelce', 'Rashee Rice']
+
+
+@pytest.mark.parametrize('data', [None, {}, {'eventGroup': None}, {'eventGroup': {'offerCategories': 5}}, []])
+def test_unexpected_top_level_shapes_yield_nothing(data):
+    assert decode_both(data) == []
+
+
+def test_subcategory_ids_skip_malformed_descriptors():
+    data = response()
+    data['eventGroup']['offerCategories'][0]['offerSubcategoryDescriptors'] += [{'subcategoryId': [1]}, 7, {'name': 'x'}]
+    assert subcategory_ids(data) == [16215]
+
+
+def test_msgspec_fast_path_does_not_build_unread_fields():
+    if dk_schema.BACKEND != 'msgspec':
+        pytest.skip("msgspec backend not active")
+    body = json.dumps(response({'outcomes': [outcome('Over'), outcome('Under')]})).encode()
+    root = dk_schema._full_decoder.decode(body)
+    node = root.eventGroup.offerCategories[0].offerSubcategoryDescriptors[0].offerSubcategory.offers[0][0].outcomes[0]
+    assert not hasattr(node, 'oddsDecimal')
@@ -0,0 +1,31 @@
+import json
+
+from Utilis import api_scraper, fast_json
+from Utilis.api_scraper import _props_from_body, _props_from_subcategory
+
+
+def subcategory_body(line=45.5):
+    market = {'startDate': '2025-11-30T18:00:00Z', 'eventId': 7, 'outcomes': [
+        {'participant': 'Travis Kelce', 'label': 'Over', 'line': line, 'oddsAmerican': '-115', 'oddsDecimal': 1.87},
+        {'participant': 'Travis Kelce', 'label': 'Under', 'line': line, 'oddsAmerican': '-105', 'oddsDecimal': 1.95},
+    ]}
+    return json.dumps({'eventGroup': {'name': 'NFL', 'offerCategories': [{'offerSubcategoryDescriptors': [
+        {'name': 'Receiving Yards', 'offerSubcategory': {'offers': [[market]]}}]}]}}).encode()
+
+
+def test_loads_accepts_bytes_and_memoryview():
+    body = subcategory_body()
+    assert fast_json.loads(body) == json.loads(body)
+    assert fast_json.loads(memoryview(body)) == json.loads(body)
+
+
+def test_accept_encoding_always_offers_gzip():
+    assert 'gzip' in fast_json.ACCEPT_ENCODING
+    assert api_scraper.HEADERS['Accept-Encoding'] == fast_json.ACCEPT_ENCODING
+
+
+def test_body_decoding_matches_generic_walk():
+    body = subcategory_body()
+    expected = _props_from_subcategory(json.loads(body), 'NFL')
+    assert _props_from_body(body, 'NFL') == expected
+    assert expected[0]['prop_line'] == 45.5 and expected[0]['under_odds'] == '-105'
@@ -0,0 +1,93 @@
+import os
+import statistics
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis import feature_store
+from Utilis.feature_store import PlayerStatStore, stat_for_prop_type
+from cfb_prop_predictor.types import GatheredData, OddsData
+
+SAMPLE_LOGS = os.path.join(os.path.dirname(__file__), 'samples', 'game_logs.csv')
+KELCE = [34, 5, 39, 89, 70, 56]
+
+
+@pytest.fixture
+def store():
+    return PlayerStatStore.from_files(SAMPLE_LOGS, window=5)
+
+
+def test_rolling_window_matches_recompute(store):
+    feats = store.features('Travis Kelce', 'receiving_yards')
+    last5 = KELCE[-5:]
+    assert feats['last_n_games'] == 5
+    assert feats['last_n_mean'] == pytest.approx(statistics.mean(last5))
+    assert feats['last_n_var'] == pytest.approx(statistics.variance(last5))
+    assert feats['season_avg'] == pytest.approx(statistics.mean(KELCE))
+    assert feats['season_games'] == 6
+
+
+def test_names_resolve_through_canonical_key(store):
+    assert 'Marvin Harrison' in store
+    assert store.features('marvin harrison jr', 'receiving_yards')['last_n_mean'] == pytest.approx(76.5)
+
+
+def test_missing_stats_are_not_counted(store):
+    assert store.features('Patrick Mahomes', 'receiving_yards') is None
+    assert store.features('Patrick Mahomes', 'passing_yards')['last_n_games'] == 3
+
+
+def test_bulk_features_align_with_players(store):
+    feats = store.bulk_features(['Patrick Mahomes', 'Nobody', 'Travis Kelce'], 'passing_yards')
+    assert feats['last_n_games'].tolist() == [3, 0, 5]
+    assert feats['last_n_mean'][0] == pytest.approx((291 + 217 + 151) / 3)
+    assert np.isnan(feats['last_n_mean'][1])
+
+
+def test_last_n_values_oldest_first_and_padded(store):
+    values = store.last_n_values(['Travis Kelce', 'Marvin Harrison', 'Nobody'], 'receiving_yards')
+    assert values.shape == (3, 5)
+    assert values[0].tolist() == KELCE[-5:]
+    assert np.isnan(values[1, :3]).all() and values[1, 3:].tolist() == [23, 130]
+    assert np.isnan(values[2]).all()
+
+
+def test_replayed_and_new_season_games():
+    store = PlayerStatStore(stats=['receptions'], window=3)
+    assert store.add_game('A Player', {'receptions': 4}, season=2023, game_date='2023-12-01')
+    assert not store.add_game('A Player', {'receptions': 4}, season=2023, game_date='2023-12-01')
+    assert store.add_game('A Player', {'receptions': 8}, season=2024, game_date='2024-09-01')
+    feats = store.features('A Player', 'receptions')
+    assert feats['season_games'] == 1 and feats['season_avg'] == 8
+    assert feats['last_n_games'] == 2 and feats['last_n_mean'] == 6
+
+
+def test_store_grows_past_capacity():
+    store = PlayerStatStore(stats=['receptions'], window=2, capacity=2)
+    for i in range(10):
+        store.add_game(f'Player {i}', {'receptions': i})
+    assert len(store) == 10
+    assert store.bulk_features([f'Player {i}' for i in range(10)], 'receptions')['last_n_mean'].tolist() == list(range(10))
+
+
+def test_analyzer_and_predictor_use_store(monkeypatch):
+    from cfb_prop_predictor.agents import analyzer, predictor
+
+    monkeypatch.setattr(feature_store, '_default_path', None)
+    monkeypatch.setattr(feature_store, '_default_store', None)
+    monkeypatch.setenv('PLAYER_GAME_LOGS', SAMPLE_LOGS)
+    gd = GatheredData(odds_data=OddsData(prop_line=50.5), player_stats=SimpleNamespace(name='Travis Kelce'),
+                      team_stats=None)
+    analysis = analyzer.analyze(gd, 'player_receiving_yards')
+    assert analysis.key_metrics['last_n_mean'] == pytest.approx(statistics.mean(KELCE[-5:]))
+    assert 'season_average_placeholder' not in analysis.key_metrics
+    assert predictor.predict(analysis).projected_value == round(statistics.mean(KELCE[-5:]), 2)
+
+
+def test_stat_for_prop_type():
+    assert stat_for_prop_type('player_receiving_yards') == 'receiving_yards'
+    assert stat_for_prop_type('receptions') == 'receptions'
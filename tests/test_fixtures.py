@@ -0,0 +1,90 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from Utilis import fixtures
+from Utilis.fixtures import clear_fixture_cache, load_fixture_dir, load_fixture_props
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'samples', 'dk_sample.json')
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_fixture_cache()
+    yield
+    clear_fixture_cache()
+
+
+@pytest.fixture
+def count_parses(monkeypatch):
+    calls = []
+    real = fixtures.parse_dk_json_payload
+
+    def counting(payload, league, prop_type):
+        calls.append((league, prop_type))
+        return real(payload, league, prop_type)
+
+    monkeypatch.setattr(fixtures, 'parse_dk_json_payload', counting)
+    return calls
+
+
+def test_parses_once_per_league_and_prop_type(count_parses):
+    first = load_fixture_props(SAMPLE, 'NFL', 'player_receiving_yards')
+    second = load_fixture_props(SAMPLE, 'NFL', 'player_receiving_yards')
+    assert first == second and first is not second
+    assert first[0]['name'] == 'Travis Kelce'
+    load_fixture_props(SAMPLE, 'CFB', 'player_receiving_yards')
+    assert count_parses == [('NFL', 'player_receiving_yards'), ('CFB', 'player_receiving_yards')]
+
+
+def test_reparses_when_file_changes(tmp_path, count_parses):
+    path = tmp_path / 'dk.json'
+    shutil.copy(SAMPLE, path)
+    assert load_fixture_props(str(path), 'NFL', 'player_receiving_yards')[0]['name'] == 'Travis Kelce'
+
+    payload = json.loads(path.read_text())
+    payload_text = json.dumps(payload).replace('Travis Kelce', 'Noah Gray')
+    path.write_text(payload_text)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert load_fixture_props(str(path), 'NFL', 'player_receiving_yards')[0]['name'] == 'Noah Gray'
+    assert len(count_parses) == 2
+
+
+def test_fixture_dir_loads_every_payload_and_skips_bad_files(tmp_path, count_parses):
+    shutil.copy(SAMPLE, tmp_path / 'a.json')
+    shutil.copy(SAMPLE, tmp_path / 'b.json')
+    (tmp_path / 'c.json').write_text('{not json')
+
+    props = load_fixture_dir(str(tmp_path), 'NFL', 'player_receiving_yards')
+    assert [p['name'] for p in props] == ['Travis Kelce', 'Travis Kelce']
+    load_fixture_dir(str(tmp_path), 'NFL', 'player_receiving_yards')
+    assert len(count_parses) == 2
+
+
+def test_parser_debug_output_is_gated_without_touching_stdout(monkeypatch, capsys):
+    import sys
+
+    streams = []
+    real = fixtures.parse_dk_json_payload
+
+    def spying(payload, league, prop_type):
+        streams.append(sys.stdout)
+        return real(payload, league, prop_type)
+
+    monkeypatch.setattr(fixtures, 'parse_dk_json_payload', spying)
+    monkeypatch.delenv('SCRAPER_DEBUG', raising=False)
+    stdout = sys.stdout
+    load_fixture_props(SAMPLE, 'NFL', 'player_receptions')
+    # other threads keep printing to the real stream while a fixture loads
+    assert streams == [stdout]
+    out = capsys.readouterr().out
+    assert 'DEBUG(dk-parser)' not in out and '[fixtures] Parsed 1 props' in out
+
+    clear_fixture_cache()
+    monkeypatch.setenv('SCRAPER_DEBUG', '1')
+    load_fixture_props(SAMPLE, 'NFL', 'player_receptions')
+    assert 'DEBUG(dk-parser)' in capsys.readouterr().out
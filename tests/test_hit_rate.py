@@ -0,0 +1,73 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis import feature_store, hit_rate
+from Utilis.feature_store import PlayerStatStore
+from Utilis.hit_rate import HitRateCache, format_hit_rate, stat_for_market
+from dashboard.mapper import _frame_from_gathered, _rows_from_gathered
+
+SAMPLE_LOGS = os.path.join(os.path.dirname(__file__), 'samples', 'game_logs.csv')
+
+
+@pytest.fixture
+def cache():
+    return HitRateCache(PlayerStatStore.from_files(SAMPLE_LOGS), games=5)
+
+
+def test_stat_for_market():
+    stats = ('receiving_yards', 'receptions', 'passing_yards')
+    assert stat_for_market('Player Receiving Yards', stats) == 'receiving_yards'
+    assert stat_for_market('Receiving Yards O/U', stats) == 'receiving_yards'
+    assert stat_for_market('Anytime TD Scorer', stats) is None
+    assert stat_for_market('player_receiving_yards', stats) == 'receiving_yards'
+    # combo, partial-game and alt markets don't settle on the full-game stat
+    for market in ('Rushing + Receiving Yards', '1st Half Passing Yards',
+                   'Passing Yards Milestones', 'Alt Receiving Yards'):
+        assert stat_for_market(market, stats + ('rushing_yards',)) is None
+
+
+def test_rates_are_vectorized_over_players(cache):
+    # Kelce last 5: 5, 39, 89, 70, 56; Harrison: 23, 130
+    hits, games = cache.rates(['Travis Kelce', 'Marvin Harrison Jr.', 'Nobody', 'Travis Kelce'],
+                              [50.5, 49.5, 10.5, np.nan], 'receiving_yards')
+    assert hits.tolist() == [3, 1, 0, 0]
+    assert games.tolist() == [5, 2, 0, 0]
+
+
+def test_rates_are_cached_until_store_changes(cache):
+    cache.rates(['Travis Kelce'], [50.5], 'receiving_yards')
+    assert len(cache) == 1
+    cache.rates(['Travis Kelce'], [50.5], 'receiving_yards')
+    assert len(cache) == 1
+    cache.store.add_game('Travis Kelce', {'receiving_yards': 10}, season=2024, game_date='2024-10-27')
+    hits, games = cache.rates(['Travis Kelce'], [50.5], 'receiving_yards')
+    assert (hits[0], games[0]) == (3, 5)  # 39, 89, 70, 56, 10
+    assert len(cache) == 1
+
+
+def test_column_groups_by_market(cache):
+    labels = cache.column(['Travis Kelce', 'Patrick Mahomes', 'Travis Kelce'],
+                          ['Receiving Yards', 'Passing Yards', 'Anytime TD'],
+                          [50.5, 200.5, 0.5])
+    assert labels.tolist() == ['60% (3/5)', '67% (2/3)', 'N/A']
+    assert format_hit_rate(0, 0) == 'N/A'
+
+
+def test_mapper_fills_hit_rate(monkeypatch):
+    monkeypatch.setattr(feature_store, '_default_path', None)
+    monkeypatch.setattr(feature_store, '_default_store', None)
+    monkeypatch.setattr(hit_rate, '_default_cache', None)
+    monkeypatch.setenv('PLAYER_GAME_LOGS', SAMPLE_LOGS)
+    gathered = {'all_props': [
+        {'name': 'Travis Kelce', 'market_name': 'Player Receiving Yards', 'prop_line': 50.5},
+        {'name': 'Unknown Guy', 'market_name': 'Player Receiving Yards', 'prop_line': 20.5},
+    ]}
+    rows = _rows_from_gathered(gathered, result={'gathered_data': gathered})
+    assert [r['hit_rate'] for r in rows] == ['60% (3/5)', 'N/A']
+    frame = _frame_from_gathered(gathered, result={'gathered_data': gathered})
+    assert frame['hit_rate'].tolist() == ['60% (3/5)', 'N/A']
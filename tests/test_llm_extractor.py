@@ -0,0 +1,185 @@
+import json
+import os
+import random
+import re
+
+import pytest
+
+from Utilis import llm_extractor
+from Utilis.llm_extractor import (
+    BatchExtractor,
+    _collect_numbers_from_obj,
+    _harvest_line,
+    extract_props,
+    extract_with_llm_stub,
+    prune_payload,
+)
+from fake_llm_server import FakeLLMServer
+
+
+def load_sample(name: str):
+    path = os.path.join(os.path.dirname(__file__), 'samples', name)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    with FakeLLMServer() as server:
+        monkeypatch.setenv('FORCE_OPENAI', '1')
+        monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+        monkeypatch.setenv('OPENAI_BASE_URL', server.url)
+        monkeypatch.setattr(llm_extractor, '_default_extractor', None)
+        yield server
+
+
+def test_stub_reads_sample():
+    odds = extract_with_llm_stub(load_sample('dk_sample.json'), 'Travis Kelce', 'player_recs')
+    assert odds.prop_line == 3.5
+
+
+def test_batch_calls_scale_with_distinct_payloads(fake_llm):
+    samples = [load_sample(n) for n in ('dk_sample.json', 'dk_sample_2.json', 'dk_sample_3.json')]
+    lookups = [(s, 'Travis Kelce', pt) for s in samples for pt in ('player_recs', 'player_receiving_yards')]
+    extractor = BatchExtractor(max_batch=10, max_concurrency=2)
+
+    first = extractor.extract_many(lookups * 5)
+    assert len(fake_llm.requests) == 3
+    assert all(o is not None and o.prop_line == 3.5 for o in first)
+
+    # Same payloads again (fresh objects): answered from the content-addressed cache
+    again = extractor.extract_many([(json.loads(json.dumps(s)), p, t) for s, p, t in lookups])
+    assert len(fake_llm.requests) == 3
+    assert [o.prop_line for o in again] == [3.5] * len(lookups)
+
+
+def test_shared_payload_is_hashed_once_per_call(fake_llm, monkeypatch):
+    digests = []
+    real = llm_extractor.payload_digest
+    monkeypatch.setattr(llm_extractor, 'payload_digest', lambda c: digests.append(1) or real(c))
+    sample = load_sample('dk_sample.json')
+    copy = json.loads(json.dumps(sample))
+    BatchExtractor().extract_many([(sample, 'Travis Kelce', 'player_recs'),
+                                   (sample, 'Travis Kelce', 'player_receiving_yards'),
+                                   (copy, 'Travis Kelce', 'player_recs')])
+    assert len(digests) == 2
+    assert len(fake_llm.requests) == 1
+
+
+def test_extract_props_uses_batch_extractor(fake_llm):
+    sample = load_sample('dk_sample_2.json')
+    assert extract_props(sample, 'Travis Kelce', 'player_receiving_yards').prop_line == 3.5
+    assert extract_props(sample, 'Travis Kelce', 'player_receiving_yards').prop_line == 3.5
+    assert len(fake_llm.requests) == 1
+
+
+def test_prune_payload_keeps_only_target_player():
+    names = [f"Player {chr(65 + i % 26)}{chr(65 + i // 26)}" for i in range(300)]
+    offers = [
+        [{'label': f'{name} Receiving Yards', 'outcomes': [
+            {'participant': name, 'label': 'Over', 'line': 40.5 + i, 'oddsAmerican': '-115'},
+            {'participant': name, 'label': 'Under', 'line': 40.5 + i, 'oddsAmerican': '-105'},
+        ]}]
+        for i, name in enumerate(names)
+    ]
+    payload = {'eventGroup': {'offerCategories': [{'offerSubcategoryDescriptors': [
+        {'name': 'Receiving Yards', 'offerSubcategory': {'offers': offers}}]}]}}
+
+    pruned, stats = prune_payload(payload, ['player ha'], ['player_receiving_yards'])
+    assert stats['anchors'] == 2
+    assert stats['nodes_after'] * 100 < stats['nodes_before']
+    assert {o['participant'] for o in pruned} == {'Player HA'}
+    assert {o['line'] for o in pruned} == {47.5}
+
+
+def test_prune_payload_without_match_is_unchanged():
+    sample = load_sample('dk_sample.json')
+    pruned, stats = prune_payload(sample, ['Nobody Here'], ['player_recs'])
+    assert pruned is sample
+    assert stats['anchors'] == 0
+
+
+def _reference_collect(obj, prop_identifier):
+    """The stub's original number harvest, kept verbatim to pin the optimized engine to it."""
+    found = []
+
+    def walk(o):
+        if isinstance(o, dict):
+            for k, v in o.items():
+                lk = str(k).lower()
+                if prop_identifier in lk or any(tok in lk for tok in [prop_identifier[:3]]):
+                    if isinstance(v, (int, float)):
+                        found.append(float(v))
+                        continue
+                    if isinstance(v, str):
+                        m = re.search(r"-?\d+\.?\d*", v)
+                        if m:
+                            found.append(float(m.group(0)))
+                            continue
+                walk(v)
+        elif isinstance(o, list):
+            for it in o:
+                walk(it)
+        elif isinstance(o, str):
+            m = re.search(r"-?\d+\.?\d*", o)
+            if m:
+                found.append(float(m.group(0)))
+
+    walk(obj)
+    return found
+
+
+def _random_payload(rng, depth=0):
+    keys = ['recs', 'receiving_yds', 'name', 'odds', 'line', 'id', 'rec_odds', 'markets', 7]
+    leaves = [lambda: rng.choice(['3.5', '-110', 'Travis Kelce', 'o45.5 (-115)', '', 'x-2.y', '1e5', '--4']),
+              lambda: rng.uniform(-300, 300), lambda: rng.randint(-5, 500), lambda: True, lambda: None]
+    if depth > 3 or rng.random() < 0.3:
+        return rng.choice(leaves)()
+    if rng.random() < 0.5:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 6))]
+    return {rng.choice(keys): _random_payload(rng, depth + 1) for _ in range(rng.randint(0, 6))}
+
+
+@pytest.mark.parametrize('bulk_threshold', [256, 1])
+def test_numeric_harvest_matches_original_stub(monkeypatch, bulk_threshold):
+    monkeypatch.setattr(llm_extractor, '_BULK_MIN_STRINGS', bulk_threshold)
+    rng = random.Random(1234)
+    for _ in range(300):
+        payload = _random_payload(rng)
+        for ident in ('receiving', 'recs', 'passing'):
+            reference = _reference_collect(payload, ident)
+            assert sorted(_collect_numbers_from_obj(payload, ident)) == sorted(reference)
+            expected = None
+            if reference:
+                positives = [n for n in reference if n >= 0]
+                expected = sorted(positives)[0] if positives else sorted(reference)[0]
+            assert _harvest_line(payload, ident) == expected
+
+
+def test_concurrency_cap_holds_across_callers():
+    import threading
+    import time
+
+    lock = threading.Lock()
+    outstanding = [0]
+    peak = [0]
+
+    def complete(prompt):
+        with lock:
+            outstanding[0] += 1
+            peak[0] = max(peak[0], outstanding[0])
+        time.sleep(0.05)
+        with lock:
+            outstanding[0] -= 1
+        return '[]'
+
+    extractor = BatchExtractor(complete=complete, max_concurrency=2)
+    payloads = [{'players': [{'playerName': f"P{i}", 'recs': '3.5'}]} for i in range(8)]
+    threads = [threading.Thread(target=extractor.extract_many,
+                                args=([(payloads[i], f"P{i}", 'player_recs')],)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert extractor.llm_calls == 8
+    assert peak[0] <= 2
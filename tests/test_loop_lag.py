@@ -0,0 +1,141 @@
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis import dk_scraper
+from Utilis.dk_scraper import _props_from_body, scan_all_draftkings_props
+from Utilis.loop_lag import BoundedOffload, LoopLagMonitor
+
+SAMPLE = os.path.join(os.path.dirname(__file__), 'samples', 'dk_sample.json')
+
+
+def test_monitor_sees_a_blocking_call():
+    async def scenario():
+        async with LoopLagMonitor(interval=0.005) as lag:
+            await asyncio.sleep(0.03)
+            time.sleep(0.1)  # holds the loop
+            await asyncio.sleep(0.03)
+        return lag.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats['samples'] >= 2
+    assert stats['max_ms'] >= 80
+
+
+def test_offload_caps_in_flight_calls_and_drains():
+    in_flight = []
+    peak = []
+
+    def work(i):
+        in_flight.append(i)
+        peak.append(len(in_flight))
+        time.sleep(0.02)
+        in_flight.remove(i)
+        return i * 2
+
+    async def scenario():
+        offload = BoundedOffload(ThreadPoolExecutor(max_workers=4), max_pending=2)
+        results = []
+
+        async def call(i):
+            results.append(await offload.run(work, i))
+
+        for i in range(6):
+            asyncio.get_running_loop().create_task(call(i))
+        await asyncio.sleep(0)
+        await offload.drain()
+        return results
+
+    results = asyncio.run(scenario())
+    assert sorted(results) == [0, 2, 4, 6, 8, 10]
+    assert max(peak) <= 2
+
+
+def test_props_from_body():
+    with open(SAMPLE, 'rb') as f:
+        body = f.read()
+    props = _props_from_body(body, 'NFL', 'player_receptions')
+    assert [p.name for p in props] == ['Travis Kelce']
+    assert props[0].prop_line == 3.5
+    assert _props_from_body(b'<html>not json</html>', 'NFL', 'player_receptions') == []
+
+
+class _Request:
+    resource_type = 'xhr'
+
+
+class _Response:
+    request = _Request()
+
+    def __init__(self, url, body, delay=0.0):
+        self.url = url
+        self._body = body
+        self._delay = delay
+
+    async def body(self):
+        await asyncio.sleep(self._delay)
+        return self._body
+
+
+class _Page:
+    """Enough of a Playwright page to drive the scan: `goto` fires the response events."""
+
+    def __init__(self, bodies, body_delay=0.0):
+        self.bodies = bodies
+        self.body_delay = body_delay
+        self.handlers = []
+
+    def on(self, event, handler):
+        self.handlers.append(handler)
+
+    async def goto(self, url, **kwargs):
+        loop = asyncio.get_running_loop()
+        for body in self.bodies:
+            for handler in self.handlers:
+                loop.create_task(handler(_Response('https://sportsbook.draftkings.com/api/sportscontent/offers/1',
+                                                    body, self.body_delay)))
+        return None
+
+    async def wait_for_timeout(self, ms):
+        # long enough for the handlers to hand their bodies off, not for the parses to finish
+        await asyncio.sleep(0.01)
+
+    async def content(self):
+        return ''
+
+
+def test_scan_waits_for_offloaded_bodies(monkeypatch):
+    with open(SAMPLE, 'rb') as f:
+        body = f.read()
+
+    parsed = []
+
+    def slow_parse(*args):
+        time.sleep(0.05)
+        props = _props_from_body(*args)
+        parsed.extend(props)
+        return props
+
+    monkeypatch.setattr(dk_scraper, '_props_from_body', slow_parse)
+    page = _Page([body, b'not json', body])
+    props = asyncio.run(scan_all_draftkings_props(page, 'NFL', 'player_receptions'))
+    # both bodies were parsed before the scan returned; the scan then dedupes by player
+    assert len(parsed) == 2
+    assert [p.name for p in props] == ['Travis Kelce']
+
+
+def test_scan_waits_for_bodies_still_downloading(monkeypatch):
+    with open(SAMPLE, 'rb') as f:
+        body = f.read()
+    fallbacks = []
+    real_html = dk_scraper._props_from_html
+    monkeypatch.setattr(dk_scraper, '_props_from_html', lambda *a: fallbacks.append(1) or real_html(*a))
+    # the body arrives well after the listener wait, before anything reached `offload.run`
+    page = _Page([body], body_delay=0.1)
+    props = asyncio.run(scan_all_draftkings_props(page, 'NFL', 'player_receptions'))
+    assert [p.name for p in props] == ['Travis Kelce']
+    assert fallbacks == []
@@ -1,4 +1,10 @@
-from dashboard.mapper import _rows_from_gathered
+from dashboard.mapper import (
+    _frame_from_gathered,
+    _normalize,
+    _parse_namespace_pairs,
+    _parse_namespace_str,
+    _rows_from_gathered,
+)
 
 
 def test_rows_from_sample_result():
@@ -37,3 +43,48 @@ def test_rows_from_sample_result():
     assert row['team'] == 'Alabama'
     assert row['market'] == 'Player Passing Yards'
     assert row['prediction_score'] == 50
+
+
+def test_frame_matches_rows():
+    gathered = {
+        "all_props": [
+            {
+                "name": "Jalen Milroe", "position": "QB", "team_name": "Alabama", "team_abbrev": "ALA",
+                "opponent_name": "Georgia", "opponent_abbrev": "UGA", "start_time": "2025-10-18T19:30:00",
+                "league": "CFB", "market_name": "Player Passing Yards", "prop_line": 245.5,
+            },
+            {
+                "name": "Quinn Ewers", "team_name": "Texas", "opponent_name": "Oklahoma",
+                "start_time": "not a date", "league": "CFB", "market_name": "Player Passing Yards",
+                "prop_value": 260,
+            },
+            {"name": "No Line", "market_name": "Player Rushing Yards"},
+        ]
+    }
+    result = {"gathered_data": gathered}
+    rows = _rows_from_gathered(gathered, result=result)
+    frame = _frame_from_gathered(gathered, result=result)
+    assert list(frame.columns) == list(rows[0].keys())
+    assert frame.to_dict('records') == rows
+    assert frame.loc[0, 'datetime'] == 'Sat 10/18 07:30 PM'
+    assert frame.loc[1, 'datetime'] == 'not a date'
+    assert _frame_from_gathered(gathered, result=None).empty
+
+
+def test_normalize_namespace_string_parses_all_pairs_once():
+    ns = ("namespace(name='Jalen Milroe', position='QB', team_name=\"Alabama\", "
+          "odds_data=OddsData(prop_line=245.5), season_stats={'passing_yards': 2800}, last_five_games=[])")
+    _parse_namespace_pairs.cache_clear()
+    out = _normalize(ns)
+    assert out == {'name': 'Jalen Milroe', 'position': 'QB', 'team_name': 'Alabama'}
+    assert _parse_namespace_str(ns, 'prop_line') == '245.5'
+    assert _parse_namespace_str(ns, 'season_stats') == "{'passing_yards': 2800}"
+    assert _parse_namespace_str(ns, 'missing') is None
+    _normalize(ns)
+    assert _parse_namespace_pairs.cache_info().misses == 1
+
+
+def test_frame_without_start_times():
+    gathered = {"all_props": [{"name": "A", "start_time": None}, {"name": "B"}]}
+    frame = _frame_from_gathered(gathered, result={"gathered_data": gathered})
+    assert list(frame['datetime']) == ['N/A', 'N/A']
@@ -0,0 +1,62 @@
+import time
+
+from Utilis.names import NameIndex, canonical_key, name_matcher, normalize_name
+
+
+def test_normalization_and_canonical_keys():
+    assert normalize_name("D.J. Moore") == normalize_name("DJ  Moore") == 'dj moore'
+    assert normalize_name("Ja'Marr Chase") == 'jamarr chase'
+    assert normalize_name("José Núñez") == 'jose nunez'
+    assert canonical_key("Marvin Harrison Jr.") == canonical_key("Marvin Harrison") == 'marvin harrison'
+    assert canonical_key("Michael Pittman Jr") == 'michael pittman'
+
+
+def test_name_matcher_keeps_loose_scraper_rules_and_adds_initials():
+    is_kelce = name_matcher("Travis Kelce")
+    assert is_kelce("TRAVIS KELCE") and is_kelce("T. Kelce") and is_kelce("Kelce")
+    assert is_kelce("Travis Kelce Jr.")
+    assert not is_kelce("Patrick Mahomes")
+    assert not name_matcher("")("Travis Kelce")
+
+
+def test_index_matches_suffixes_initials_and_typos():
+    index = NameIndex()
+    for name in ["Marvin Harrison Jr.", "Travis Kelce", "Jason Kelce", "Amon-Ra St. Brown", "Puka Nacua"]:
+        index.add(name, name.upper())
+    assert index.match("Marvin Harrison") == ("Marvin Harrison Jr.", "MARVIN HARRISON JR.", 1.0)
+    assert index.get("T. Kelce") == "TRAVIS KELCE"
+    assert index.get("Nacua") == "PUKA NACUA"
+    # two Kelces make a bare last name ambiguous
+    assert index.match("Kelce") is None
+    assert index.get("Amon Ra St Brown") == "AMON-RA ST. BROWN"
+    assert index.get("Puka Nakua") == "PUKA NACUA"
+    assert index.get("Chris Olave") is None
+    assert NameIndex(["Puka Nacua"], trigram_threshold=None).match("Puka Nakua") is None
+
+
+def test_index_lookups_scale_to_full_slates():
+    first = ['Jalen', 'Marcus', 'Tyler', 'Chris', 'Devin', 'Jordan', 'Kyle', 'Mike']
+    roster = [f"{first[i % len(first)]} Player{i}" for i in range(5000)]
+    index = NameIndex()
+    for i, name in enumerate(roster):
+        index.add(name, i)
+    start = time.perf_counter()
+    hits = index.match_all(f"{n.split()[0][0]}. {n.split()[1]}" for n in roster)
+    elapsed = time.perf_counter() - start
+    assert [h[1] for h in hits] == list(range(5000))
+    assert elapsed / len(roster) < 1e-3
+
+
+def test_shared_last_name_and_initial_is_not_a_match():
+    is_kelce = name_matcher("Travis Kelce")
+    assert not is_kelce("Tyler Kelce") and not is_kelce("Jason Kelce")
+    assert not name_matcher("Josh Allen")("Jonathan Allen")
+    assert name_matcher("Josh Allen")("Joshua Allen")
+
+    index = NameIndex()
+    index.add("Jonathan Allen", 'DL')
+    index.add("Tyler Kelce", 'TE2')
+    assert index.match("Josh Allen") is None
+    assert index.match("Travis Kelce") is None
+    assert index.match("J. Allen") == ("Jonathan Allen", 'DL', 0.9)
+    assert index.match("Jon Allen") == ("Jonathan Allen", 'DL', 0.85)
@@ -0,0 +1,81 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis import feature_store, hit_rate
+from Utilis.odds_math import best_lines, expected_value, implied_probability, remove_vig
+from cfb_prop_predictor.agents import predictor
+from cfb_prop_predictor.types import AnalysisOutput
+from dashboard.mapper import _frame_from_gathered
+
+SAMPLE_LOGS = os.path.join(os.path.dirname(__file__), 'samples', 'game_logs.csv')
+
+
+def test_implied_probability():
+    assert implied_probability(np.array([-110, 150, 100])) == pytest.approx([110 / 210, 0.4, 0.5])
+    assert np.isnan(implied_probability(np.array([np.nan]))[0])
+
+
+def test_remove_vig():
+    fair_over, fair_under, overround = remove_vig(np.array([-110, -150, np.nan]), np.array([-110, 130, -110]))
+    assert fair_over[0] == pytest.approx(0.5) and overround[0] == pytest.approx(0.0476, abs=1e-4)
+    assert fair_over[1] + fair_under[1] == pytest.approx(1.0)
+    assert fair_over[1] > 0.5
+    assert np.isnan(fair_over[2])
+
+
+def test_expected_value():
+    assert expected_value(np.array([0.5, 0.6]), np.array([100, -150])) == pytest.approx([0.0, 0.0])
+
+
+def test_best_lines_across_books():
+    lines = [[50.5, 49.5, np.nan], [10.5, 10.5, 10.5], [np.nan, np.nan, np.nan]]
+    over = [[-110, -120, np.nan], [-110, -105, 100], [np.nan, np.nan, np.nan]]
+    under = [[-110, -105, np.nan], [-115, -110, np.nan], [np.nan, np.nan, np.nan]]
+    best = best_lines(lines, over, under)
+    # lowest over line wins even at a worse price; ties are broken by price
+    assert best['over_book'].tolist() == [1, 2, -1]
+    assert best['over_line'][:2].tolist() == [49.5, 10.5]
+    assert best['over_odds'][:2].tolist() == [-120, 100]
+    assert best['under_book'].tolist() == [0, 1, -1]
+    assert best['under_line'][0] == 50.5
+    assert np.isnan(best['under_odds'][2])
+
+
+def test_predictions_rank_by_edge():
+    def analysis(mean, over, under):
+        return AnalysisOutput(key_metrics={'prop_line': 50.5, 'last_n_mean': mean, 'last_n_std': 15.0,
+                                           'over_odds': over, 'under_odds': under},
+                              risk_factors=[], summary='')
+
+    preds = predictor.predict_batch([analysis(52, -110, -110), analysis(50, None, None), analysis(75, -110, -110)])
+    assert preds[0].market_probability == pytest.approx(0.5)
+    assert preds[1].probability_edge is None
+    assert predictor.rank_by_edge(preds) == [2, 0, 1]
+
+
+def test_dashboard_edge_column(monkeypatch):
+    monkeypatch.setattr(feature_store, '_default_path', None)
+    monkeypatch.setattr(feature_store, '_default_store', None)
+    monkeypatch.setattr(hit_rate, '_default_cache', None)
+    monkeypatch.setenv('PLAYER_GAME_LOGS', SAMPLE_LOGS)
+    gathered = {'all_props': [
+        {'name': 'Travis Kelce', 'market_name': 'Receiving Yards', 'prop_line': 50.5,
+         'over_odds': '-110', 'under_odds': '-110'},
+        {'name': 'Travis Kelce', 'market_name': 'Receiving Yards', 'prop_line': 50.5},
+    ]}
+    frame = _frame_from_gathered(gathered, result={'gathered_data': gathered}, with_line=True)
+    assert frame['edge'][0] == pytest.approx(0.6 - 0.5)
+    assert np.isnan(frame['edge'][1])
+
+
+def test_empty_dashboard_frame_has_the_same_columns():
+    gathered = {'all_props': [{'name': 'Travis Kelce', 'market_name': 'Receiving Yards', 'prop_line': 50.5}]}
+    full = _frame_from_gathered(gathered, result={'gathered_data': gathered}, with_line=True)
+    assert _frame_from_gathered({}, result=None, with_line=True).columns.tolist() == full.columns.tolist()
+    assert _frame_from_gathered({'all_props': []}, result={'x': 1}, with_line=True).columns.tolist() \
+        == full.columns.tolist()
@@ -0,0 +1,37 @@
+from dashboard.prefetch import PrefetchWorker
+from dashboard.result_cache import ResultCache
+
+
+def test_prefetch_fills_every_combination_once_per_interval(tmp_path):
+    cache = ResultCache(path=str(tmp_path / 'results.sqlite'))
+    calls = []
+
+    def job(key):
+        def _refresh():
+            calls.append(key)
+            return {'key': key}
+        return _refresh
+
+    keys = [f"{league}:{prop}" for league in ('CFB', 'NFL') for prop in ('passing', 'rushing')]
+    worker = PrefetchWorker(cache, {k: job(k) for k in keys}, interval=60)
+
+    assert worker.run_once() == 4
+    assert sorted(calls) == sorted(keys)
+    assert cache.get('NFL:rushing')[0] == {'key': 'NFL:rushing'}
+
+    # Everything is fresher than the interval, so a second pass does no upstream work
+    assert worker.run_once() == 0
+    assert len(calls) == 4
+
+
+def test_prefetch_thread_starts_and_stops(tmp_path):
+    cache = ResultCache(path=str(tmp_path / 'results.sqlite'))
+    worker = PrefetchWorker(cache, {'CFB:x': lambda: 1}, interval=60, poll=0.05).start()
+    try:
+        for _ in range(100):
+            if cache.get('CFB:x') is not None:
+                break
+            worker._stop.wait(0.02)
+    finally:
+        worker.stop(timeout=2)
+    assert cache.get('CFB:x')[0] == 1
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from Utilis.odds_math import american_array, parse_american, profit_per_unit
+from Utilis.projection import simulate_props
+from cfb_prop_predictor.types import AnalysisOutput
+from cfb_prop_predictor.agents import predictor
+
+
+def test_parse_american():
+    assert parse_american('+150') == 150
+    assert parse_american('−110') == -110
+    assert parse_american('EVEN') == 100
+    assert parse_american('n/a') is None
+    assert parse_american(None) is None
+    assert np.isnan(american_array(['-110', None, 50])[1:]).all()
+    assert profit_per_unit(np.array([150, -150])) == pytest.approx([1.5, 100 / 150])
+
+
+def test_simulation_matches_normal_probabilities():
+    sim = simulate_props([100.0, 100.0], [20.0, 20.0], [100.0, 80.0], draws=20000, seed=1)
+    assert sim['p_over'][0] == pytest.approx(0.5, abs=0.02)
+    assert sim['p_over'][1] == pytest.approx(0.841, abs=0.02)  # one std below the mean
+    assert sim['p_over'][1] + sim['p_under'][1] == pytest.approx(1.0)
+    assert sim['ci_low'][0] == pytest.approx(100 - 1.645 * 20, abs=2)
+    assert sim['ci_high'][0] == pytest.approx(100 + 1.645 * 20, abs=2)
+
+
+def test_simulation_is_seeded_and_chunk_independent():
+    args = ([50.0, 60.0, 70.0, 80.0], [10.0, 5.0, 20.0, 15.0], [55.5, 55.5, 55.5, 55.5])
+    a = simulate_props(*args, draws=1000, seed=7, chunk_elements=1000)
+    b = simulate_props(*args, draws=1000, seed=7, chunk_elements=10**7)
+    for key in a:
+        np.testing.assert_allclose(a[key], b[key])
+
+
+def test_expected_value_and_missing_inputs():
+    sim = simulate_props([100.0, np.nan, 100.0], [0.0, 10.0, np.nan], [50.5, 50.5, 99.5],
+                         over_odds=['+100', '-110', None], under_odds=[-110, -110, None], draws=100)
+    # a certain over at even money wins one unit; the under loses the stake
+    assert sim['ev_over'][0] == pytest.approx(1.0)
+    assert sim['ev_under'][0] == pytest.approx(-1.0)
+    assert np.isnan(sim['p_over'][1]) and np.isnan(sim['ev_over'][1])
+    assert not np.isnan(sim['p_over'][2])  # missing std falls back to a CV-based spread
+    assert np.isnan(sim['ev_over'][2])
+
+
+def test_predict_batch_simulates_props_with_features():
+    with_features = AnalysisOutput(
+        key_metrics={'prop_line': 50.5, 'last_n_mean': 80.0, 'last_n_std': 10.0,
+                     'over_odds': -110, 'under_odds': -110},
+        risk_factors=[], summary='')
+    without = AnalysisOutput(key_metrics={'prop_line': 200.0}, risk_factors=[], summary='')
+    sim_pred, heuristic_pred = predictor.predict_batch([with_features, without])
+    assert sim_pred.recommended_bet == 'over'
+    assert sim_pred.over_probability > 0.99
+    assert sim_pred.expected_value == pytest.approx(100 / 110 * sim_pred.over_probability - sim_pred.under_probability,
+                                                    abs=1e-3)
+    assert sim_pred.interval[0] < 80.0 < sim_pred.interval[1]
+    assert heuristic_pred.projected_value == 210.0 and heuristic_pred.over_probability is None
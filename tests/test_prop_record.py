@@ -0,0 +1,47 @@
+import json
+import os
+import pickle
+import sys
+
+from cfb_prop_predictor.types import PropRecord, GatheredData
+from Utilis.dk_scraper import parse_dk_json_payload
+from dashboard.mapper import _rows_from_gathered
+
+
+def load_sample(name: str):
+    path = os.path.join(os.path.dirname(__file__), 'samples', name)
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_prop_record_behaves_like_dict():
+    rec = PropRecord(name='Travis Kelce', team_name='Chiefs', league='NFL', prop_line=3.5)
+    assert rec['name'] == 'Travis Kelce'
+    assert rec.get('prop_line') == 3.5
+    # keys the scraper did not set are missing, so dict-style fallbacks still apply
+    assert 'team_abbrev' not in rec
+    assert rec.get('team_abbrev', rec.get('team_name')) == 'Chiefs'
+    assert rec.get('to_dict') is None
+    assert dict(rec) == {'name': 'Travis Kelce', 'team_name': 'Chiefs', 'league': 'NFL', 'prop_line': 3.5}
+    assert pickle.loads(pickle.dumps(rec)) == rec
+
+
+def test_prop_record_interns_and_is_smaller():
+    a = PropRecord(league=''.join(['C', 'F', 'B']), market_name='player passing yards'.title())
+    b = PropRecord(league=''.join(['C', 'F', 'B']), market_name='player passing yards'.title())
+    assert a['league'] is b['league']
+    assert a['market_name'] is b['market_name']
+    fields = dict(name='x', position='QB', team_name='A', team_abbrev='A', opponent_name='B',
+                  opponent_abbrev='B', start_time=None, league='CFB', market_name='M', prop_line=1.0)
+    assert sys.getsizeof(PropRecord(**fields)) < sys.getsizeof(dict(fields))
+
+
+def test_parsed_records_flow_through_gathered_data_and_mapper():
+    props = parse_dk_json_payload(load_sample('dk_sample.json'), 'NFL', 'player_receiving_yards')
+    assert props and all(isinstance(p, PropRecord) for p in props)
+    gathered = GatheredData(odds_data=None, player_stats=None, team_stats=None, all_props=props)
+    dumped = gathered.model_dump()
+    assert isinstance(dumped['all_props'][0], PropRecord)
+    rows = _rows_from_gathered(dumped, result={'gathered_data': dumped})
+    assert rows[0]['player'] == 'Travis Kelce'
+    assert rows[0]['market'] == 'Player Receiving Yards (3.5)'
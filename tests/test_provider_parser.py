@@ -33,3 +33,57 @@ def test_provider_parser_sample_3():
     cand = sample[0] if isinstance(sample, list) else list(sample.values())[0]
     val = extract_prop_from_candidate(cand, 'recs')
     assert val == 3.5
+
+
+def test_extract_book_lines_sample_2():
+    from Utilis.provider_parser import BookLine, extract_book_lines
+
+    lines = extract_book_lines(load_sample('dk_sample_2.json'), 'recs')
+    assert list(lines) == ['draftkings', 'fanduel']
+    assert lines['fanduel'] == BookLine(3.5, None, None)
+
+
+def test_extract_book_lines_reads_odds_and_nested_books():
+    from Utilis.provider_parser import extract_book_lines
+
+    candidate = {
+        'name': 'Travis Kelce',
+        'fanduel_recs': '4.5', 'fanduel_recs_over': '+105', 'fanduel_recs_under': '−125',
+        'draftkings_recs': 3.5, 'draftkings_rec_odds': '-150',
+        'markets': {'mgm': {'recs': '3.5', 'recs_under_odds': -110}},
+        'unknownbook_recs': '9.5',
+    }
+    lines = extract_book_lines(candidate, 'recs')
+    assert list(lines) == ['draftkings', 'fanduel', 'mgm']
+    assert lines['draftkings'] == (3.5, -150, None)
+    assert lines['fanduel'] == (4.5, 105, -125)
+    assert lines['mgm'] == (3.5, None, -110)
+
+
+def test_book_line_arrays_feed_best_lines():
+    from Utilis.odds_math import best_lines
+    from Utilis.provider_parser import BookLine, book_line_arrays
+
+    rows = [{'draftkings': BookLine(3.5, -150, 120), 'fanduel': BookLine(4.5, 105, -125)}, {}]
+    lines, over, under = book_line_arrays(rows, ['draftkings', 'fanduel'])
+    assert lines.shape == (2, 2)
+    best = best_lines(lines, over, under)
+    assert best['over_book'].tolist() == [0, -1]
+    assert best['under_line'][0] == 4.5
+
+
+def test_extract_book_lines_keeps_each_market_apart():
+    from Utilis.provider_parser import extract_book_lines
+
+    candidate = {
+        'draftkings_recs': '5.5', 'draftkings_recs_over': '+120',
+        'draftkings_receiving_yds': '48.5', 'draftkings_receiving_yds_over': '-115',
+        'draftkings_receiving_yds_under': '-105',
+        'fanduel': {'recs': '5.5', 'receiving_yds': '47.5', 'receiving_yds_under': '-110'},
+    }
+    yards = extract_book_lines(candidate, 'receiving')
+    assert yards['draftkings'] == (48.5, -115, -105)
+    assert yards['fanduel'] == (47.5, None, -110)
+    recs = extract_book_lines(candidate, 'recs')
+    assert recs['draftkings'] == (5.5, 120, None)
+    assert recs['fanduel'] == (5.5, None, None)
@@ -0,0 +1,43 @@
+from dashboard.mapper import _frame_from_gathered
+from dashboard.query import filter_props, paginate, query_props, raw_preview
+
+
+def make_table(n=120):
+    props = [
+        {
+            "name": f"Player {i:03d}", "team_name": "Alabama" if i % 2 else "Georgia",
+            "opponent_name": "Georgia" if i % 2 else "Alabama", "league": "CFB",
+            "market_name": "Player Passing Yards", "prop_line": 100.5 + i,
+        }
+        for i in range(n)
+    ]
+    gathered = {"all_props": props}
+    return _frame_from_gathered(gathered, result={"gathered_data": gathered}, with_line=True), gathered
+
+
+def test_filter_sort_and_page():
+    table, _ = make_table()
+    out = query_props(table, team='alabama', line_min=150, sort_by='line', ascending=False, page=2, page_size=10)
+    # Alabama plays in every game (as team or opponent); lines 150.5..219.5 -> 70 matches
+    assert out['matches'] == 70
+    assert out['page_count'] == 7
+    assert list(out['rows']['line'])[:2] == [209.5, 208.5]
+
+    only_player = filter_props(table, player='player 007')
+    assert list(only_player['player']) == ['Player 007']
+
+
+def test_paginate_clamps_page():
+    table, _ = make_table(5)
+    rows, page, pages = paginate(table, page=9, page_size=2)
+    assert (page, pages) == (3, 3)
+    assert len(rows) == 1
+
+
+def test_raw_preview_truncates_props():
+    _, gathered = make_table()
+    result = {"gathered_data": gathered, "analysis": {}}
+    preview = raw_preview(result, max_props=5)
+    assert len(preview['gathered_data']['all_props']) == 5
+    assert preview['gathered_data']['all_props_total'] == 120
+    assert len(result['gathered_data']['all_props']) == 120
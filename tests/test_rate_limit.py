@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+from Utilis import rate_limit
+from Utilis.rate_limit import (CircuitBreaker, CircuitOpenError, TokenBucket, get_throttle,
+                               reset_throttles, throttle_metrics, throttled_get, throttled_goto)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_throttles(monkeypatch):
+    reset_throttles()
+    slept = []
+    monkeypatch.setattr(rate_limit.time, 'sleep', slept.append)
+    yield slept
+    reset_throttles()
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status_code = self.status = status
+        self.headers = headers or {}
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        status = self.statuses.pop(0)
+        return FakeResponse(status, {'Retry-After': '7'} if status == 429 else {})
+
+
+def test_token_bucket_allows_burst_then_spaces_requests():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, 0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 10
+    assert bucket.reserve() == 0
+    bucket.pause(4)
+    assert bucket.reserve() == pytest.approx(4)
+
+
+def test_circuit_breaker_opens_fails_fast_and_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    breaker.before_request()
+    breaker.record_failure()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.now += 30
+    breaker.before_request()  # the probe
+    assert breaker.state == 'half_open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == 'open' and breaker.opens == 2
+    clock.now += 30
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert rate_limit._parse_retry_after('3') == 3
+    assert rate_limit._parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+    assert rate_limit._parse_retry_after('soon') is None
+
+
+def test_throttled_get_retries_and_honors_retry_after(fresh_throttles):
+    session = FakeSession([429, 503, 200])
+    resp = throttled_get('https://dk.example/api', session=session)
+    assert resp.status_code == 200 and session.calls == 3
+    # the first retry waits the Retry-After; the second uses jittered backoff (<= 1s)
+    assert 7 in fresh_throttles
+    metrics = throttle_metrics()['dk.example']
+    assert metrics['retries'] == 2 and metrics['failures'] == 2
+    assert 7 <= metrics['backoff_seconds'] <= 8
+    assert metrics['circuit'] == 'closed'
+    # Retry-After paused the whole host, so the next caller is throttled too
+    assert get_throttle('dk.example').bucket.reserve() > 0
+
+
+def test_throttled_get_gives_up_and_circuit_opens(fresh_throttles):
+    session = FakeSession([500] * 8)
+    resp = throttled_get('https://down.example/api', session=session)
+    assert resp.status_code == 500 and session.calls == rate_limit.MAX_RETRIES + 1
+    # the next failure reaches the breaker threshold, so the retry fails fast
+    with pytest.raises(CircuitOpenError):
+        throttled_get('https://down.example/api', session=session)
+    assert session.calls == rate_limit.MAX_RETRIES + 2
+    metrics = throttle_metrics()['down.example']
+    assert metrics['circuit'] == 'open' and metrics['rejected'] == 1
+
+
+def test_throttled_goto_retries_rate_limited_navigation(monkeypatch):
+    class FakePage:
+        def __init__(self):
+            self.statuses = [429, 200]
+
+        async def goto(self, url, **kwargs):
+            return FakeResponse(self.statuses.pop(0), {'retry-after': '0'})
+
+    page = FakePage()
+    resp = asyncio.run(throttled_goto(page, 'https://book.example/odds', wait_until='domcontentloaded'))
+    assert resp.status == 200
+    assert throttle_metrics()['book.example']['retries'] == 1
+
+
+def test_half_open_probe_that_never_reports_is_replaced():
+    clock = FakeClock()
+    breaker = CircuitBreaker(threshold=1, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.before_request() is True
+    clock.now += 29
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.now += 1
+    assert breaker.before_request() is True
+
+
+def test_probe_that_raises_reopens_the_circuit():
+    class TimeoutPage:
+        def __init__(self):
+            self.calls = 0
+
+        async def goto(self, url, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                raise TimeoutError('networkidle')
+            return FakeResponse(200)
+
+    throttle = get_throttle('probe.example')
+    clock = FakeClock()
+    throttle.breaker = CircuitBreaker(threshold=1, reset_timeout=30, clock=clock)
+    throttle.breaker.record_failure()
+    clock.now += 30
+    page = TimeoutPage()
+    with pytest.raises(TimeoutError):
+        asyncio.run(throttled_goto(page, 'https://probe.example/odds'))
+    assert throttle.breaker.state == 'open'
+    # reopened rather than stuck half-open: the next probe is let through after the reset
+    clock.now += 30
+    resp = asyncio.run(throttled_goto(page, 'https://probe.example/odds'))
+    assert resp.status == 200 and throttle.breaker.state == 'closed'
+
+
+def test_closed_circuit_ignores_unclassified_errors(fresh_throttles):
+    class BrokenSession:
+        def get(self, url, **kwargs):
+            raise ValueError('bad url')
+
+    with pytest.raises(ValueError):
+        throttled_get('https://closed.example/api', session=BrokenSession())
+    assert throttle_metrics()['closed.example']['circuit'] == 'closed'
+
+
+def test_json_probe_with_client_error_reopens_the_circuit():
+    import aiohttp
+
+    class Resp:
+        status = 404
+        headers = {}
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        def raise_for_status(self):
+            raise aiohttp.ClientResponseError(None, (), status=404)
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Resp()
+
+    throttle = get_throttle('json.example')
+    clock = FakeClock()
+    throttle.breaker = CircuitBreaker(threshold=1, reset_timeout=30, clock=clock)
+    throttle.breaker.record_failure()
+    clock.now += 30
+    with pytest.raises(aiohttp.ClientResponseError):
+        asyncio.run(rate_limit.throttled_get_json_async(Session(), 'https://json.example/api'))
+    assert throttle.breaker.state == 'open'
+
+
+def test_retry_after_is_not_clamped_and_always_pauses_the_host():
+    assert rate_limit._parse_retry_after('45') == 45
+    throttle = get_throttle('slow.example')
+    # within the budget: wait the full Retry-After, not the 30s backoff cap
+    assert throttle.failed(0, '45') == 45
+    # beyond the budget: give up rather than retry before the server allows it
+    assert throttle.failed(0, str(rate_limit.RETRY_AFTER_BUDGET + 60)) is None
+    # out of retries: still pause the host for everyone else
+    last = get_throttle('last.example')
+    assert last.failed(last.max_retries, '20') is None
+    assert last.bucket.reserve() >= 19
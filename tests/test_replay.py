@@ -0,0 +1,51 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from Utilis.replay import iter_replayed_props, replay_to_file
+
+SAMPLES = os.path.join(os.path.dirname(__file__), 'samples')
+
+
+def make_archive(tmp_path, copies=4):
+    paths = []
+    for i in range(copies):
+        for name in ('dk_sample.json', 'dk_sample_2.json', 'dk_sample_3.json'):
+            dest = tmp_path / f"{i:02d}_{name}"
+            shutil.copy(os.path.join(SAMPLES, name), dest)
+            paths.append(str(dest))
+    bad = tmp_path / 'broken.json'
+    bad.write_text('{not json')
+    paths.append(str(bad))
+    return paths
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_replay_keeps_input_order(tmp_path, workers):
+    paths = make_archive(tmp_path)
+    out = list(iter_replayed_props(paths, 'NFL', 'player_receiving_yards', workers=workers, chunksize=2))
+    assert [p for p, _ in out] == paths
+    assert all(props[0]['prop_line'] == 3.5 for _, props in out[:-1])
+    assert out[-1][1] == []
+
+
+def test_replay_to_jsonl(tmp_path):
+    paths = make_archive(tmp_path, copies=2)
+    out_path = str(tmp_path / 'out.jsonl')
+    written = replay_to_file(paths, out_path, 'NFL', 'player_receiving_yards', workers=2, batch_rows=4)
+    with open(out_path, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert written == len(rows) == 6
+    assert [r['source'] for r in rows] == paths[:-1]
+    assert rows[0]['name'] == 'Travis Kelce'
+
+
+def test_replay_to_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    paths = make_archive(tmp_path, copies=1)
+    out_path = str(tmp_path / 'out.parquet')
+    assert replay_to_file(paths, out_path, 'NFL', 'player_receiving_yards', workers=1) == 3
+    table = pq.read_table(out_path)
+    assert table.column('prop_line').to_pylist() == [3.5, 3.5, 3.5]
@@ -0,0 +1,92 @@
+import threading
+import time
+
+import pytest
+
+from dashboard.result_cache import ResultCache
+
+
+def test_concurrent_misses_share_one_refresh(tmp_path):
+    cache = ResultCache(path=str(tmp_path / 'results.sqlite'))
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        time.sleep(0.2)
+        return {'gathered_data': {'all_props': [1, 2, 3]}}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_refresh('CFB:x', refresh)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len(results) == 8
+    assert all(r == results[0] for r in results)
+
+
+def test_stale_value_served_while_refreshing(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    ResultCache(path=path).set('NFL:x', 'old')
+    cache = ResultCache(path=path, ttl=0)
+    done = threading.Event()
+
+    def refresh():
+        done.set()
+        return 'new'
+
+    assert cache.get_or_refresh('NFL:x', refresh) == 'old'
+    assert done.wait(2)
+    for _ in range(50):
+        if cache.get('NFL:x')[0] == 'new':
+            break
+        time.sleep(0.02)
+    assert cache.get('NFL:x')[0] == 'new'
+
+
+def test_failed_refresh_is_not_cached(tmp_path):
+    cache = ResultCache(path=str(tmp_path / 'results.sqlite'))
+
+    def boom():
+        raise RuntimeError('scrape failed')
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_refresh('CFB:x', boom)
+    assert cache.get('CFB:x') is None
+    assert cache.get_or_refresh('CFB:x', lambda: 'ok') == 'ok'
+
+
+def test_page_load_joining_prefetch_waits_for_peer_process(tmp_path):
+    path = str(tmp_path / 'results.sqlite')
+    cache = ResultCache(path=path, poll_interval=0.02)
+    peer = ResultCache(path=path)  # another server process, mid-refresh
+    assert peer._acquire_lease('NFL:x')
+
+    entered = threading.Event()
+    real_acquire = cache._acquire_lease
+
+    def slow_acquire(key):
+        if not entered.is_set():
+            entered.set()
+            time.sleep(0.2)  # keeps the prefetch future in flight while the page load joins it
+        return real_acquire(key)
+
+    cache._acquire_lease = slow_acquire
+    prefetch = threading.Thread(target=cache.refresh_if_older_than, args=('NFL:x', lambda: 'mine', 60))
+    prefetch.start()
+    assert entered.wait(2)
+
+    results = []
+    page = threading.Thread(target=lambda: results.append(cache.get_or_refresh_entry('NFL:x', lambda: 'mine')))
+    page.start()
+    time.sleep(0.4)
+    peer.set('NFL:x', 'peer')
+    peer._release_lease('NFL:x')
+    prefetch.join(2)
+    page.join(2)
+
+    assert results and results[0] is not None
+    assert results[0][0] == 'peer'
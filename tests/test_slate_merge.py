@@ -0,0 +1,100 @@
+import time
+
+from cfb_prop_predictor.types import MatchupOdds, PropRecord
+from dashboard.mapper import _frame_from_gathered, _rows_from_gathered
+from Utilis.play_scraper import parse_rotowire_players
+from Utilis.slate_merge import build_matchup_index, merge_slate
+
+
+def matchup(away, home):
+    return MatchupOdds(awayTeam=away, homeTeam=home,
+                       spread={'away': '+3.5 -110', 'home': '-3.5 -110'},
+                       moneyline={'away': '+150', 'home': '-170'},
+                       total={'over': 'o47.5 -110', 'under': 'u47.5 -110'})
+
+
+def test_merge_fills_rotowire_and_matchup_fields():
+    props = [
+        PropRecord(name='Marvin Harrison Jr.', team_name='Arizona Cardinals', prop_line=60.5),
+        PropRecord(name='Travis Kelce', team_abbrev='KC', team_name='Chiefs', prop_line=55.5),
+        {'name': 'Nobody Here', 'team_name': 'N/A', 'prop_line': 10.5},
+    ]
+    rotowire = [
+        {'name': 'Marvin Harrison', 'team': 'ARI', 'line': 62.5},
+        {'name': 'T. Kelce', 'team': 'KC', 'line': 54.5},
+    ]
+    merged = merge_slate(props, rotowire, [matchup('Arizona Cardinals', 'Kansas City Chiefs')])
+
+    assert merged[0]['rotowire_line'] == 62.5
+    assert merged[0]['team_spread'] == '+3.5 -110' and merged[0]['game_total'] == 'o47.5 -110'
+    assert merged[1]['rotowire_line'] == 54.5 and merged[1]['team_moneyline'] == '-170'
+    assert isinstance(merged[1], PropRecord) and merged[1]['prop_line'] == 55.5
+    assert merged[2] is props[2]
+    assert 'rotowire_line' not in props[0]  # inputs are untouched
+
+
+def test_same_name_players_are_split_by_team():
+    props = [PropRecord(name='Josh Johnson', team_name='Tulane'), PropRecord(name='Josh Johnson', team_name='Baylor')]
+    rotowire = [{'name': 'Josh Johnson', 'team': 'Baylor', 'line': 20.5},
+                {'name': 'Josh Johnson', 'team': 'Tulane', 'line': 40.5}]
+    assert [p['rotowire_line'] for p in merge_slate(props, rotowire)] == [40.5, 20.5]
+
+
+def test_partial_team_keys_shared_by_two_teams_are_dropped():
+    index = build_matchup_index([matchup('New York Jets', 'Buffalo Bills'), matchup('New York Giants', 'Dallas Cowboys')])
+    assert 'new york' not in index
+    assert index['jets'][1] == 'away' and index['dallas'][1] == 'home'
+
+
+def test_mapper_shows_rotowire_line():
+    props = merge_slate([PropRecord(name='Puka Nacua', prop_line=80.5), PropRecord(name='X Y', prop_line=1.5)],
+                        [{'name': 'Puka Nacua', 'team': 'LAR', 'line': 78.5}])
+    gathered = {'all_props': props}
+    assert [r['rotowire'] for r in _rows_from_gathered(gathered, result={'gathered_data': gathered})] == [78.5, 'N/A']
+    frame = _frame_from_gathered(gathered, result={'gathered_data': gathered})
+    assert frame['rotowire'].tolist() == [78.5, 'N/A']
+
+
+def test_parse_rotowire_players_reads_every_player():
+    content = ('<script>var x = {data: [{"name": "Puka Nacua", "team": "LAR", "draftkings_recyds": "78.5"},'
+               ' {"name": "No Line", "team": "LAR"}]};</script>')
+    assert parse_rotowire_players(content, 'player_receiving_yards') == [
+        {'name': 'Puka Nacua', 'team': 'LAR', 'line': 78.5, 'books': {'draftkings': (78.5, None, None)}}
+    ]
+
+
+def test_merge_is_linear_in_slate_size():
+    props = [PropRecord(name=f"Player {i}", team_name=f"Team {i % 64}") for i in range(20000)]
+    rotowire = [{'name': f"Player {i}", 'team': f"Team {i % 64}", 'line': i + 0.5} for i in range(20000)]
+    start = time.perf_counter()
+    merged = merge_slate(props, rotowire, [matchup(f"Team {2 * g}", f"Team {2 * g + 1}") for g in range(32)])
+    assert time.perf_counter() - start < 2
+    assert merged[12345]['rotowire_line'] == 12345.5
+
+
+def test_fuzzy_rotowire_match_rejects_other_players():
+    props = [
+        PropRecord(name='Travis Kelce', team_abbrev='KC', prop_line=55.5),
+        PropRecord(name='Jon Allen', team_name='Washington Commanders', prop_line=0.5),
+        PropRecord(name='Josh Allen', team_abbrev='BUF', prop_line=240.5),
+        PropRecord(name='Puka Nacua', team_abbrev='LAR', prop_line=80.5),
+    ]
+    rotowire = [
+        {'name': 'Tyler Kelce', 'team': 'KC', 'line': 20.5},            # same initial, different player
+        {'name': 'Jonathan Allen', 'team': 'Washington Commanders', 'line': 1.5},  # prefix only
+        {'name': 'J. Allen', 'team': 'JAX', 'line': 0.5},               # initial match, other team
+        {'name': 'P. Nacua', 'team': 'LAR', 'line': 78.5},
+    ]
+    merged = merge_slate(props, rotowire)
+    assert [m.get('rotowire_line') for m in merged] == [None, None, None, 78.5]
+
+
+def test_same_name_players_without_a_team_get_no_line():
+    rotowire = [{'name': 'Chris Johnson', 'team': 'UCF', 'line': 20.5},
+                {'name': 'Chris Johnson', 'team': 'SDSU', 'line': 80.5}]
+    props = [
+        PropRecord(name='Chris Johnson', team_name='N/A', prop_line=60.5),  # DK API prop
+        PropRecord(name='Chris Johnson', team_name='Central Florida', prop_line=60.5),  # name vs abbreviations
+        PropRecord(name='Chris Johnson', team_abbrev='SDSU', prop_line=60.5),
+    ]
+    assert [m.get('rotowire_line') for m in merge_slate(props, rotowire)] == [None, None, 80.5]